@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""
+Archival Script for LLM Monitoring System
+
+Moves LLM responses and analysis results older than the retention age out of
+SQLite into month-partitioned, gzip-compressed segment files under ARCHIVE_DIR.
+Archived results stay readable through the paginated results API, and the
+dashboard rollups keep counting them. Intended to run periodically (e.g. cron).
+
+Usage:
+    python3 archive_old_results.py [--days N] [--db PATH] [--dry-run] [--vacuum]
+"""
+
+import argparse
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.database.models import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old responses and analysis results")
+    parser.add_argument("--days", type=int, default=int(os.getenv("RETENTION_DAYS", 180)),
+                        help="Keep this many days of results in the hot database")
+    parser.add_argument("--db", default=os.getenv("DATABASE_PATH", "./monitoring.db"),
+                        help="Path to the SQLite database")
+    parser.add_argument("--batch-size", type=int, default=5000,
+                        help="Responses archived per transaction")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only report what would be archived")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="VACUUM the database afterwards to return space to the OS")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ARCHIVING OLD RESULTS")
+    print("=" * 60)
+
+    try:
+        db = DatabaseManager(args.db)
+        summary = db.archive_old_results(args.days, batch_size=args.batch_size, dry_run=args.dry_run)
+        if args.vacuum and not args.dry_run:
+            db.vacuum()
+        db.close()
+    except Exception as e:
+        print(f"\n❌ Archival failed: {str(e)}")
+        sys.exit(1)
+
+    print()
+    verb = "Would archive" if args.dry_run else "Archived"
+    print(f"✅ {verb} {summary['responses_archived']} responses "
+          f"({summary['analysis_results_archived']} analyses) older than {summary['cutoff']}")
+    if not args.dry_run:
+        print(f"   Segments written: {summary['segments_written']}")
+        print(f"   Old scrape rows pruned: {summary['content_rows_pruned']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""
+Database Benchmark Script for LLM Monitoring System
+
+Measures insert and read throughput of the DatabaseManager before and after
+connection pooling: the "before" numbers reproduce the old pattern of opening
+a fresh sqlite3 connection (default rollback journal) for every call, the
+"after" numbers use the pooled WAL connections of DatabaseManager.
+
+Usage:
+    python3 benchmark_database.py [--inserts N] [--reads N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.database.models import DatabaseManager
+
+
+class LegacyDatabase:
+    """Connect-per-call access pattern used before connection pooling"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Reuse the schema, then drop back to the default rollback journal
+            DatabaseManager(db_path).close()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
+
+    def add_question(self, website_id: int, question_text: str, category: str = "general") -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO questions (website_id, question_text, category)
+                VALUES (?, ?, ?)
+            ''', (website_id, question_text, category))
+            question_id = cursor.lastrowid
+            conn.commit()
+        return question_id
+
+    def get_websites(self, active_only: bool = True):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            query = "SELECT * FROM websites"
+            if active_only:
+                query += " WHERE is_active = 1"
+            return [dict(row) for row in conn.execute(query).fetchall()]
+
+
+def run_benchmark(db, inserts: int, reads: int) -> dict:
+    """Time question inserts and website reads against a database object"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        if hasattr(db, 'add_website'):
+            for i in range(12):
+                db.add_website(f"https://example{i}.gov/", f"Example {i}")
+        else:
+            with sqlite3.connect(db.db_path) as conn:
+                for i in range(12):
+                    conn.execute("INSERT INTO websites (url, name) VALUES (?, ?)",
+                                 (f"https://example{i}.gov/", f"Example {i}"))
+
+        start = time.perf_counter()
+        for i in range(inserts):
+            db.add_question(website_id=(i % 12) + 1, question_text=f"Benchmark question {i}?")
+        insert_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(reads):
+            db.get_websites()
+        read_seconds = time.perf_counter() - start
+
+    return {
+        'inserts_per_second': inserts / insert_seconds,
+        'reads_per_second': reads / read_seconds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database insert and read throughput")
+    parser.add_argument("--inserts", type=int, default=1000, help="Number of question inserts")
+    parser.add_argument("--reads", type=int, default=2000, help="Number of website list reads")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("DATABASE BENCHMARK")
+    print("=" * 60)
+    print(f"Inserts: {args.inserts}, Reads: {args.reads}")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        before = run_benchmark(LegacyDatabase(os.path.join(tmp_dir, "legacy.db")), args.inserts, args.reads)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            pooled_db = DatabaseManager(os.path.join(tmp_dir, "pooled.db"))
+        after = run_benchmark(pooled_db, args.inserts, args.reads)
+        pooled_db.close()
+
+    print(f"{'':<22}{'before':>12}{'after':>12}{'speedup':>10}")
+    for key, label in (('inserts_per_second', 'Inserts / second'), ('reads_per_second', 'Reads / second')):
+        print(f"{label:<22}{before[key]:>12.0f}{after[key]:>12.0f}{after[key] / before[key]:>9.1f}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
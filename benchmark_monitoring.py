@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+"""
+Monitoring Benchmark Script for LLM Monitoring System
+
+Measures wall-clock time of a full monitoring session (scrape, generate
+questions, query, judge, store) against a mocked LLM and scraper with fixed
+latencies. The "before" run reproduces the old engine: one website and one
+question at a time with a fixed 1 second pause after every question. The
+"after" run uses the staged pipeline with the configured limits and reports
+per-stage throughput, utilization and queue depth.
+
+Usage:
+    python3 benchmark_monitoring.py [--websites N] [--questions N] [--latency S]
+                                    [--concurrency N] [--per-website N] [--rate R]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.database.models import DatabaseManager
+from src.monitoring.monitor import MonitoringSystem
+
+
+class MockScraper:
+    """Scraper returning canned content after a fixed delay"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def scrape_website(self, url: str):
+        time.sleep(self.latency)
+        content = f"Official content for {url}. The director leads the agency."
+        return {
+            'url': url,
+            'title': f"Title of {url}",
+            'content': content,
+            'content_hash': hashlib.md5(content.encode()).hexdigest(),
+            'success': True
+        }
+
+
+class MockLLMClient:
+    """LLM client with fixed per-call latency; `pause` adds the old per-question sleep"""
+
+    base_url = "http://mock-llm.local/v1"
+
+    def __init__(self, latency: float, num_questions: int, pause: float = 0.0):
+        self.latency = latency
+        self.num_questions = num_questions
+        self.pause = pause
+
+    def generate_questions(self, website_content: str, website_name: str, num_questions: int = 5):
+        time.sleep(self.latency)
+        return [f"Question {i} about {website_name}?" for i in range(self.num_questions)]
+
+    def query_llm(self, question: str, context: str = "", model: str = None):
+        time.sleep(self.latency)
+        return {'response': f"Answer to {question}", 'usage': {'total_tokens': 42}, 'success': True}
+
+    def analyze_accuracy(self, llm_response: str, actual_content: str, question: str):
+        time.sleep(self.latency + self.pause)
+        return {
+            'accuracy_score': 0.9,
+            'misrepresentation_detected': False,
+            'specific_issues': [],
+            'success': True
+        }
+
+
+def run_session(db_path: str, websites: int, llm_client: MockLLMClient, scraper: MockScraper) -> dict:
+    """Time one monitor_all_websites call on a fresh database"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = DatabaseManager(db_path)
+        for i in range(websites):
+            db.add_website(f"https://example{i}.gov/", f"Example {i}")
+        system = MonitoringSystem(db=db, scraper=scraper, llm_client=llm_client)
+
+        start = time.perf_counter()
+        result = system.monitor_all_websites()
+        seconds = time.perf_counter() - start
+        db.close()
+
+    return {'seconds': seconds, 'questions': result['total_questions'], 'stages': result.get('stages') or {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark monitoring session wall-clock time")
+    parser.add_argument("--websites", type=int, default=12, help="Number of websites")
+    parser.add_argument("--questions", type=int, default=5, help="Questions per website")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per mocked LLM call")
+    parser.add_argument("--concurrency", type=int, default=8, help="Global concurrency")
+    parser.add_argument("--per-website", type=int, default=3, help="Concurrent questions per website")
+    parser.add_argument("--per-endpoint", type=int, default=8, help="Concurrent calls per LLM endpoint")
+    parser.add_argument("--rate", type=float, default=40, help="LLM requests per second")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("MONITORING BENCHMARK")
+    print("=" * 60)
+    print(f"Websites: {args.websites}, Questions/site: {args.questions}, LLM latency: {args.latency}s")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Old engine: strictly sequential, fixed 1s pause after every question
+        os.environ.update({
+            "MONITOR_MAX_CONCURRENCY": "1",
+            "MONITOR_PER_WEBSITE_CONCURRENCY": "1",
+            "MONITOR_LLM_REQUESTS_PER_SECOND": "0"
+        })
+        before = run_session(os.path.join(tmp_dir, "before.db"), args.websites,
+                             MockLLMClient(args.latency, args.questions, pause=1.0), MockScraper(args.latency))
+
+        os.environ.update({
+            "MONITOR_MAX_CONCURRENCY": str(args.concurrency),
+            "MONITOR_PER_WEBSITE_CONCURRENCY": str(args.per_website),
+            "MONITOR_PER_ENDPOINT_CONCURRENCY": str(args.per_endpoint),
+            "MONITOR_LLM_REQUESTS_PER_SECOND": str(args.rate),
+            "MONITOR_LLM_BURST": str(args.per_endpoint)
+        })
+        after = run_session(os.path.join(tmp_dir, "after.db"), args.websites,
+                            MockLLMClient(args.latency, args.questions), MockScraper(args.latency))
+
+    print(f"{'':<26}{'before':>10}{'after':>10}{'speedup':>10}")
+    print(f"{'Session wall-clock (s)':<26}{before['seconds']:>10.2f}{after['seconds']:>10.2f}"
+          f"{before['seconds'] / after['seconds']:>9.1f}x")
+    print(f"{'Questions analyzed':<26}{before['questions']:>10}{after['questions']:>10}")
+    print()
+    print(f"{'Stage (after)':<14}{'items':>7}{'items/s':>10}{'util':>7}{'max queue':>11}{'blocked s':>11}")
+    for name, metrics in after['stages'].items():
+        print(f"{name:<14}{metrics['processed']:>7}{metrics['throughput_per_second']:>10}"
+              f"{metrics['utilization']:>7.0%}{metrics['max_queue_depth']:>11}{metrics['backpressure_seconds']:>11}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
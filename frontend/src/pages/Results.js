@@ -32,15 +32,70 @@ const Results = () => {
   }, []);
 
   useEffect(() => {
-    let interval;
-    if (autoRefresh) {
-      interval = setInterval(() => {
-        refreshResults();
-      }, 5000); // Refresh every 5 seconds
+    if (!autoRefresh) {
+      return undefined;
     }
+    // Refresh when the running sessions report progress instead of polling. With no
+    // session running, refresh every 5 seconds and re-check for a new session; when
+    // every stream ends, is cancelled or fails, refresh and go back to that loop
+    let cancelled = false;
+    let sources = [];
+    let timer = null;
+    let pending = null;
+    const refreshSoon = (event) => {
+      const types = ['question_answered', 'session_completed', 'session_cancelled', 'progress'];
+      if (types.includes(event.type) && !pending) {
+        pending = setTimeout(() => {
+          pending = null;
+          refreshResults();
+        }, 1000);
+      }
+    };
+
+    const later = () => {
+      timer = setTimeout(() => {
+        timer = null;
+        refreshResults();
+        watch();
+      }, 5000);
+    };
+
+    const watch = () => {
+      apiService.getMonitoringStatus()
+        .then((response) => response.data.active_sessions || [])
+        .catch(() => [])
+        .then((sessionIds) => {
+          if (cancelled) {
+            return;
+          }
+          if (sessionIds.length && window.EventSource) {
+            let open = sessionIds.length;
+            const onEnd = () => {
+              open -= 1;
+              if (open === 0 && !cancelled) {
+                sources = [];
+                refreshResults();
+                later();
+              }
+            };
+            sources = sessionIds.map((sessionId) => (
+              apiService.subscribeToSessionEvents(sessionId, refreshSoon, onEnd)
+            ));
+          } else {
+            later();
+          }
+        });
+    };
+    watch();
+
     return () => {
-      if (interval) {
-        clearInterval(interval);
+      cancelled = true;
+      sources.forEach((source) => source.close());
+      if (timer) {
+        clearTimeout(timer);
+      }
+      if (pending) {
+        clearTimeout(pending);
       }
     };
   }, [autoRefresh]);
@@ -152,7 +207,7 @@ const Results = () => {
               onChange={(e) => setAutoRefresh(e.target.checked)}
               style={{ marginRight: '8px' }}
             />
-            Auto Refresh (5s) {autoRefresh && refreshing && '🔄'}
+            Auto Refresh {autoRefresh && refreshing && '🔄'}
           </label>
           <button 
             className="btn btn-primary" 
@@ -38,6 +38,12 @@ api.interceptors.response.use(
   }
 );
 
+export const SESSION_EVENT_TYPES = [
+  'session_started', 'website_started', 'website_completed', 'website_failed',
+  'question_answered', 'question_failed', 'misrepresentation_found', 'session_completed', 'session_cancelled',
+  'progress',
+];
+
 export const apiService = {
   // Health check
   healthCheck: () => api.get('/api/health'),
@@ -53,11 +59,46 @@ export const apiService = {
   setupScheduledMonitoring: (intervalHours = 6) => 
     api.post(`/api/monitoring/schedule?interval_hours=${intervalHours}`),
   stopScheduledMonitoring: () => api.post('/api/monitoring/stop'),
+  getSessions: (params = {}) => api.get('/api/monitoring/sessions', { params }),
+  cancelSession: (sessionId) => api.post(`/api/monitoring/sessions/${sessionId}/cancel`),
+  getSessionSnapshot: (sessionId) => api.get(`/api/monitoring/sessions/${sessionId}/snapshot`),
+
+  // Server-sent progress events of a session; close() the returned EventSource when done.
+  // onEnd runs once when the session finishes, is cancelled or the stream fails
+  subscribeToSessionEvents: (sessionId, onEvent, onEnd) => {
+    const source = new EventSource(`${API_BASE_URL}/api/monitoring/sessions/${sessionId}/events`);
+    let open = true;
+    const end = () => {
+      if (open) {
+        open = false;
+        source.close();
+        if (onEnd) {
+          onEnd();
+        }
+      }
+    };
+    SESSION_EVENT_TYPES.forEach((type) => source.addEventListener(type, (message) => {
+      const event = JSON.parse(message.data);
+      onEvent(event);
+      // The server ends finished streams; stop EventSource from reconnecting
+      const ended = ['session_completed', 'session_cancelled'].includes(type)
+        || (type === 'progress' && !['queued', 'running'].includes(event.status));
+      if (ended) {
+        end();
+      }
+    }));
+    source.onerror = end;
+    return source;
+  },
 
   // Analysis Results
   getAnalysisResults: (limit = 50) => api.get(`/api/analysis/results?limit=${limit}`),
+  getAnalysisResultsPage: (params = {}) => api.get('/api/analysis/results/page', { params }),
   getMisrepresentationsSummary: () => api.get('/api/analysis/summary'),
 
+  // Search
+  search: (q, scope = 'responses', params = {}) => api.get('/api/search', { params: { q, scope, ...params } }),
+
   // Questions
   createQuestion: (questionData) => api.post('/api/questions', questionData),
   getQuestionsForWebsite: (websiteId) => api.get(`/api/questions/${websiteId}`),
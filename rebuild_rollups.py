@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+"""
+Rollup Rebuild Script for LLM Monitoring System
+
+Recomputes the daily analysis rollups (per website and LLM service) that back
+the dashboard and misrepresentation summary endpoints. Rollups are maintained
+automatically on every insert; run this after manual data fixes or restores.
+
+Usage:
+    python3 rebuild_rollups.py [--db PATH]
+"""
+
+import argparse
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.database.models import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild analysis rollup tables")
+    parser.add_argument("--db", default=os.getenv("DATABASE_PATH", "./monitoring.db"),
+                        help="Path to the SQLite database")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("REBUILDING ANALYSIS ROLLUPS")
+    print("=" * 60)
+
+    try:
+        db = DatabaseManager(args.db)
+        row_count = db.rebuild_rollups()
+        stats = db.get_dashboard_stats()
+        db.close()
+    except Exception as e:
+        print(f"\n❌ Rollup rebuild failed: {str(e)}")
+        sys.exit(1)
+
+    print()
+    print(f"✅ {row_count} rollup rows covering {stats['total_analyses']} analyses")
+    print(f"   Misrepresentations: {stats['total_misrepresentations']}")
+    print(f"   Average accuracy: {stats['average_accuracy']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,24 @@
 
 
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import os
 import json
+import time
+import asyncio
 import sqlite3
+import threading
 from datetime import datetime
 
 from ..database.models import DatabaseManager
+from ..database.search import SEARCH_MAX_OFFSET
 from ..monitoring.monitor import MonitoringSystem
+from ..monitoring.events import format_sse
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -37,6 +42,11 @@ monitoring_system = MonitoringSystem()
 
 print("API server initialized")
 
+@app.on_event("startup")
+def resume_interrupted_monitoring():
+    """Pick up sessions a previous process left running"""
+    threading.Thread(target=monitoring_system.resume_interrupted_sessions, daemon=True).start()
+
 # Pydantic models
 class WebsiteCreate(BaseModel):
     url: str
@@ -55,6 +65,12 @@ class WebsiteResponse(BaseModel):
 class MonitoringRequest(BaseModel):
     website_ids: Optional[List[int]] = None
     session_name: Optional[str] = None
+    force: bool = False
+    # Bypass the LLM response cache and sample every answer anew
+    fresh: bool = False
+
+class ScheduleUpdate(BaseModel):
+    interval_hours: Optional[float] = None
 
 class QuestionCreate(BaseModel):
     website_id: int
@@ -144,40 +160,166 @@ async def delete_website(website_id: int):
         print(f"Error deactivating website: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.put("/api/websites/{website_id}/schedule")
+async def set_website_schedule(website_id: int, request: ScheduleUpdate):
+    """Override a website's monitoring interval (null restores the default)"""
+    print(f"Setting monitoring interval of website ID {website_id}: {request.interval_hours}")
+    
+    if request.interval_hours is not None and request.interval_hours <= 0:
+        raise HTTPException(status_code=400, detail="interval_hours must be positive")
+    if not any(w['id'] == website_id for w in db.get_websites(active_only=False)):
+        raise HTTPException(status_code=404, detail="Website not found")
+    
+    try:
+        monitoring_system.set_website_interval(website_id, request.interval_hours)
+        return {"website_id": website_id, "interval_hours": request.interval_hours, "success": True}
+    except Exception as e:
+        print(f"Error setting website schedule: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/monitoring/start")
-async def start_monitoring(request: MonitoringRequest, background_tasks: BackgroundTasks):
-    """Start monitoring websites"""
+async def start_monitoring(request: MonitoringRequest):
+    """Submit a monitoring session; returns its id, or the session already monitoring the websites"""
     print(f"Starting monitoring with request: {request}")
     
     try:
-        if request.website_ids:
-            # Monitor specific websites
-            def monitor_specific_websites():
-                results = []
-                for website_id in request.website_ids:
-                    result = monitoring_system.monitor_website(website_id)
-                    results.append(result)
-                return results
-            
-            background_tasks.add_task(monitor_specific_websites)
-            
-            return {
-                "message": f"Started monitoring {len(request.website_ids)} websites",
-                "website_ids": request.website_ids,
-                "success": True
-            }
-        else:
-            # Monitor all websites
-            background_tasks.add_task(monitoring_system.monitor_all_websites)
-            
-            return {
-                "message": "Started monitoring all active websites",
-                "success": True
-            }
-            
+        submitted = monitoring_system.sessions.submit(request.website_ids, request.force, request.session_name,
+                                                      fresh=request.fresh)
     except Exception as e:
         print(f"Error starting monitoring: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not submitted['success']:
+        raise HTTPException(status_code=404, detail=submitted['error'])
+    return submitted
+
+@app.get("/api/monitoring/sessions")
+async def list_monitoring_sessions(status: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    """Most recent monitoring sessions, optionally filtered by status"""
+    return monitoring_system.sessions.list(status, limit)
+
+@app.post("/api/monitoring/sessions/{session_id}/cancel")
+async def cancel_monitoring_session(session_id: int):
+    """Cancel a queued or running session; answers already stored are kept"""
+    session = db.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not monitoring_system.sessions.cancel(session_id):
+        raise HTTPException(status_code=409, detail=f"Session {session_id} is already {session['status']}")
+    return {"message": f"Session {session_id} cancelled", "session_id": session_id, "success": True}
+
+@app.post("/api/monitoring/sessions/{session_id}/resume")
+async def resume_monitoring_session(session_id: int):
+    """Resume an interrupted monitoring session, redoing only its unfinished jobs"""
+    print(f"Resuming monitoring session {session_id}")
+    
+    if session_id in monitoring_system.active_sessions:
+        raise HTTPException(status_code=409, detail=f"Session {session_id} is already running")
+    
+    session = db.get_session(session_id)
+    job_counts = db.get_job_counts(session_id)
+    if session is None or not job_counts:
+        raise HTTPException(status_code=404, detail=f"No jobs found for session {session_id}")
+    if session['status'] not in ('queued', 'running'):
+        raise HTTPException(status_code=409, detail=f"Session {session_id} is {session['status']}")
+    
+    monitoring_system.sessions.start(session_id, resume=True)
+    return {
+        "message": f"Resuming monitoring session {session_id}",
+        "jobs": job_counts,
+        "success": True
+    }
+
+@app.get("/api/monitoring/sessions/{session_id}/jobs")
+async def get_monitoring_session_jobs(session_id: int):
+    """Job counts per kind and state for a monitoring session"""
+    return {"session_id": session_id, "jobs": db.get_job_counts(session_id)}
+
+@app.get("/api/monitoring/sessions/{session_id}/spend")
+async def get_monitoring_session_spend(session_id: int):
+    """Tokens and cost spent by a session, its pre-flight estimate and budget status"""
+    spend = db.get_session_spend(session_id)
+    if not spend:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id, **spend}
+
+@app.get("/api/monitoring/budget")
+async def get_monitoring_budget(days: int = Query(7, ge=1, le=366)):
+    """Budget limits, model prices and daily spend per model"""
+    return {**monitoring_system.budget.status(), "daily_spend": db.get_daily_spend(days)}
+
+@app.get("/api/monitoring/llm-cache")
+async def get_llm_cache_stats():
+    """Entries, TTLs and hit/miss counts of the LLM response cache"""
+    stats = monitoring_system.llm_cache_stats()
+    return stats if stats is not None else {"enabled": False}
+
+@app.get("/api/monitoring/sessions/{session_id}")
+@app.get("/api/monitoring/sessions/{session_id}/snapshot")
+async def get_monitoring_session_snapshot(session_id: int):
+    """Status and progress of a session; load it before streaming events from live.last_event_id"""
+    progress = monitoring_system.get_session_progress(session_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return progress
+
+# Sessions run by another process (worker mode) publish no events here; their
+# streams report job-count progress from the database instead
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("MONITOR_EVENTS_KEEPALIVE_SECONDS", 15))
+EVENTS_POLL_SECONDS = float(os.getenv("MONITOR_EVENTS_POLL_SECONDS", 2))
+
+async def session_event_stream(session_id: int, last_event_id: int, request: Request):
+    bus = monitoring_system.events
+    subscription = bus.subscribe(session_id, asyncio.get_running_loop(), last_event_id)
+    last_sent = time.monotonic()
+    last_progress = None
+    try:
+        while not await request.is_disconnected():
+            live = bus.knows(session_id)
+            try:
+                event = await subscription.get(EVENTS_KEEPALIVE_SECONDS if live else EVENTS_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                event = False
+            
+            if event is None:
+                break
+            if event:
+                yield format_sse(event)
+                last_sent = time.monotonic()
+                continue
+            
+            if not bus.knows(session_id):
+                progress = monitoring_system.get_session_progress(session_id)
+                if progress is None:
+                    break
+                current = (progress['status'], progress['jobs'])
+                if current != last_progress:
+                    last_progress = current
+                    yield format_sse({'type': 'progress', **progress})
+                    last_sent = time.monotonic()
+                if progress['status'] not in ('queued', 'running'):
+                    break
+            if time.monotonic() - last_sent >= EVENTS_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+    finally:
+        bus.unsubscribe(subscription)
+
+@app.get("/api/monitoring/sessions/{session_id}/events")
+async def stream_monitoring_session_events(session_id: int, request: Request,
+                                           last_event_id: Optional[int] = None):
+    """Server-sent events with a session's progress, resuming after Last-Event-ID"""
+    if db.get_session(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    header = request.headers.get("last-event-id", "")
+    if last_event_id is None:
+        last_event_id = int(header) if header.isdigit() else 0
+    return StreamingResponse(
+        session_event_stream(session_id, last_event_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/api/monitoring/status")
 async def get_monitoring_status():
@@ -224,6 +366,11 @@ async def stop_scheduled_monitoring():
         print(f"Error stopping scheduled monitoring: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/monitoring/schedule")
+async def get_monitoring_schedule():
+    """Per-website monitoring interval and next due time"""
+    return {"running": monitoring_system.scheduler is not None, "websites": monitoring_system.get_schedule()}
+
 @app.get("/api/analysis/results")
 async def get_analysis_results(limit: int = 50):
     """Get recent analysis results"""
@@ -236,6 +383,68 @@ async def get_analysis_results(limit: int = 50):
         print(f"Error getting analysis results: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/analysis/results/page")
+async def get_analysis_results_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    website_id: Optional[int] = None,
+    llm_service: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    misrepresentation: Optional[bool] = None
+):
+    """Page through analysis results with a keyset cursor and filters"""
+    print(f"Getting analysis results page (limit: {limit}, cursor: {cursor})")
+    
+    try:
+        return db.get_analysis_results_page(
+            limit=limit,
+            cursor=cursor,
+            website_id=website_id,
+            llm_service=llm_service,
+            date_from=date_from,
+            date_to=date_to,
+            min_score=min_score,
+            max_score=max_score,
+            misrepresentation=misrepresentation
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error getting analysis results page: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/analysis/issues")
+async def get_issue_types(website_id: Optional[int] = None):
+    """Get the most frequent issue types per website"""
+    print(f"Getting issue types (website_id: {website_id})")
+    
+    try:
+        return db.get_issue_types_by_website(website_id=website_id)
+    except Exception as e:
+        print(f"Error getting issue types: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/search")
+async def search(
+    q: str,
+    scope: str = "responses",
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET)
+):
+    """Full-text search over LLM responses, questions or scraped content"""
+    print(f"Searching {scope} for: {q}")
+    
+    try:
+        return db.search(query=q, scope=scope, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error searching: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/analysis/summary")
 async def get_misrepresentations_summary():
     """Get summary of misrepresentations"""
@@ -275,7 +484,7 @@ async def get_questions_for_website(website_id: int):
     print(f"Getting questions for website ID: {website_id}")
     
     try:
-        with db.get_connection() as conn:
+        with db.get_read_connection() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -298,41 +507,7 @@ async def get_dashboard_stats():
     print("Getting dashboard statistics")
     
     try:
-        with db.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Total websites
-            cursor.execute("SELECT COUNT(*) as count FROM websites WHERE is_active = 1")
-            total_websites = cursor.fetchone()['count']
-            
-            # Total questions analyzed
-            cursor.execute("SELECT COUNT(*) as count FROM analysis_results")
-            total_analyses = cursor.fetchone()['count']
-            
-            # Total misrepresentations
-            cursor.execute("SELECT COUNT(*) as count FROM analysis_results WHERE misrepresentation_detected = 1")
-            total_misrepresentations = cursor.fetchone()['count']
-            
-            # Recent activity (last 24 hours)
-            cursor.execute('''
-                SELECT COUNT(*) as count FROM analysis_results 
-                WHERE analyzed_at > datetime('now', '-1 day')
-            ''')
-            recent_activity = cursor.fetchone()['count']
-            
-            # Average accuracy score
-            cursor.execute("SELECT AVG(accuracy_score) as avg_score FROM analysis_results")
-            avg_accuracy = cursor.fetchone()['avg_score'] or 0.0
-            
-        stats = {
-            'total_websites': total_websites,
-            'total_analyses': total_analyses,
-            'total_misrepresentations': total_misrepresentations,
-            'recent_activity': recent_activity,
-            'average_accuracy': round(avg_accuracy, 3),
-            'misrepresentation_rate': round((total_misrepresentations / max(total_analyses, 1)) * 100, 2)
-        }
+        stats = db.get_dashboard_stats()
         
         return stats
     except Exception as e:
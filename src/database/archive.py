@@ -0,0 +1,155 @@
+import gzip
+import json
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# One record per archived LLM response, joined with its analysis (if any) and the
+# question/website context, so archives can be read without the hot tables.
+ARCHIVE_CANDIDATES_SQL = '''
+    SELECT
+        ar.id,
+        lr.id as llm_response_id,
+        ar.website_content_id,
+        ar.accuracy_score,
+        ar.misrepresentation_detected,
+        ar.analysis_details,
+        ar.analyzed_at,
+        q.website_id,
+        lr.llm_service,
+        ar.confidence,
+        ar.issue_count,
+        lr.question_id,
+        lr.response_text,
+        lr.response_metadata,
+        lr.queried_at,
+        q.question_text,
+        w.name as website_name,
+        w.url as website_url,
+        wc.title as content_title,
+        wc.content_hash
+    FROM llm_responses lr
+    LEFT JOIN analysis_results ar ON ar.llm_response_id = lr.id
+    LEFT JOIN questions q ON lr.question_id = q.id
+    LEFT JOIN websites w ON q.website_id = w.id
+    LEFT JOIN website_content wc ON ar.website_content_id = wc.id
+    WHERE lr.id IN (
+        SELECT lr2.id FROM llm_responses lr2
+        WHERE lr2.queried_at < ?
+          AND NOT EXISTS (
+              SELECT 1 FROM analysis_results ar2
+              WHERE ar2.llm_response_id = lr2.id AND ar2.analyzed_at >= ?
+          )
+        ORDER BY lr2.id
+        LIMIT ?
+    )
+'''
+
+CREATE_ARCHIVE_SEGMENTS_SQL = '''
+    CREATE TABLE IF NOT EXISTS archive_segments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        path TEXT UNIQUE NOT NULL,
+        month TEXT NOT NULL,
+        row_count INTEGER NOT NULL,
+        min_analyzed_at TIMESTAMP,
+        max_analyzed_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _record_time(record: Dict) -> str:
+    return record.get('analyzed_at') or record.get('queried_at') or ''
+
+
+class ArchiveStore:
+    """Append-only, month-partitioned archive of gzip-compressed NDJSON segments.
+
+    Segment files are only visible to readers once registered in the
+    archive_segments table, which happens in the same transaction that deletes
+    the archived rows, so a crash never leaves rows both archived and hot.
+    """
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+
+    def _segment_path(self, month: str) -> str:
+        name = f"segment-{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 1000000:06d}.ndjson.gz"
+        return os.path.join(self.archive_dir, "analysis_results", month, name)
+
+    def write_segments(self, records: List[Dict]) -> List[Dict]:
+        """Write records into one new segment per month; returns segment metadata"""
+        by_month = defaultdict(list)
+        for record in records:
+            by_month[_record_time(record)[:7] or "unknown"].append(record)
+
+        segments = []
+        for month, month_records in sorted(by_month.items()):
+            path = self._segment_path(month)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                for record in month_records:
+                    f.write(json.dumps(record, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            analyzed = [r['analyzed_at'] for r in month_records if r.get('analyzed_at')]
+            segments.append({
+                'path': os.path.relpath(path, self.archive_dir),
+                'month': month,
+                'row_count': len(month_records),
+                'min_analyzed_at': min(analyzed) if analyzed else None,
+                'max_analyzed_at': max(analyzed) if analyzed else None
+            })
+        return segments
+
+    def read_segment(self, relative_path: str) -> Iterator[Dict]:
+        with gzip.open(os.path.join(self.archive_dir, relative_path), "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def iter_analysis_records(self, conn: sqlite3.Connection, matches=None,
+                              before: Optional[Tuple[str, int]] = None,
+                              date_from: str = None) -> Iterator[Dict]:
+        """Archived analysis results, newest first by (analyzed_at, id).
+
+        Months are read one at a time, newest first, so only the months needed to
+        fill a page are decompressed. `before` is an exclusive keyset position.
+        """
+        segments = conn.execute('''
+            SELECT month, path, min_analyzed_at, max_analyzed_at
+            FROM archive_segments
+            WHERE max_analyzed_at IS NOT NULL
+            ORDER BY month DESC, id DESC
+        ''').fetchall()
+
+        by_month = defaultdict(list)
+        for month, path, min_at, max_at in segments:
+            if before and min_at > before[0]:
+                continue
+            if date_from and max_at < date_from:
+                continue
+            by_month[month].append(path)
+
+        for month in sorted(by_month, reverse=True):
+            records = []
+            for path in by_month[month]:
+                for record in self.read_segment(path):
+                    if record.get('id') is None or not record.get('analyzed_at'):
+                        continue
+                    if before and (record['analyzed_at'], record['id']) >= before:
+                        continue
+                    if matches is not None and not matches(record):
+                        continue
+                    record['archived'] = True
+                    records.append(record)
+            records.sort(key=lambda r: (r['analyzed_at'], r['id']), reverse=True)
+            yield from records
+
+    def iter_all_records(self, conn: sqlite3.Connection) -> Iterator[Dict]:
+        """Every archived record in segment order"""
+        for (path,) in conn.execute("SELECT path FROM archive_segments ORDER BY id").fetchall():
+            yield from self.read_segment(path)
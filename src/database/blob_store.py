@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from typing import Optional, Tuple
+
+from .search import index_blob_text, unindex_blob_text
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, zlib is always available
+    zstandard = None
+
+
+def content_blob_hash(text: str) -> str:
+    """Strong content address for a piece of scraped text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def default_compression() -> str:
+    """Codec for new blobs: CONTENT_COMPRESSION if usable, else zstd when installed, else zlib"""
+    requested = os.getenv("CONTENT_COMPRESSION", "").lower()
+    if requested == "zstd" and zstandard is None:
+        print("CONTENT_COMPRESSION=zstd requested but zstandard is not installed, using zlib")
+        return "zlib"
+    if requested in ("zstd", "zlib", "none"):
+        return requested
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    if codec == "zlib":
+        return zlib.compress(data, 9)
+    return data
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+def compress_json(value) -> bytes:
+    """Small JSON values stored beside a row (not content-addressed), zlib-compressed"""
+    return zlib.compress(json.dumps(value).encode('utf-8'), 9)
+
+
+def decompress_json(data: Optional[bytes]):
+    return json.loads(zlib.decompress(data).decode('utf-8')) if data else None
+
+
+def store_blob(conn: sqlite3.Connection, text: str, codec: str = None,
+               index_text: bool = True) -> Tuple[str, bool]:
+    """Add a reference to the blob holding `text`, creating it if needed.
+
+    Runs inside the caller's transaction. New blobs are added to the full-text
+    index unless `index_text` is False (only before the index exists).
+    Returns (hash, created).
+    """
+    blob_hash = content_blob_hash(text)
+    cursor = conn.execute(
+        "UPDATE content_blobs SET ref_count = ref_count + 1 WHERE hash = ?", (blob_hash,)
+    )
+    if cursor.rowcount:
+        return blob_hash, False
+
+    codec = codec or default_compression()
+    raw = text.encode('utf-8')
+    data = compress(raw, codec)
+    cursor = conn.execute('''
+        INSERT INTO content_blobs (hash, compression, data, original_size, compressed_size, ref_count)
+        VALUES (?, ?, ?, ?, ?, 1)
+    ''', (blob_hash, codec, data, len(raw), len(data)))
+    if index_text:
+        index_blob_text(conn, cursor.lastrowid, text)
+    return blob_hash, True
+
+
+def release_blob(conn: sqlite3.Connection, blob_hash: str) -> bool:
+    """Drop one reference to a blob, deleting it when unreferenced. Returns True if deleted."""
+    conn.execute(
+        "UPDATE content_blobs SET ref_count = ref_count - 1 WHERE hash = ?", (blob_hash,)
+    )
+    row = conn.execute(
+        "SELECT rowid, compression, data FROM content_blobs WHERE hash = ? AND ref_count <= 0", (blob_hash,)
+    ).fetchone()
+    if row is None:
+        return False
+
+    unindex_blob_text(conn, row[0], decompress(row[2], row[1]).decode('utf-8'))
+    conn.execute("DELETE FROM content_blobs WHERE rowid = ?", (row[0],))
+    return True
+
+
+def load_blob(conn: sqlite3.Connection, blob_hash: str) -> Optional[str]:
+    """Decompressed text of a blob, or None if it does not exist"""
+    row = conn.execute(
+        "SELECT compression, data FROM content_blobs WHERE hash = ?", (blob_hash,)
+    ).fetchone()
+    if row is None:
+        return None
+    return decompress(row[1], row[0]).decode('utf-8')
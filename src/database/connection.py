@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Tuple
+
+
+class ConnectionPool:
+    """Per-thread reusable SQLite connections tuned for one writer and many readers.
+
+    Each thread gets (at most) one writer connection and one read-only reader
+    connection that are reused across calls instead of reconnecting for every
+    query. The database is switched to WAL journal mode so readers never block
+    the writer and vice versa.
+    """
+
+    def __init__(self, db_path: str, synchronous: str = None, cache_size_kb: int = None,
+                 mmap_size: int = None, busy_timeout_ms: int = None):
+        self.db_path = db_path
+        self.synchronous = synchronous or os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+        self.cache_size_kb = cache_size_kb or int(os.getenv("SQLITE_CACHE_SIZE_KB", 20000))
+        self.mmap_size = mmap_size if mmap_size is not None else int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+        self.busy_timeout_ms = busy_timeout_ms or int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (thread, role) -> connection, so connections of finished threads can be reclaimed
+        self._connections: Dict[Tuple[threading.Thread, str], sqlite3.Connection] = {}
+
+        # WAL mode is persistent in the database file, so it only has to be set once
+        conn = self.writer()
+        journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        print(f"Connection pool ready for {db_path} (journal_mode={journal_mode})")
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _get(self, role: str) -> sqlite3.Connection:
+        conn = getattr(self._local, role, None)
+        if conn is not None:
+            return conn
+
+        conn = self._connect(read_only=(role == "reader"))
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[(threading.current_thread(), role)] = conn
+        setattr(self._local, role, conn)
+        return conn
+
+    def _prune_dead_threads(self):
+        """Close connections owned by threads that have exited (caller holds the lock)"""
+        for key in [key for key in self._connections if not key[0].is_alive()]:
+            try:
+                self._connections.pop(key).close()
+            except sqlite3.Error:
+                pass
+
+    def writer(self) -> sqlite3.Connection:
+        """Get this thread's read-write connection"""
+        return self._get("writer")
+
+    def reader(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection"""
+        return self._get("reader")
+
+    def connection_count(self) -> int:
+        """Number of open pooled connections"""
+        with self._lock:
+            return len(self._connections)
+
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            for conn in self._connections.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,187 @@
+import ast
+import json
+import sqlite3
+
+# Coarse issue categories derived from the judge's free-text `specific_issues`.
+# Evaluated in order, first match wins. Patterns with spaces around a word match
+# the whole word only ("% date %" matches "the date." but not "update").
+ISSUE_TYPE_PATTERNS = [
+    ('analysis_error', ['analysis error%']),
+    ('leadership', ['%president%', '%leader%', '%chair%', '%director%', '%governor%', '%ceo%']),
+    ('temporal', ['%outdated%', '%out of date%', '%no longer%', '%former%',
+                  '% year %', '% years %', '% date %', '% dates %', '% dated %']),
+    ('geographic', ['%region%', '%district%', '%territor%', '%geograph%', '%county%', '%counties%']),
+    ('omission', ['%omit%', '%omission%', '%missing%', '%not mention%', '%incomplete%']),
+    ('numeric', ['%number%', '%percent%', '%amount%', '%figure%', '%statistic%']),
+    ('attribution', ['%attribut%', '%confus%', '%different organization%', '%wrong organization%']),
+]
+
+
+# Punctuation treated as a word boundary by whole-word patterns
+WORD_SEPARATORS = ".,;:!?()[]\"'/-"
+
+
+def _pattern_condition(column: str, pattern: str) -> str:
+    """SQL condition of an issue text column matching one LIKE pattern"""
+    if not (pattern.startswith('% ') and pattern.endswith(' %')):
+        return f"lower({column}) LIKE '{pattern}'"
+    # Whole word: punctuation becomes spaces and the text is padded with one at each end
+    text = f"lower({column})"
+    for separator in WORD_SEPARATORS:
+        text = "replace({}, '{}', ' ')".format(text, separator.replace("'", "''"))
+    return f"(' ' || {text} || ' ') LIKE '{pattern}'"
+
+
+def issue_type_case(column: str) -> str:
+    """SQL CASE expression classifying an issue text column into ISSUE_TYPE_PATTERNS"""
+    branches = []
+    for issue_type, patterns in ISSUE_TYPE_PATTERNS:
+        condition = " OR ".join(_pattern_condition(column, pattern) for pattern in patterns)
+        branches.append(f"WHEN {condition} THEN '{issue_type}'")
+    return "CASE " + " ".join(branches) + " ELSE 'factual' END"
+
+
+CREATE_ISSUES_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS analysis_issues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        analysis_result_id INTEGER NOT NULL,
+        website_id INTEGER,
+        issue_type TEXT NOT NULL,
+        issue_text TEXT NOT NULL,
+        FOREIGN KEY (analysis_result_id) REFERENCES analysis_results (id)
+    )
+'''
+
+# Shared by the insert trigger (source NEW) and the backfill (source analysis_results)
+_INSERT_ISSUES_SELECT = '''
+    SELECT
+        {source}.id,
+        (SELECT q.website_id FROM llm_responses lr
+         JOIN questions q ON lr.question_id = q.id
+         WHERE lr.id = {source}.llm_response_id),
+        {issue_type},
+        trim(issue.value)
+    FROM {source_table} json_each(
+        CASE WHEN json_valid({source}.analysis_details)
+                  AND json_type({source}.analysis_details, '$.specific_issues') = 'array'
+             THEN json_extract({source}.analysis_details, '$.specific_issues')
+             ELSE '[]' END
+    ) AS issue
+    WHERE issue.type = 'text' AND trim(issue.value) != ''
+'''
+
+CREATE_ISSUES_INSERT_TRIGGER_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS trg_analysis_results_issues
+    AFTER INSERT ON analysis_results
+    BEGIN
+        INSERT INTO analysis_issues (analysis_result_id, website_id, issue_type, issue_text)
+    ''' + _INSERT_ISSUES_SELECT.format(
+        source='NEW', source_table='', issue_type=issue_type_case('issue.value')) + ''';
+    END
+'''
+
+CREATE_ISSUES_DELETE_TRIGGER_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS trg_analysis_results_issues_delete
+    AFTER DELETE ON analysis_results
+    BEGIN
+        DELETE FROM analysis_issues WHERE analysis_result_id = OLD.id;
+    END
+'''
+
+# Re-applies ISSUE_TYPE_PATTERNS to issues classified by an older version of them
+RECLASSIFY_ISSUES_SQL = f"UPDATE analysis_issues SET issue_type = {issue_type_case('issue_text')}"
+
+BACKFILL_ISSUES_SQL = (
+    "INSERT INTO analysis_issues (analysis_result_id, website_id, issue_type, issue_text)"
+    + _INSERT_ISSUES_SELECT.format(
+        source='analysis_results', source_table='analysis_results,', issue_type=issue_type_case('issue.value'))
+)
+
+# Issue counts of archived analyses: archival deletes their analysis_issues rows
+# (through the delete trigger) after folding them in here
+CREATE_ARCHIVED_ISSUE_COUNTS_SQL = '''
+    CREATE TABLE IF NOT EXISTS archived_issue_counts (
+        website_id INTEGER NOT NULL,
+        issue_type TEXT NOT NULL,
+        issue_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (website_id, issue_type)
+    )
+'''
+
+# Formatted with the placeholders of the archived llm_response ids
+ARCHIVE_ISSUE_COUNTS_SQL = '''
+    INSERT INTO archived_issue_counts (website_id, issue_type, issue_count)
+    SELECT COALESCE(ai.website_id, 0), ai.issue_type, COUNT(*)
+    FROM analysis_issues ai
+    JOIN analysis_results ar ON ar.id = ai.analysis_result_id
+    WHERE ar.llm_response_id IN ({placeholders})
+    GROUP BY COALESCE(ai.website_id, 0), ai.issue_type
+    ON CONFLICT (website_id, issue_type) DO UPDATE SET
+        issue_count = issue_count + excluded.issue_count
+'''
+
+# Hot issues and archived counts; {where} filters both sides
+ISSUE_TYPES_BY_WEBSITE_SQL = '''
+    SELECT
+        ai.website_id,
+        w.name as website_name,
+        ai.issue_type,
+        ai.issue_count
+    FROM (
+        SELECT website_id, issue_type, SUM(issue_count) as issue_count
+        FROM (
+            SELECT website_id, issue_type, COUNT(*) as issue_count
+            FROM analysis_issues
+            {where}
+            GROUP BY website_id, issue_type
+            UNION ALL
+            SELECT NULLIF(website_id, 0), issue_type, issue_count
+            FROM archived_issue_counts
+            {where}
+        )
+        GROUP BY website_id, issue_type
+    ) ai
+    LEFT JOIN websites w ON ai.website_id = w.id
+    ORDER BY ai.website_id, ai.issue_count DESC
+'''
+
+
+def serialize_analysis(analysis) -> str:
+    """Store analysis results as JSON (dicts are dumped, strings are kept if valid JSON)"""
+    if isinstance(analysis, str):
+        return normalize_analysis_details(analysis)
+    return json.dumps(analysis, default=str)
+
+
+def normalize_analysis_details(details: str) -> str:
+    """Convert legacy str(dict) analysis details to JSON, leaving valid JSON untouched"""
+    if details is None:
+        return json.dumps({})
+    try:
+        json.loads(details)
+        return details
+    except ValueError:
+        pass
+    try:
+        parsed = ast.literal_eval(details)
+        if isinstance(parsed, dict):
+            return json.dumps(parsed, default=str)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        pass
+    return json.dumps({'analysis_summary': details})
+
+
+def convert_legacy_analysis_details(conn: sqlite3.Connection):
+    """Rewrite every non-JSON analysis_details value as JSON and backfill analysis_issues"""
+    rows = conn.execute(
+        "SELECT id, analysis_details FROM analysis_results WHERE analysis_details IS NULL OR NOT json_valid(analysis_details)"
+    ).fetchall()
+    for result_id, details in rows:
+        conn.execute(
+            "UPDATE analysis_results SET analysis_details = ? WHERE id = ?",
+            (normalize_analysis_details(details), result_id)
+        )
+    conn.execute("DELETE FROM analysis_issues")
+    conn.execute(BACKFILL_ISSUES_SQL)
+    if rows:
+        print(f"Converted {len(rows)} analysis results to JSON")
@@ -0,0 +1,152 @@
+import json
+import sqlite3
+from typing import Dict, Optional
+
+# Job states: pending -> running -> completed | failed, or cancelled with their
+# session. A running job is leased to one process (lease_owner) until
+# lease_expires_at; owners renew their leases with heartbeats, so a job whose
+# owner died becomes claimable again once it expires.
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+UNFINISHED_JOB_STATES = (JOB_PENDING, JOB_RUNNING)
+
+# A 'website' job scrapes a site and prepares its question bank; on completion it
+# enqueues one 'question' job per (question, model) in the same transaction.
+CREATE_JOBS_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS monitoring_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        website_id INTEGER NOT NULL,
+        question_id INTEGER,
+        llm_service TEXT,
+        content_id INTEGER,
+        state TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        llm_response_id INTEGER,
+        analysis_result_id INTEGER,
+        result TEXT,
+        error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (session_id) REFERENCES monitoring_sessions (id),
+        FOREIGN KEY (website_id) REFERENCES websites (id),
+        FOREIGN KEY (question_id) REFERENCES questions (id)
+    )
+'''
+
+JOB_INDEX_STATEMENTS = [
+    # One job per unit of work, so enqueueing twice is harmless
+    '''CREATE UNIQUE INDEX IF NOT EXISTS idx_monitoring_jobs_unit ON monitoring_jobs (
+           session_id, kind, website_id, IFNULL(question_id, 0), IFNULL(llm_service, '')
+       )''',
+    "CREATE INDEX IF NOT EXISTS idx_monitoring_jobs_state ON monitoring_jobs (session_id, state, website_id)",
+]
+
+# Question jobs carry their website job's options (e.g. {'fresh': true})
+INSERT_JOB_SQL = '''
+    INSERT OR IGNORE INTO monitoring_jobs (session_id, kind, website_id, question_id, llm_service, content_id, options)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_WEBSITE_JOB_SQL = '''
+    INSERT OR IGNORE INTO monitoring_jobs (session_id, kind, website_id, options)
+    VALUES (?, 'website', ?, ?)
+'''
+
+ADD_LEASE_COLUMNS_STATEMENTS = [
+    "ALTER TABLE monitoring_jobs ADD COLUMN lease_owner TEXT",
+    "ALTER TABLE monitoring_jobs ADD COLUMN lease_expires_at TIMESTAMP",
+    "ALTER TABLE monitoring_jobs ADD COLUMN options TEXT",
+    "CREATE INDEX IF NOT EXISTS idx_monitoring_jobs_claim ON monitoring_jobs (state, lease_expires_at)",
+]
+
+_CLAIMABLE = '''(state = 'pending'
+     OR (state = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < CURRENT_TIMESTAMP)))'''
+
+_LEASE_SET = '''
+    SET state = 'running', attempts = attempts + 1,
+        lease_owner = ?, lease_expires_at = datetime('now', ?),
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# Claim a specific job (e.g. one of the session being run inline)
+CLAIM_JOB_SQL = "UPDATE monitoring_jobs" + _LEASE_SET + "WHERE id = ? AND " + _CLAIMABLE
+
+# Claim the next job of any running session (queued sessions wait for a slot);
+# question jobs first so started sessions finish early
+CLAIM_NEXT_JOB_SQL = "UPDATE monitoring_jobs" + _LEASE_SET + '''
+    WHERE id = (
+        SELECT id FROM monitoring_jobs
+        WHERE ''' + _CLAIMABLE + '''
+          AND session_id IN (SELECT id FROM monitoring_sessions WHERE status = 'running')
+        ORDER BY kind = 'website', id
+        LIMIT 1
+    )
+    RETURNING id
+'''
+
+RENEW_LEASES_SQL = '''
+    UPDATE monitoring_jobs
+    SET lease_expires_at = datetime('now', ?)
+    WHERE lease_owner = ? AND state = 'running' AND id IN (SELECT value FROM json_each(?))
+'''
+
+# Jobs whose lease expired too often (e.g. they crash their worker) are given up on
+FAIL_EXHAUSTED_JOBS_SQL = '''
+    UPDATE monitoring_jobs
+    SET state = 'failed', error = 'Gave up after ' || attempts || ' attempts',
+        lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+    WHERE state = 'running' AND attempts >= ?
+      AND (lease_expires_at IS NULL OR lease_expires_at < CURRENT_TIMESTAMP)
+      AND (? IS NULL OR session_id = ?)
+'''
+
+FINISH_JOB_SQL = '''
+    UPDATE monitoring_jobs
+    SET state = ?, result = ?, error = ?,
+        llm_response_id = COALESCE(?, llm_response_id),
+        analysis_result_id = COALESCE(?, analysis_result_id),
+        lease_expires_at = NULL,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND (? IS NULL OR (lease_owner = ? AND state = 'running'))
+'''
+
+
+class LeaseLostError(Exception):
+    """The job was re-leased to another process, so this process must not finish it"""
+
+
+def lease_modifier(seconds: float) -> str:
+    """SQLite datetime() modifier for a lease of `seconds`"""
+    return f"+{int(seconds)} seconds"
+
+
+def finish_job(conn: sqlite3.Connection, job_id: int, state: str, result: Optional[Dict] = None,
+               error: str = None, llm_response_id: int = None, analysis_result_id: int = None,
+               lease_owner: str = None):
+    """Record the final state of a job; runs inside the caller's transaction.
+
+    With a `lease_owner`, raises LeaseLostError if another process now holds the
+    job or it was cancelled, so the caller's transaction (and any results written
+    in it) rolls back.
+    """
+    cursor = conn.execute(FINISH_JOB_SQL, (
+        state, json.dumps(result, default=str) if result is not None else None, error,
+        llm_response_id, analysis_result_id, job_id, lease_owner, lease_owner
+    ))
+    if cursor.rowcount == 0:
+        raise LeaseLostError(f"Job {job_id} is no longer leased to {lease_owner}")
+
+
+def job_result(job: Dict) -> Dict:
+    """Decoded result JSON of a job row"""
+    return json.loads(job['result']) if job.get('result') else {}
+
+
+def job_options(job: Dict) -> Dict:
+    """Decoded options JSON of a job row (e.g. {'force': true, 'fresh': true})"""
+    return json.loads(job['options']) if job.get('options') else {}
@@ -0,0 +1,81 @@
+import time
+from typing import Optional, Tuple
+
+from .connection import ConnectionPool
+
+# On-disk tier of the LLM response cache. It lives in its own database file, so
+# cache traffic never competes with monitoring writes for the main database's lock.
+CREATE_LLM_CACHE_SQL = '''
+    CREATE TABLE IF NOT EXISTS llm_response_cache (
+        cache_key TEXT PRIMARY KEY,
+        call_type TEXT NOT NULL,
+        value TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+'''
+
+CREATE_LLM_CACHE_INDEX_SQL = '''
+    CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expiry ON llm_response_cache (expires_at)
+'''
+
+GET_CACHED_RESPONSE_SQL = '''
+    SELECT value, expires_at FROM llm_response_cache WHERE cache_key = ? AND expires_at > ?
+'''
+
+PUT_CACHED_RESPONSE_SQL = '''
+    INSERT INTO llm_response_cache (cache_key, call_type, value, created_at, expires_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (cache_key) DO UPDATE SET
+        call_type = excluded.call_type,
+        value = excluded.value,
+        created_at = excluded.created_at,
+        expires_at = excluded.expires_at
+'''
+
+PURGE_EXPIRED_RESPONSES_SQL = "DELETE FROM llm_response_cache WHERE expires_at <= ?"
+
+
+class SQLiteCacheTier:
+    """LLM responses kept in a SQLite file across restarts, as JSON text with an expiry"""
+
+    name = 'disk'
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
+        conn = self.pool.writer()
+        conn.execute(CREATE_LLM_CACHE_SQL)
+        conn.execute(CREATE_LLM_CACHE_INDEX_SQL)
+        conn.commit()
+        self.purge_expired()
+
+    def get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        """(value, expires_at) of a live entry"""
+        row = self.pool.reader().execute(GET_CACHED_RESPONSE_SQL, (key, now)).fetchone()
+        return (row['value'], row['expires_at']) if row else None
+
+    def put(self, key: str, call_type: str, value: str, expires_at: float):
+        conn = self.pool.writer()
+        try:
+            conn.execute(PUT_CACHED_RESPONSE_SQL, (key, call_type, value, time.time(), expires_at))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def purge_expired(self) -> int:
+        conn = self.pool.writer()
+        cursor = conn.execute(PURGE_EXPIRED_RESPONSES_SQL, (time.time(),))
+        conn.commit()
+        if cursor.rowcount:
+            print(f"Purged {cursor.rowcount} expired LLM cache entries")
+        return cursor.rowcount
+
+    def clear(self):
+        conn = self.pool.writer()
+        conn.execute("DELETE FROM llm_response_cache")
+        conn.commit()
+
+    def size(self) -> int:
+        return self.pool.reader().execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
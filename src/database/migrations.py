@@ -0,0 +1,243 @@
+import sqlite3
+from typing import Callable, List, Optional
+
+from .archive import CREATE_ARCHIVE_SEGMENTS_SQL
+from .blob_store import decompress, store_blob
+from .jobs import ADD_LEASE_COLUMNS_STATEMENTS, CREATE_JOBS_TABLE_SQL, JOB_INDEX_STATEMENTS
+from .schedules import CREATE_WEBSITE_SCHEDULES_SQL
+from .sessions import SESSION_INDEX_STATEMENTS
+from .spend import ADD_SESSION_JUDGE_BATCH_STATEMENTS, ADD_SESSION_SPEND_STATEMENTS, CREATE_SPEND_DAILY_SQL
+from .rollups import CREATE_ROLLUP_TRIGGER_SQL, CREATE_ROLLUPS_TABLE_SQL, rebuild_rollups
+from .search import FTS_SCHEMA_STATEMENTS, index_blob_text
+from .issues import (CREATE_ARCHIVED_ISSUE_COUNTS_SQL, CREATE_ISSUES_DELETE_TRIGGER_SQL,
+                     CREATE_ISSUES_INSERT_TRIGGER_SQL, CREATE_ISSUES_TABLE_SQL, RECLASSIFY_ISSUES_SQL,
+                     convert_legacy_analysis_details)
+
+
+class Migration:
+    """A single ordered schema change, given as SQL statements and/or a callable"""
+
+    def __init__(self, version: int, description: str, statements: List[str] = None,
+                 apply: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.version = version
+        self.description = description
+        self.statements = statements or []
+        self.apply = apply
+
+    def run(self, conn: sqlite3.Connection):
+        for statement in self.statements:
+            conn.execute(statement)
+        if self.apply is not None:
+            self.apply(conn)
+
+
+def _move_content_into_blobs(conn: sqlite3.Connection):
+    """Replace inline website_content text with references to content blobs"""
+    rows = conn.execute(
+        "SELECT id, content FROM website_content WHERE content IS NOT NULL AND blob_hash IS NULL"
+    ).fetchall()
+    for content_id, content in rows:
+        # The full-text index does not exist yet; migration 6 indexes every blob
+        blob_hash, _ = store_blob(conn, content, index_text=False)
+        conn.execute(
+            "UPDATE website_content SET blob_hash = ?, content = NULL WHERE id = ?",
+            (blob_hash, content_id)
+        )
+    if rows:
+        print(f"Moved {len(rows)} website_content rows into content blobs")
+
+
+def _index_existing_blobs(conn: sqlite3.Connection):
+    """Give content blobs stable integer IDs and add them to the full-text index"""
+    # Implicit rowids may change on VACUUM, so rebuild the table with an explicit
+    # INTEGER PRIMARY KEY (keeping the current rowids) before using them as FTS keys
+    conn.execute('''
+        CREATE TABLE content_blobs_new (
+            id INTEGER PRIMARY KEY,
+            hash TEXT UNIQUE NOT NULL,
+            compression TEXT NOT NULL,
+            data BLOB NOT NULL,
+            original_size INTEGER,
+            compressed_size INTEGER,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO content_blobs_new (id, hash, compression, data, original_size,
+                                       compressed_size, ref_count, created_at)
+        SELECT rowid, hash, compression, data, original_size, compressed_size, ref_count, created_at
+        FROM content_blobs
+    ''')
+    conn.execute("DROP TABLE content_blobs")
+    conn.execute("ALTER TABLE content_blobs_new RENAME TO content_blobs")
+
+    count = 0
+    for rowid, codec, data in conn.execute("SELECT id, compression, data FROM content_blobs").fetchall():
+        index_blob_text(conn, rowid, decompress(data, codec).decode('utf-8'))
+        count += 1
+    if count:
+        print(f"Indexed {count} content blobs for full-text search")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Index foreign keys used by the analysis joins", [
+        "CREATE INDEX IF NOT EXISTS idx_website_content_website ON website_content (website_id, scraped_at)",
+        "CREATE INDEX IF NOT EXISTS idx_questions_website ON questions (website_id, is_active, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_llm_responses_question ON llm_responses (question_id)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_results_response ON analysis_results (llm_response_id)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_results_content ON analysis_results (website_content_id)",
+    ]),
+    Migration(2, "Covering indexes on analyzed_at and misrepresentation_detected", [
+        '''CREATE INDEX IF NOT EXISTS idx_analysis_results_analyzed_at
+           ON analysis_results (analyzed_at, misrepresentation_detected, accuracy_score)''',
+        '''CREATE INDEX IF NOT EXISTS idx_analysis_results_misrepresentation
+           ON analysis_results (misrepresentation_detected, analyzed_at, accuracy_score, llm_response_id)''',
+    ]),
+    Migration(3, "Content-addressed compressed blobs for scraped website content", [
+        '''CREATE TABLE IF NOT EXISTS content_blobs (
+               hash TEXT PRIMARY KEY,
+               compression TEXT NOT NULL,
+               data BLOB NOT NULL,
+               original_size INTEGER,
+               compressed_size INTEGER,
+               ref_count INTEGER NOT NULL DEFAULT 0,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           )''',
+        "ALTER TABLE website_content ADD COLUMN blob_hash TEXT REFERENCES content_blobs (hash)",
+    ], apply=_move_content_into_blobs),
+    Migration(4, "Daily analysis rollups per website and LLM service", [
+        CREATE_ROLLUPS_TABLE_SQL,
+        CREATE_ROLLUP_TRIGGER_SQL,
+    ], apply=rebuild_rollups),
+    Migration(5, "Denormalized website/service columns and keyset pagination indexes", [
+        "ALTER TABLE analysis_results ADD COLUMN website_id INTEGER",
+        "ALTER TABLE analysis_results ADD COLUMN llm_service TEXT",
+        '''UPDATE analysis_results SET
+               website_id = (SELECT q.website_id FROM llm_responses lr
+                             JOIN questions q ON lr.question_id = q.id
+                             WHERE lr.id = analysis_results.llm_response_id),
+               llm_service = (SELECT lr.llm_service FROM llm_responses lr
+                              WHERE lr.id = analysis_results.llm_response_id)''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_analysis_results_denormalize
+           AFTER INSERT ON analysis_results
+           BEGIN
+               UPDATE analysis_results SET
+                   website_id = (SELECT q.website_id FROM llm_responses lr
+                                 JOIN questions q ON lr.question_id = q.id
+                                 WHERE lr.id = NEW.llm_response_id),
+                   llm_service = (SELECT lr.llm_service FROM llm_responses lr
+                                  WHERE lr.id = NEW.llm_response_id)
+               WHERE id = NEW.id;
+           END''',
+        "CREATE INDEX IF NOT EXISTS idx_analysis_results_page ON analysis_results (analyzed_at, id)",
+        # Superseded by idx_analysis_results_page now that averages come from the rollups
+        "DROP INDEX IF EXISTS idx_analysis_results_analyzed_at",
+        '''CREATE INDEX IF NOT EXISTS idx_analysis_results_website_page
+           ON analysis_results (website_id, analyzed_at, id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_analysis_results_service_page
+           ON analysis_results (llm_service, analyzed_at, id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_analysis_results_misrepresentation_page
+           ON analysis_results (misrepresentation_detected, analyzed_at, id)''',
+    ]),
+    Migration(6, "Full-text search over responses, questions and scraped content", [
+        *FTS_SCHEMA_STATEMENTS,
+        "CREATE INDEX IF NOT EXISTS idx_website_content_blob ON website_content (blob_hash, scraped_at)",
+    ], apply=_index_existing_blobs),
+    Migration(7, "JSON analysis details with generated columns and an issues table", [
+        '''ALTER TABLE analysis_results ADD COLUMN confidence REAL GENERATED ALWAYS AS (
+               CASE WHEN json_valid(analysis_details)
+                    THEN json_extract(analysis_details, '$.confidence') END
+           ) VIRTUAL''',
+        '''ALTER TABLE analysis_results ADD COLUMN issue_count INTEGER GENERATED ALWAYS AS (
+               CASE WHEN json_valid(analysis_details)
+                         AND json_type(analysis_details, '$.specific_issues') = 'array'
+                    THEN json_array_length(analysis_details, '$.specific_issues') ELSE 0 END
+           ) VIRTUAL''',
+        CREATE_ISSUES_TABLE_SQL,
+        CREATE_ISSUES_INSERT_TRIGGER_SQL,
+        CREATE_ISSUES_DELETE_TRIGGER_SQL,
+        "CREATE INDEX IF NOT EXISTS idx_analysis_results_confidence ON analysis_results (confidence)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_results_issue_count ON analysis_results (issue_count)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_issues_website_type ON analysis_issues (website_id, issue_type)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_issues_result ON analysis_issues (analysis_result_id)",
+    ], apply=convert_legacy_analysis_details),
+    Migration(8, "Archive segment registry for tiered retention", [
+        CREATE_ARCHIVE_SEGMENTS_SQL,
+        "CREATE INDEX IF NOT EXISTS idx_archive_segments_month ON archive_segments (month)",
+        "CREATE INDEX IF NOT EXISTS idx_llm_responses_queried_at ON llm_responses (queried_at)",
+    ]),
+    Migration(9, "Durable monitoring job queue for resumable sessions", [
+        CREATE_JOBS_TABLE_SQL,
+        *JOB_INDEX_STATEMENTS,
+        # Sessions left 'running' before jobs existed can never be resumed
+        "UPDATE monitoring_sessions SET status = 'interrupted' WHERE status = 'running'",
+    ]),
+    Migration(10, "Job leases for multi-process workers", ADD_LEASE_COLUMNS_STATEMENTS),
+    Migration(11, "Persisted per-website schedule for the adaptive scheduler", [
+        CREATE_WEBSITE_SCHEDULES_SQL,
+        "CREATE INDEX IF NOT EXISTS idx_monitoring_jobs_website ON monitoring_jobs (website_id, state)",
+    ]),
+    Migration(12, "LLM token and cost spend per day, model and session", [
+        CREATE_SPEND_DAILY_SQL,
+        *ADD_SESSION_SPEND_STATEMENTS,
+    ]),
+    Migration(13, "Session status index for queueing and coalescing sessions", SESSION_INDEX_STATEMENTS),
+    Migration(14, "Batched judge calls and their token savings per session", ADD_SESSION_JUDGE_BATCH_STATEMENTS),
+    Migration(15, "Retrieval passages of scraped content", [
+        "ALTER TABLE website_content ADD COLUMN passages BLOB",
+    ]),
+    Migration(16, "Issue counts of archived analyses", [CREATE_ARCHIVED_ISSUE_COUNTS_SQL]),
+    Migration(17, "Whole-word matching of temporal issue patterns", [
+        "DROP TRIGGER IF EXISTS trg_analysis_results_issues",
+        CREATE_ISSUES_INSERT_TRIGGER_SQL,
+        RECLASSIFY_ISSUES_SQL,
+    ]),
+]
+
+
+def ensure_schema_version_table(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version (0 for a fresh database)"""
+    ensure_schema_version_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection, migrations: List[Migration] = None) -> List[int]:
+    """Apply pending migrations in version order, one transaction per migration"""
+    migrations = sorted(migrations if migrations is not None else MIGRATIONS, key=lambda m: m.version)
+    ensure_schema_version_table(conn)
+    conn.commit()
+
+    applied = []
+    for migration in migrations:
+        # Re-check inside the write lock so concurrent processes apply each step once
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+
+            print(f"Applying migration {migration.version}: {migration.description}")
+            migration.run(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (migration.version, migration.description)
+            )
+            conn.commit()
+            applied.append(migration.version)
+        except Exception:
+            conn.rollback()
+            raise
+
+    return applied
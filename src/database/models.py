@@ -1,25 +1,186 @@
 
 import sqlite3
 import json
-from datetime import datetime
+import base64
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from concurrent.futures import Future
+import atexit
 import os
 
+from .archive import ARCHIVE_CANDIDATES_SQL, ArchiveStore
+from .blob_store import compress_json, decompress_json, load_blob, release_blob, store_blob
+from .connection import ConnectionPool
+from .migrations import apply_migrations, get_schema_version
+from .search import (SEARCH_CONTENT_SQL, SEARCH_MAX_OFFSET, SEARCH_QUESTIONS_SQL, SEARCH_RESPONSES_SQL,
+                     SEARCH_SCOPES, build_fts_query, highlight_snippet, render_snippet)
+from .issues import ARCHIVE_ISSUE_COUNTS_SQL, ISSUE_TYPES_BY_WEBSITE_SQL, serialize_analysis
+from .jobs import (CLAIM_JOB_SQL, CLAIM_NEXT_JOB_SQL, FAIL_EXHAUSTED_JOBS_SQL, INSERT_JOB_SQL,
+                   INSERT_WEBSITE_JOB_SQL, JOB_COMPLETED, JOB_FAILED, JOB_PENDING, JOB_RUNNING, RENEW_LEASES_SQL,
+                   finish_job, lease_modifier)
+from .question_bank import AUTO_GENERATED_CATEGORY, QUESTION_BANK_SQL, refresh_question_bank
+from .spend import (ESCALATE_BUDGET_STATUS_SQL, LAST_VERDICT_SQL, RECORD_DAILY_SPEND_SQL, RECORD_JUDGE_BATCH_SQL,
+                    RECORD_SESSION_SPEND_SQL, SPEND_SNAPSHOT_SQL)
+from .sessions import (ACTIVE_SESSION_WEBSITES_SQL, CANCEL_SESSION_JOBS_SQL, CANCEL_SESSION_SQL, INSERT_SESSION_SQL,
+                       PROMOTE_QUEUED_SESSION_SQL, SESSION_QUEUED)
+from .schedules import (HAS_UNFINISHED_WEBSITE_JOBS_SQL, SCHEDULE_SIGNALS_SQL, SET_BASE_INTERVAL_SQL,
+                        UPSERT_WEBSITE_SCHEDULE_SQL)
+from .rollups import (ROLLUP_MISREPRESENTATIONS_BY_WEBSITE_SQL, ROLLUP_TOTALS_SQL,
+                      accuracy_stats, rebuild_rollups)
+from .write_behind import WriteBehindWriter
+
+INSERT_QUESTION_SQL = '''
+    INSERT INTO questions (website_id, question_text, category)
+    VALUES (?, ?, ?)
+'''
+
+INSERT_LLM_RESPONSE_SQL = '''
+    INSERT INTO llm_responses (question_id, llm_service, response_text, response_metadata)
+    VALUES (?, ?, ?, ?)
+'''
+
+INSERT_ANALYSIS_RESULT_SQL = '''
+    INSERT INTO analysis_results 
+    (llm_response_id, website_content_id, accuracy_score, 
+     misrepresentation_detected, analysis_details)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+RECENT_ANALYSIS_RESULTS_SQL = '''
+    SELECT 
+        ar.*,
+        lr.response_text,
+        lr.llm_service,
+        q.question_text,
+        w.name as website_name,
+        w.url as website_url,
+        wc.title as content_title
+    FROM analysis_results ar
+    JOIN llm_responses lr ON ar.llm_response_id = lr.id
+    JOIN questions q ON lr.question_id = q.id
+    JOIN websites w ON q.website_id = w.id
+    JOIN website_content wc ON ar.website_content_id = wc.id
+    ORDER BY ar.analyzed_at DESC
+    LIMIT ?
+'''
+
+RECENT_MISREPRESENTATIONS_SQL = '''
+    SELECT 
+        ar.analyzed_at,
+        w.name as website_name,
+        q.question_text,
+        ar.accuracy_score
+    FROM analysis_results ar
+    JOIN llm_responses lr ON ar.llm_response_id = lr.id
+    JOIN questions q ON lr.question_id = q.id
+    JOIN websites w ON q.website_id = w.id
+    WHERE ar.misrepresentation_detected = 1
+    ORDER BY ar.analyzed_at DESC
+    LIMIT 10
+'''
+
+ANALYSIS_RESULTS_PAGE_SQL = '''
+    SELECT 
+        ar.*,
+        lr.response_text,
+        q.question_text,
+        w.name as website_name,
+        w.url as website_url,
+        wc.title as content_title
+    FROM analysis_results ar
+    JOIN llm_responses lr ON ar.llm_response_id = lr.id
+    JOIN questions q ON lr.question_id = q.id
+    JOIN websites w ON ar.website_id = w.id
+    LEFT JOIN website_content wc ON ar.website_content_id = wc.id
+    {where}
+    ORDER BY ar.analyzed_at DESC, ar.id DESC
+    LIMIT ?
+'''
+
+def encode_page_cursor(analyzed_at: str, result_id: int) -> str:
+    """Opaque keyset cursor for the (analyzed_at, id) position of a result"""
+    raw = json.dumps([analyzed_at, result_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_page_cursor(cursor: str) -> tuple:
+    """Inverse of encode_page_cursor; raises ValueError for malformed cursors"""
+    try:
+        analyzed_at, result_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(analyzed_at), int(result_id)
+    except Exception:
+        raise ValueError(f"Invalid page cursor: {cursor}")
+
+def _normalize_timestamp(value: str) -> str:
+    """Match SQLite CURRENT_TIMESTAMP formatting ('YYYY-MM-DD HH:MM:SS')"""
+    return value.replace('T', ' ').rstrip('Z')
+
 class DatabaseManager:
-    def __init__(self, db_path: str = "./monitoring.db"):
+    def __init__(self, db_path: str = "./monitoring.db", write_behind: bool = None,
+                 archive_dir: str = None):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
+        self.writer: Optional[WriteBehindWriter] = None
+        self.archive = ArchiveStore(archive_dir or os.getenv("ARCHIVE_DIR", "./archive"))
         self.init_database()
         print(f"Database initialized at: {db_path}")
 
+        if write_behind is None:
+            write_behind = os.getenv("DB_WRITE_BEHIND", "false").lower() == "true"
+        if write_behind:
+            self.enable_write_behind(
+                batch_size=int(os.getenv("DB_WRITE_BATCH_SIZE", 100)),
+                flush_interval_ms=int(os.getenv("DB_WRITE_FLUSH_MS", 50)),
+                max_queue_size=int(os.getenv("DB_WRITE_QUEUE_SIZE", 1000))
+            )
+
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's pooled read-write database connection"""
+        return self.pool.writer()
+
+    def get_read_connection(self):
+        """Get this thread's pooled read-only database connection"""
+        return self.pool.reader()
+
+    def enable_write_behind(self, batch_size: int = 100, flush_interval_ms: int = 50,
+                            max_queue_size: int = 1000) -> WriteBehindWriter:
+        """Group-commit question job checkpoints on a background writer"""
+        if self.writer is None:
+            self.writer = WriteBehindWriter(
+                connect=self.pool.writer,
+                batch_size=batch_size,
+                flush_interval_ms=flush_interval_ms,
+                max_queue_size=max_queue_size
+            )
+            # Never lose queued results on interpreter shutdown
+            atexit.register(self.writer.close)
+        return self.writer
+
+    def flush_writes(self, timeout: float = None) -> bool:
+        """Wait until all queued writes are committed"""
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout=timeout)
+
+    def get_write_behind_stats(self) -> Dict:
+        """Write-behind queue metrics (empty when disabled)"""
+        if self.writer is None:
+            return {'enabled': False}
+        stats = self.writer.get_stats()
+        stats['enabled'] = True
+        return stats
+
+    def close(self):
+        """Flush pending writes and close all pooled connections"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.pool.close_all()
 
     def init_database(self):
         """Initialize the database with required tables"""
         print("Initializing database tables...")
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             
             # Websites table
@@ -104,12 +265,26 @@ class DatabaseManager:
             
             conn.commit()
             print("Database tables created successfully")
+            
+            applied = apply_migrations(conn)
+            print(f"Schema at version {get_schema_version(conn)} ({len(applied)} migrations applied)")
+
+    def get_schema_version(self) -> int:
+        """Get the current schema migration version"""
+        with self.get_connection() as conn:
+            return get_schema_version(conn)
+
+    def explain_query_plan(self, query: str, params: tuple = ()) -> List[str]:
+        """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        return [row['detail'] for row in rows]
 
     def add_website(self, url: str, name: str, description: str = "") -> int:
         """Add a new website to monitor"""
         print(f"Adding website: {name} ({url})")
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO websites (url, name, description)
@@ -125,8 +300,7 @@ class DatabaseManager:
         """Get all websites"""
         print("Fetching websites from database...")
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             
             query = "SELECT * FROM websites"
@@ -139,32 +313,135 @@ class DatabaseManager:
         print(f"Found {len(websites)} websites")
         return websites
 
-    def add_website_content(self, website_id: int, title: str, content: str, content_hash: str) -> int:
-        """Add scraped website content"""
+    def add_website_content(self, website_id: int, title: str, content: str, content_hash: str,
+                            passages: List[str] = None) -> int:
+        """Add scraped website content (text is stored once per distinct content blob).
+
+        `passages` are the scraper's retrieval passages, kept compressed with the row.
+        """
         print(f"Adding content for website ID: {website_id}")
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
+            blob_hash, created = store_blob(conn, content)
             cursor.execute('''
-                INSERT INTO website_content (website_id, title, content, content_hash)
-                VALUES (?, ?, ?, ?)
-            ''', (website_id, title, content, content_hash))
+                INSERT INTO website_content (website_id, title, content_hash, blob_hash, passages)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (website_id, title, content_hash, blob_hash, compress_json(passages) if passages else None))
             content_id = cursor.lastrowid
+            cursor.execute(
+                "UPDATE websites SET last_scraped = CURRENT_TIMESTAMP WHERE id = ?",
+                (website_id,)
+            )
             conn.commit()
             
-        print(f"Content added with ID: {content_id}")
+        print(f"Content added with ID: {content_id} ({'new' if created else 'deduplicated'} blob {blob_hash[:12]})")
         return content_id
 
+    def get_latest_content(self, website_id: int) -> Optional[Dict]:
+        """Get metadata of the most recent scrape of a website (without the text)"""
+        with self.get_read_connection() as conn:
+            row = conn.execute('''
+                SELECT id, website_id, content_hash, blob_hash, title, scraped_at
+                FROM website_content
+                WHERE website_id = ?
+                ORDER BY scraped_at DESC, id DESC
+                LIMIT 1
+            ''', (website_id,)).fetchone()
+        return dict(row) if row else None
+
+    def is_content_unchanged(self, website_id: int, content_hash: str) -> bool:
+        """Check whether a scrape matches the previous scrape of the website"""
+        latest = self.get_latest_content(website_id)
+        return latest is not None and latest['content_hash'] == content_hash
+
+    def mark_website_checked(self, website_id: int):
+        """Record a scrape that found no changes, without storing another content row"""
+        with self.get_connection() as conn:
+            conn.execute(
+                "UPDATE websites SET last_scraped = CURRENT_TIMESTAMP WHERE id = ?",
+                (website_id,)
+            )
+            conn.commit()
+
+    def was_analyzed_within(self, website_id: int, hours: float) -> bool:
+        """Whether the website has an analysis result younger than `hours`"""
+        with self.get_read_connection() as conn:
+            row = conn.execute(
+                "SELECT MAX(analyzed_at) >= datetime('now', ?) FROM analysis_results WHERE website_id = ?",
+                (f"-{float(hours)} hours", website_id)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def get_question_bank(self, website_id: int, max_size: int = 10) -> List[Dict]:
+        """Active questions asked on every run of a website: every manual question, then
+        the newest `max_size` auto-generated ones"""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(QUESTION_BANK_SQL, (website_id, website_id, max_size)).fetchall()
+        return [dict(row) for row in rows]
+
+    def has_generated_questions(self, website_id: int) -> bool:
+        """Whether the question bank of a website was ever filled by the LLM"""
+        with self.get_read_connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM questions WHERE website_id = ? AND category = ? LIMIT 1",
+                (website_id, AUTO_GENERATED_CATEGORY)
+            ).fetchone()
+        return row is not None
+
+    def refresh_question_bank(self, website_id: int, questions: List[str], max_size: int = 10) -> List[Dict]:
+        """Merge generated questions into the bank, rotate out the oldest, and return the bank"""
+        print(f"Refreshing question bank for website ID: {website_id}")
+        
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                merged_ids, deactivated = refresh_question_bank(conn, website_id, questions, max_size)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        
+        print(f"Question bank refreshed: {len(merged_ids)} merged, {deactivated} rotated out")
+        return self.get_question_bank(website_id, max_size)
+
+    def get_website_content(self, content_id: int) -> Optional[Dict]:
+        """Get a website_content row with its decompressed text and passages"""
+        with self.get_read_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM website_content WHERE id = ?", (content_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            result = dict(row)
+            if result.get('blob_hash'):
+                result['content'] = load_blob(conn, result['blob_hash'])
+            result['passages'] = decompress_json(result.get('passages')) or []
+        return result
+
+    def get_content_storage_stats(self) -> Dict:
+        """Summarize deduplication and compression of stored website content"""
+        with self.get_read_connection() as conn:
+            row = conn.execute('''
+                SELECT COUNT(*) as blobs,
+                       COALESCE(SUM(ref_count), 0) as references_count,
+                       COALESCE(SUM(original_size), 0) as original_bytes,
+                       COALESCE(SUM(compressed_size), 0) as compressed_bytes,
+                       COALESCE(SUM(original_size * ref_count), 0) as logical_bytes
+                FROM content_blobs
+            ''').fetchone()
+        stats = dict(row)
+        stats['compression_ratio'] = round(stats['original_bytes'] / max(stats['compressed_bytes'], 1), 2)
+        stats['dedup_ratio'] = round(stats['references_count'] / max(stats['blobs'], 1), 2)
+        return stats
+
     def add_question(self, website_id: int, question_text: str, category: str = "general") -> int:
         """Add a question for a website"""
         print(f"Adding question for website ID: {website_id}")
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO questions (website_id, question_text, category)
-                VALUES (?, ?, ?)
-            ''', (website_id, question_text, category))
+            cursor.execute(INSERT_QUESTION_SQL, (website_id, question_text, category))
             question_id = cursor.lastrowid
             conn.commit()
             
@@ -177,12 +454,9 @@ class DatabaseManager:
         
         metadata_json = json.dumps(metadata) if metadata else "{}"
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO llm_responses (question_id, llm_service, response_text, response_metadata)
-                VALUES (?, ?, ?, ?)
-            ''', (question_id, llm_service, response_text, metadata_json))
+            cursor.execute(INSERT_LLM_RESPONSE_SQL, (question_id, llm_service, response_text, metadata_json))
             response_id = cursor.lastrowid
             conn.commit()
             
@@ -191,19 +465,16 @@ class DatabaseManager:
 
     def add_analysis_result(self, llm_response_id: int, website_content_id: int, 
                           accuracy_score: float, misrepresentation_detected: bool, 
-                          analysis_details: str) -> int:
-        """Add analysis result"""
+                          analysis_details) -> int:
+        """Add analysis result (analysis_details is a dict or a JSON string)"""
         print(f"Adding analysis result for response ID: {llm_response_id}")
         
-        with sqlite3.connect(self.db_path) as conn:
+        analysis_details = serialize_analysis(analysis_details)
+        
+        with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO analysis_results 
-                (llm_response_id, website_content_id, accuracy_score, 
-                 misrepresentation_detected, analysis_details)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (llm_response_id, website_content_id, accuracy_score, 
-                  misrepresentation_detected, analysis_details))
+            cursor.execute(INSERT_ANALYSIS_RESULT_SQL, (llm_response_id, website_content_id, accuracy_score, 
+                                                        misrepresentation_detected, analysis_details))
             analysis_id = cursor.lastrowid
             conn.commit()
             
@@ -214,80 +485,112 @@ class DatabaseManager:
         """Get recent analysis results with joined data"""
         print(f"Fetching recent {limit} analysis results...")
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT 
-                    ar.*,
-                    lr.response_text,
-                    lr.llm_service,
-                    q.question_text,
-                    w.name as website_name,
-                    w.url as website_url,
-                    wc.title as content_title
-                FROM analysis_results ar
-                JOIN llm_responses lr ON ar.llm_response_id = lr.id
-                JOIN questions q ON lr.question_id = q.id
-                JOIN websites w ON q.website_id = w.id
-                JOIN website_content wc ON ar.website_content_id = wc.id
-                ORDER BY ar.analyzed_at DESC
-                LIMIT ?
-            ''', (limit,))
+            cursor.execute(RECENT_ANALYSIS_RESULTS_SQL, (limit,))
             
             results = [dict(row) for row in cursor.fetchall()]
             
         print(f"Found {len(results)} analysis results")
         return results
 
+    def get_analysis_results_page(self, limit: int = 50, cursor: str = None,
+                                  website_id: int = None, llm_service: str = None,
+                                  date_from: str = None, date_to: str = None,
+                                  min_score: float = None, max_score: float = None,
+                                  misrepresentation: bool = None) -> Dict:
+        """Get one page of analysis results, newest first, using keyset pagination.
+
+        Pages are addressed by the (analyzed_at, id) of the last row of the previous
+        page, so the cost of a page does not depend on how deep it is.
+        """
+        print(f"Fetching analysis results page (limit: {limit}, cursor: {cursor})")
+        
+        conditions = []
+        params = []
+        if cursor:
+            conditions.append("(ar.analyzed_at, ar.id) < (?, ?)")
+            params.extend(decode_page_cursor(cursor))
+        if website_id is not None:
+            conditions.append("ar.website_id = ?")
+            params.append(website_id)
+        if llm_service:
+            conditions.append("ar.llm_service = ?")
+            params.append(llm_service)
+        if date_from:
+            conditions.append("ar.analyzed_at >= ?")
+            params.append(_normalize_timestamp(date_from))
+        if date_to:
+            conditions.append("ar.analyzed_at <= ?")
+            params.append(_normalize_timestamp(date_to))
+        if min_score is not None:
+            conditions.append("ar.accuracy_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("ar.accuracy_score <= ?")
+            params.append(max_score)
+        if misrepresentation is not None:
+            conditions.append("ar.misrepresentation_detected = ?")
+            params.append(1 if misrepresentation else 0)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with self.get_read_connection() as conn:
+            # Fetch one extra row to know whether another page exists
+            rows = [dict(row) for row in conn.execute(
+                ANALYSIS_RESULTS_PAGE_SQL.format(where=where), (*params, limit + 1)
+            ).fetchall()]
+            
+            # Archived rows are all older than the hot ones, so deep pages continue into the archive
+            if len(rows) <= limit:
+                def matches(record: Dict) -> bool:
+                    return ((website_id is None or record.get('website_id') == website_id)
+                            and (not llm_service or record.get('llm_service') == llm_service)
+                            and (not date_to or record['analyzed_at'] <= _normalize_timestamp(date_to))
+                            and (min_score is None or (record.get('accuracy_score') or 0) >= min_score)
+                            and (max_score is None or (record.get('accuracy_score') or 0) <= max_score)
+                            and (misrepresentation is None
+                                 or bool(record.get('misrepresentation_detected')) == misrepresentation))
+                
+                date_from_key = _normalize_timestamp(date_from) if date_from else None
+                for record in self.archive.iter_analysis_records(
+                        conn, matches=matches, before=decode_page_cursor(cursor) if cursor else None,
+                        date_from=date_from_key):
+                    if date_from_key and record['analyzed_at'] < date_from_key:
+                        break
+                    rows.append(record)
+                    if len(rows) > limit:
+                        break
+        
+        items = rows[:limit]
+        has_more = len(rows) > limit
+        next_cursor = encode_page_cursor(items[-1]['analyzed_at'], items[-1]['id']) if has_more else None
+        
+        print(f"Found {len(items)} analysis results (has_more: {has_more})")
+        return {
+            'items': items,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }
+
     def get_misrepresentations_summary(self) -> Dict:
         """Get summary of misrepresentations"""
         print("Generating misrepresentations summary...")
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             
             # Total misrepresentations
-            cursor.execute('''
-                SELECT COUNT(*) as total_misrepresentations
-                FROM analysis_results 
-                WHERE misrepresentation_detected = 1
-            ''')
+            cursor.execute(ROLLUP_TOTALS_SQL)
             total_misrep = cursor.fetchone()['total_misrepresentations']
             
             # Misrepresentations by website
-            cursor.execute('''
-                SELECT 
-                    w.name,
-                    w.url,
-                    COUNT(*) as misrepresentation_count
-                FROM analysis_results ar
-                JOIN llm_responses lr ON ar.llm_response_id = lr.id
-                JOIN questions q ON lr.question_id = q.id
-                JOIN websites w ON q.website_id = w.id
-                WHERE ar.misrepresentation_detected = 1
-                GROUP BY w.id, w.name, w.url
-                ORDER BY misrepresentation_count DESC
-            ''')
+            cursor.execute(ROLLUP_MISREPRESENTATIONS_BY_WEBSITE_SQL)
             by_website = [dict(row) for row in cursor.fetchall()]
             
             # Recent misrepresentations
-            cursor.execute('''
-                SELECT 
-                    ar.analyzed_at,
-                    w.name as website_name,
-                    q.question_text,
-                    ar.accuracy_score
-                FROM analysis_results ar
-                JOIN llm_responses lr ON ar.llm_response_id = lr.id
-                JOIN questions q ON lr.question_id = q.id
-                JOIN websites w ON q.website_id = w.id
-                WHERE ar.misrepresentation_detected = 1
-                ORDER BY ar.analyzed_at DESC
-                LIMIT 10
-            ''')
+            cursor.execute(RECENT_MISREPRESENTATIONS_SQL)
             recent = [dict(row) for row in cursor.fetchall()]
             
         summary = {
@@ -299,3 +602,589 @@ class DatabaseManager:
         print(f"Summary generated: {total_misrep} total misrepresentations")
         return summary
 
+    def get_dashboard_stats(self) -> Dict:
+        """Get dashboard statistics from the rollup tables"""
+        print("Computing dashboard statistics from rollups...")
+        
+        with self.get_read_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT COUNT(*) as count FROM websites WHERE is_active = 1")
+            total_websites = cursor.fetchone()['count']
+            
+            cursor.execute(ROLLUP_TOTALS_SQL)
+            totals = dict(cursor.fetchone())
+            
+            # Recent activity (last 24 hours) is a range scan on the analyzed_at index
+            cursor.execute('''
+                SELECT COUNT(*) as count FROM analysis_results 
+                WHERE analyzed_at > datetime('now', '-1 day')
+            ''')
+            recent_activity = cursor.fetchone()['count']
+        
+        accuracy = accuracy_stats(totals['accuracy_count'], totals['accuracy_sum'], totals['accuracy_sum_sq'])
+        total_analyses = totals['total_analyses']
+        total_misrepresentations = totals['total_misrepresentations']
+        
+        return {
+            'total_websites': total_websites,
+            'total_analyses': total_analyses,
+            'total_misrepresentations': total_misrepresentations,
+            'recent_activity': recent_activity,
+            'average_accuracy': round(accuracy['mean'], 3),
+            'accuracy_stddev': round(accuracy['stddev'], 3),
+            'misrepresentation_rate': round((total_misrepresentations / max(total_analyses, 1)) * 100, 2)
+        }
+
+    def rebuild_rollups(self) -> int:
+        """Recompute the analysis rollups from scratch"""
+        print("Rebuilding analysis rollups...")
+        
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row_count = rebuild_rollups(conn)
+                archived = self._add_archived_rollups(conn)
+                if archived:
+                    row_count = conn.execute("SELECT COUNT(*) FROM analysis_rollups").fetchone()[0]
+                    print(f"Included {archived} archived analysis results")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        
+        print(f"Rollups rebuilt: {row_count} rows")
+        return row_count
+
+    def search(self, query: str, scope: str = "responses", limit: int = 20, offset: int = 0) -> Dict:
+        """Full-text search with ranked, highlighted snippets.
+
+        `scope` is one of 'responses' (LLM responses), 'questions' or 'content'
+        (scraped website content). Results are ordered by BM25 relevance and
+        snippets are HTML-escaped apart from their <mark> tags. Offsets past
+        SEARCH_MAX_OFFSET are rejected.
+        """
+        if scope not in SEARCH_SCOPES:
+            raise ValueError(f"Unknown search scope '{scope}', expected one of {', '.join(SEARCH_SCOPES)}")
+        if offset > SEARCH_MAX_OFFSET:
+            raise ValueError(f"Search offset is capped at {SEARCH_MAX_OFFSET}, refine the query instead")
+        
+        fts_query = build_fts_query(query)
+        print(f"Searching {scope} for: {fts_query} (limit: {limit}, offset: {offset})")
+        
+        sql = {
+            'responses': SEARCH_RESPONSES_SQL,
+            'questions': SEARCH_QUESTIONS_SQL,
+            'content': SEARCH_CONTENT_SQL
+        }[scope]
+        
+        with self.get_read_connection() as conn:
+            rows = conn.execute(sql, (fts_query, limit + 1, offset)).fetchall()
+            results = [dict(row) for row in rows[:limit]]
+            
+            if scope == 'content':
+                # The content index is contentless, so snippets are cut from the blob text
+                for result in results:
+                    text = load_blob(conn, result['blob_hash']) or ""
+                    result['snippet'] = highlight_snippet(text, query)
+            else:
+                for result in results:
+                    result['snippet'] = render_snippet(result['snippet'])
+        
+        has_more = len(rows) > limit
+        next_offset = offset + len(results) if has_more else None
+        if next_offset is not None and next_offset > SEARCH_MAX_OFFSET:
+            next_offset = None
+        print(f"Found {len(results)} {scope} matches (has_more: {has_more})")
+        return {
+            'query': query,
+            'scope': scope,
+            'results': results,
+            'has_more': has_more,
+            'next_offset': next_offset
+        }
+
+    def get_issue_types_by_website(self, website_id: int = None) -> List[Dict]:
+        """Most frequent issue types per website, from analysis_issues and archived issue counts"""
+        print(f"Aggregating issue types (website_id: {website_id})")
+        
+        where = "WHERE website_id = ?" if website_id is not None else ""
+        params = (website_id, website_id) if website_id is not None else ()
+        
+        with self.get_read_connection() as conn:
+            rows = conn.execute(ISSUE_TYPES_BY_WEBSITE_SQL.format(where=where), params).fetchall()
+        
+        return [dict(row) for row in rows]
+
+    def _add_archived_rollups(self, conn: sqlite3.Connection) -> int:
+        """Fold archived analysis results back into freshly rebuilt rollups"""
+        totals = {}
+        for record in self.archive.iter_all_records(conn):
+            if record.get('id') is None or not record.get('analyzed_at'):
+                continue
+            key = (record['analyzed_at'][:10], record.get('website_id') or 0, record.get('llm_service'))
+            entry = totals.setdefault(key, [0, 0, 0, 0.0, 0.0])
+            score = record.get('accuracy_score')
+            entry[0] += 1
+            entry[1] += 1 if record.get('misrepresentation_detected') else 0
+            if score is not None:
+                entry[2] += 1
+                entry[3] += score
+                entry[4] += score * score
+        
+        conn.executemany('''
+            INSERT INTO analysis_rollups (
+                day, website_id, llm_service, analysis_count, misrepresentation_count,
+                accuracy_count, accuracy_sum, accuracy_sum_sq
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (day, website_id, llm_service) DO UPDATE SET
+                analysis_count = analysis_count + excluded.analysis_count,
+                misrepresentation_count = misrepresentation_count + excluded.misrepresentation_count,
+                accuracy_count = accuracy_count + excluded.accuracy_count,
+                accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+                accuracy_sum_sq = accuracy_sum_sq + excluded.accuracy_sum_sq
+        ''', [(*key, *values) for key, values in totals.items()])
+        return sum(values[0] for values in totals.values())
+
+    def archive_old_results(self, older_than_days: int = None, batch_size: int = 5000,
+                            dry_run: bool = False) -> Dict:
+        """Move LLM responses and their analyses older than the retention age into the archive.
+
+        Rollups are left untouched and the archived analyses' issue counts move to
+        archived_issue_counts, so dashboard totals and issue types keep covering
+        archived history.
+        """
+        if older_than_days is None:
+            older_than_days = int(os.getenv("RETENTION_DAYS", 180))
+        cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"Archiving results older than {cutoff} ({older_than_days} days){' [dry run]' if dry_run else ''}")
+        
+        summary = {
+            'cutoff': cutoff,
+            'responses_archived': 0,
+            'analysis_results_archived': 0,
+            'segments_written': 0,
+            'content_rows_pruned': 0,
+            'dry_run': dry_run
+        }
+        
+        conn = self.get_connection()
+        if dry_run:
+            records = [dict(row) for row in conn.execute(ARCHIVE_CANDIDATES_SQL, (cutoff, cutoff, -1)).fetchall()]
+            summary['responses_archived'] = len({r['llm_response_id'] for r in records})
+            summary['analysis_results_archived'] = sum(1 for r in records if r['id'] is not None)
+            return summary
+        
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                records = [dict(row) for row in
+                           conn.execute(ARCHIVE_CANDIDATES_SQL, (cutoff, cutoff, batch_size)).fetchall()]
+                if not records:
+                    conn.rollback()
+                    break
+                
+                # Files first; they only become visible once registered below
+                segments = self.archive.write_segments(records)
+                conn.executemany('''
+                    INSERT INTO archive_segments (path, month, row_count, min_analyzed_at, max_analyzed_at)
+                    VALUES (:path, :month, :row_count, :min_analyzed_at, :max_analyzed_at)
+                ''', segments)
+                
+                response_ids = sorted({r['llm_response_id'] for r in records})
+                placeholders = ",".join("?" * len(response_ids))
+                # Deleting the analyses deletes their issues; keep their counts
+                conn.execute(ARCHIVE_ISSUE_COUNTS_SQL.format(placeholders=placeholders), response_ids)
+                conn.execute(f"DELETE FROM analysis_results WHERE llm_response_id IN ({placeholders})", response_ids)
+                conn.execute(f"DELETE FROM llm_responses WHERE id IN ({placeholders})", response_ids)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            
+            summary['responses_archived'] += len(response_ids)
+            summary['analysis_results_archived'] += sum(1 for r in records if r['id'] is not None)
+            summary['segments_written'] += len(segments)
+        
+        summary['content_rows_pruned'] = self._prune_old_content(cutoff)
+        print(f"Archived {summary['responses_archived']} responses "
+              f"({summary['analysis_results_archived']} analyses) into {summary['segments_written']} segments")
+        return summary
+
+    def _prune_old_content(self, cutoff: str) -> int:
+        """Delete old scrape rows no hot analysis refers to, keeping each site's latest scrape"""
+        with self.get_connection() as conn:
+            rows = conn.execute('''
+                SELECT wc.id, wc.blob_hash FROM website_content wc
+                WHERE wc.scraped_at < ?
+                  AND NOT EXISTS (SELECT 1 FROM analysis_results ar WHERE ar.website_content_id = wc.id)
+                  AND wc.id != (SELECT latest.id FROM website_content latest
+                                WHERE latest.website_id = wc.website_id
+                                ORDER BY latest.scraped_at DESC, latest.id DESC LIMIT 1)
+            ''', (cutoff,)).fetchall()
+            for content_id, blob_hash in rows:
+                conn.execute("DELETE FROM website_content WHERE id = ?", (content_id,))
+                if blob_hash:
+                    release_blob(conn, blob_hash)
+            conn.commit()
+        return len(rows)
+
+    def vacuum(self):
+        """Reclaim free pages after archiving"""
+        print("Vacuuming database...")
+        conn = self.get_connection()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+    def create_session_jobs(self, session_id: int, website_ids: List[int], options: Dict = None):
+        """Enqueue one website job per website of a monitoring session"""
+        options_json = json.dumps(options) if options else None
+        with self.get_connection() as conn:
+            conn.executemany(INSERT_WEBSITE_JOB_SQL, [
+                (session_id, website_id, options_json) for website_id in website_ids
+            ])
+            conn.commit()
+
+    def get_session_jobs(self, session_id: int, kind: str = None, website_id: int = None,
+                         states: tuple = None) -> List[Dict]:
+        """Jobs of a monitoring session, optionally filtered"""
+        conditions = ["j.session_id = ?"]
+        params = [session_id]
+        if kind:
+            conditions.append("j.kind = ?")
+            params.append(kind)
+        if website_id is not None:
+            conditions.append("j.website_id = ?")
+            params.append(website_id)
+        if states:
+            conditions.append(f"j.state IN ({','.join('?' * len(states))})")
+            params.extend(states)
+        
+        with self.get_read_connection() as conn:
+            rows = conn.execute(f'''
+                SELECT j.*, q.question_text FROM monitoring_jobs j
+                LEFT JOIN questions q ON j.question_id = q.id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY j.id
+            ''', params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        with self.get_read_connection() as conn:
+            row = conn.execute('''
+                SELECT j.*, q.question_text FROM monitoring_jobs j
+                LEFT JOIN questions q ON j.question_id = q.id
+                WHERE j.id = ?
+            ''', (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def claim_job(self, job_id: int, owner: str, lease_seconds: float) -> bool:
+        """Lease a specific job if it is pending or its previous lease expired"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(CLAIM_JOB_SQL, (owner, lease_modifier(lease_seconds), job_id))
+            conn.commit()
+        return cursor.rowcount == 1
+
+    def claim_next_job(self, owner: str, lease_seconds: float) -> Optional[Dict]:
+        """Lease the next claimable job of any session, or None if there is nothing to do"""
+        with self.get_connection() as conn:
+            row = conn.execute(CLAIM_NEXT_JOB_SQL, (owner, lease_modifier(lease_seconds))).fetchone()
+            conn.commit()
+        return self.get_job(row[0]) if row else None
+
+    def renew_leases(self, owner: str, job_ids: List[int], lease_seconds: float) -> int:
+        """Heartbeat: extend the leases `owner` holds on the given in-progress jobs"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(RENEW_LEASES_SQL, (lease_modifier(lease_seconds), owner, json.dumps(job_ids)))
+            conn.commit()
+        return cursor.rowcount
+
+    def fail_exhausted_jobs(self, max_attempts: int, session_id: int = None) -> int:
+        """Fail expired jobs that already used up their attempts"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(FAIL_EXHAUSTED_JOBS_SQL, (max_attempts, session_id, session_id))
+            conn.commit()
+        if cursor.rowcount:
+            print(f"Gave up on {cursor.rowcount} jobs after {max_attempts} attempts")
+        return cursor.rowcount
+
+    def fail_job(self, job_id: int, error: str, result: Dict = None, lease_owner: str = None):
+        with self.get_connection() as conn:
+            try:
+                finish_job(conn, job_id, JOB_FAILED, result=result, error=error, lease_owner=lease_owner)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def complete_website_job(self, job_id: int, result: Dict, content_id: int = None,
+                             question_ids: List[int] = (), llm_services: List[str] = (),
+                             lease_owner: str = None):
+        """Finish a website job and enqueue its question jobs in one transaction"""
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = conn.execute(
+                    "SELECT session_id, website_id, options FROM monitoring_jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+                conn.executemany(INSERT_JOB_SQL, [
+                    (job[0], 'question', job[1], question_id, llm_service, content_id, job[2])
+                    for question_id in question_ids for llm_service in llm_services
+                ])
+                finish_job(conn, job_id, JOB_COMPLETED, result=result, lease_owner=lease_owner)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def checkpoint_question_job(self, job_id: int, question_id: int, llm_service: str,
+                                response_text: str, metadata: Dict, website_content_id: int,
+                                analysis: Optional[Dict], result: Dict, error: str = None,
+                                lease_owner: str = None) -> Future:
+        """Store a response, its analysis and the job's final state atomically.
+
+        Goes through the write-behind writer when enabled, so the checkpoint is
+        committed in the same group transaction; a crash before the commit leaves
+        the job unfinished and it is simply redone on resume. If the lease was lost
+        to another process nothing is stored and the future raises LeaseLostError.
+        """
+        metadata_json = json.dumps(metadata) if metadata else "{}"
+        
+        def checkpoint(conn: sqlite3.Connection) -> int:
+            response_id = conn.execute(
+                INSERT_LLM_RESPONSE_SQL, (question_id, llm_service, response_text, metadata_json)
+            ).lastrowid
+            analysis_id = None
+            if analysis is not None:
+                analysis_id = conn.execute(INSERT_ANALYSIS_RESULT_SQL, (
+                    response_id, website_content_id, analysis.get('accuracy_score', 0.0),
+                    analysis.get('misrepresentation_detected', False), serialize_analysis(analysis)
+                )).lastrowid
+            finish_job(conn, job_id, JOB_FAILED if error else JOB_COMPLETED, result=result, error=error,
+                       llm_response_id=response_id, analysis_result_id=analysis_id, lease_owner=lease_owner)
+            return response_id
+        
+        if self.writer is not None:
+            return self.writer.submit_call(checkpoint)
+        
+        future = Future()
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                response_id = checkpoint(conn)
+                conn.commit()
+                future.set_result(response_id)
+            except Exception as e:
+                conn.rollback()
+                future.set_exception(e)
+        return future
+
+    def reset_interrupted_jobs(self, session_id: int) -> int:
+        """Put jobs left 'running' under an expired lease (their owner died) back to 'pending'"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "UPDATE monitoring_jobs SET state = ?, lease_owner = NULL, updated_at = CURRENT_TIMESTAMP "
+                "WHERE session_id = ? AND state = ? "
+                "AND (lease_expires_at IS NULL OR lease_expires_at < CURRENT_TIMESTAMP)",
+                (JOB_PENDING, session_id, JOB_RUNNING)
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    def count_unfinished_jobs(self, session_id: int) -> int:
+        with self.get_read_connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM monitoring_jobs WHERE session_id = ? AND state IN (?, ?)",
+                (session_id, JOB_PENDING, JOB_RUNNING)
+            ).fetchone()[0]
+
+    def get_job_counts(self, session_id: int) -> Dict:
+        """Number of jobs per kind and state for a session"""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                "SELECT kind, state, COUNT(*) FROM monitoring_jobs WHERE session_id = ? GROUP BY kind, state",
+                (session_id,)
+            ).fetchall()
+        counts = {}
+        for kind, state, count in rows:
+            counts.setdefault(kind, {})[state] = count
+        return counts
+
+    def enqueue_session(self, session_name: str, website_ids: List[int], options: Dict = None):
+        """Create a queued session with one website job per website no active session covers yet.
+
+        Returns (session id or None when every website is covered, {website id: covering session id}).
+        Runs in one write transaction, so concurrent requests for the same sites coalesce.
+        """
+        options_json = json.dumps(options) if options else None
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                active = {row[0]: row[1] for row in conn.execute(ACTIVE_SESSION_WEBSITES_SQL)}
+                covered = {website_id: active[website_id] for website_id in website_ids if website_id in active}
+                remaining = [website_id for website_id in website_ids if website_id not in active]
+                session_id = None
+                if remaining:
+                    session_id = conn.execute(
+                        INSERT_SESSION_SQL, (session_name, datetime.now(), SESSION_QUEUED)
+                    ).lastrowid
+                    conn.executemany(INSERT_WEBSITE_JOB_SQL, [
+                        (session_id, website_id, options_json) for website_id in remaining
+                    ])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return session_id, covered
+
+    def promote_queued_sessions(self, max_running: int) -> List[int]:
+        """Mark queued sessions running, oldest first, while fewer than `max_running` run"""
+        promoted = []
+        with self.get_connection() as conn:
+            while True:
+                row = conn.execute(PROMOTE_QUEUED_SESSION_SQL, (datetime.now(), max_running)).fetchone()
+                conn.commit()
+                if row is None:
+                    return promoted
+                promoted.append(row[0])
+
+    def cancel_session(self, session_id: int) -> bool:
+        """Cancel a queued or running session and its unfinished jobs; False if it already ended"""
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cancelled = conn.execute(CANCEL_SESSION_SQL, (datetime.now(), session_id)).rowcount == 1
+                if cancelled:
+                    conn.execute(CANCEL_SESSION_JOBS_SQL, (session_id,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return cancelled
+
+    def get_sessions(self, status: str = None, limit: int = 50) -> List[Dict]:
+        """Most recent monitoring sessions, optionally with one status"""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM monitoring_sessions WHERE (? IS NULL OR status = ?) ORDER BY id DESC LIMIT ?",
+                (status, status, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_session(self, session_id: int) -> Optional[Dict]:
+        with self.get_read_connection() as conn:
+            row = conn.execute("SELECT * FROM monitoring_sessions WHERE id = ?", (session_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_sessions_by_status(self, status: str) -> List[Dict]:
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM monitoring_sessions WHERE status = ? ORDER BY id", (status,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_website_schedules(self) -> List[Dict]:
+        """Persisted scheduler state, one row per website"""
+        with self.get_read_connection() as conn:
+            rows = conn.execute("SELECT * FROM website_schedules ORDER BY next_due_at").fetchall()
+        return [dict(row) for row in rows]
+
+    def save_website_schedules(self, schedules: List[Dict]):
+        """Upsert the adaptive interval and next due time of websites in one transaction"""
+        with self.get_connection() as conn:
+            conn.executemany(UPSERT_WEBSITE_SCHEDULE_SQL, schedules)
+            conn.commit()
+
+    def set_website_interval(self, website_id: int, interval_hours: Optional[float], default_hours: float):
+        """Override the base monitoring interval of a website (None restores `default_hours`)"""
+        with self.get_connection() as conn:
+            conn.execute(SET_BASE_INTERVAL_SQL, (website_id, interval_hours, interval_hours, default_hours))
+            conn.commit()
+
+    def get_schedule_signals(self, website_id: int, since: str, misrepresentations_since: str) -> Dict:
+        """Whether a website was checked or changed since `since`, and its recent misrepresentations (UTC)"""
+        with self.get_read_connection() as conn:
+            row = conn.execute(SCHEDULE_SIGNALS_SQL, {
+                'website_id': website_id,
+                'since': since,
+                'misrepresentations_since': misrepresentations_since
+            }).fetchone()
+        return {
+            'checked': bool(row['checked']),
+            'content_changed': bool(row['content_changed']),
+            'misrepresentations': row['misrepresentations']
+        }
+
+    def has_unfinished_website_jobs(self, website_id: int) -> bool:
+        with self.get_read_connection() as conn:
+            return conn.execute(HAS_UNFINISHED_WEBSITE_JOBS_SQL, (website_id,)).fetchone() is not None
+
+    def record_llm_spend(self, session_id: Optional[int], model: str, prompt_tokens: int,
+                         completion_tokens: int, cost_usd: float):
+        """Add one LLM call to today's spend of its model and to its session's totals"""
+        params = {
+            'session_id': session_id,
+            'model': model,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'cost_usd': cost_usd
+        }
+        with self.get_connection() as conn:
+            conn.execute(RECORD_DAILY_SPEND_SQL, params)
+            if session_id is not None:
+                conn.execute(RECORD_SESSION_SPEND_SQL, params)
+            conn.commit()
+
+    def get_spend_snapshot(self, session_id: Optional[int], model: str) -> Dict:
+        """Tokens and cost spent by a session, today overall and today by one model"""
+        with self.get_read_connection() as conn:
+            row = conn.execute(SPEND_SNAPSHOT_SQL, {'session_id': session_id, 'model': model}).fetchone()
+        return dict(row)
+
+    def set_session_estimate(self, session_id: int, tokens: int, cost_usd: float):
+        with self.get_connection() as conn:
+            conn.execute(
+                "UPDATE monitoring_sessions SET estimated_tokens = ?, estimated_cost_usd = ? WHERE id = ?",
+                (tokens, cost_usd, session_id)
+            )
+            conn.commit()
+
+    def escalate_session_budget_status(self, session_id: int, status: str):
+        """Move a session's budget status forward (ok -> degraded -> exhausted), never back"""
+        with self.get_connection() as conn:
+            conn.execute(ESCALATE_BUDGET_STATUS_SQL, {'session_id': session_id, 'status': status})
+            conn.commit()
+
+    def get_session_spend(self, session_id: int) -> Dict:
+        with self.get_read_connection() as conn:
+            row = conn.execute(
+                "SELECT tokens_used, ROUND(cost_usd, 6) AS cost_usd, estimated_tokens, estimated_cost_usd, "
+                "budget_status, judge_batches, judge_batched_answers, judge_tokens_saved "
+                "FROM monitoring_sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        return dict(row) if row else {}
+
+    def record_judge_batch(self, session_id: int, answers: int, tokens_saved: int):
+        """Count a batched judge call of a session and the prompt tokens it saved"""
+        with self.get_connection() as conn:
+            conn.execute(RECORD_JUDGE_BATCH_SQL,
+                         {'session_id': session_id, 'answers': answers, 'tokens_saved': tokens_saved})
+            conn.commit()
+
+    def get_daily_spend(self, days: int = 7) -> List[Dict]:
+        """Spend per day and model over the last `days` days, newest first"""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                "SELECT day, model, calls, prompt_tokens, completion_tokens, total_tokens, "
+                "ROUND(cost_usd, 6) AS cost_usd FROM llm_spend_daily "
+                "WHERE day > date('now', ?) ORDER BY day DESC, model",
+                (f"-{int(days)} days",)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_last_verdict(self, question_id: int, llm_service: str, content_id: int) -> Optional[Dict]:
+        """Latest analysis of the same question, model and scraped content, if any"""
+        with self.get_read_connection() as conn:
+            row = conn.execute(LAST_VERDICT_SQL, (question_id, llm_service, content_id)).fetchone()
+        return dict(row) if row else None
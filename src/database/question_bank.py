@@ -0,0 +1,81 @@
+import re
+import sqlite3
+from typing import Dict, List, Tuple
+
+AUTO_GENERATED_CATEGORY = "auto-generated"
+
+# Every active manual question (from the API or seed data), first, then the newest
+# auto-generated ones up to the bank size: only generated questions count against
+# it and are rotated out
+QUESTION_BANK_SQL = '''
+    SELECT * FROM questions
+    WHERE website_id = ? AND is_active = 1
+      AND (category IS NOT 'auto-generated' OR id IN (
+          SELECT id FROM questions
+          WHERE website_id = ? AND is_active = 1 AND category = 'auto-generated'
+          ORDER BY created_at DESC, id DESC
+          LIMIT ?
+      ))
+    ORDER BY (category IS 'auto-generated'), created_at DESC, id DESC
+'''
+
+# Deactivate the oldest auto-generated questions beyond the bank size
+ROTATE_QUESTION_BANK_SQL = '''
+    UPDATE questions SET is_active = 0
+    WHERE id IN (
+        SELECT id FROM questions
+        WHERE website_id = ? AND is_active = 1 AND category = 'auto-generated'
+          AND id NOT IN (SELECT value FROM json_each(?))
+        ORDER BY created_at ASC, id ASC
+        LIMIT max(0, (SELECT COUNT(*) FROM questions
+                      WHERE website_id = ? AND is_active = 1 AND category = 'auto-generated') - ?)
+    )
+'''
+
+
+def normalize_question(text: str) -> str:
+    """Comparison key for near-duplicate questions (case, spacing, trailing punctuation)"""
+    return re.sub(r'\s+', ' ', text).strip().rstrip('?.!').strip().lower()
+
+
+def refresh_question_bank(conn: sqlite3.Connection, website_id: int, texts: List[str],
+                          max_size: int) -> Tuple[List[int], int]:
+    """Merge freshly generated questions into a website's bank, then rotate generated ones down to max_size.
+
+    Questions already in the bank are kept as they are, and previously rotated-out
+    questions are reactivated rather than duplicated, so answers stay comparable
+    across runs. Runs inside the caller's transaction. Returns (merged ids, deactivated count).
+    """
+    existing: Dict[str, Dict] = {}
+    for row in conn.execute(
+        "SELECT id, question_text, is_active FROM questions WHERE website_id = ? ORDER BY id",
+        (website_id,)
+    ).fetchall():
+        key = normalize_question(row[1])
+        # Prefer an active row when the same question was stored more than once
+        if key not in existing or (row[2] and not existing[key]['is_active']):
+            existing[key] = {'id': row[0], 'is_active': row[2]}
+
+    merged_ids = []
+    for text in texts:
+        key = normalize_question(text)
+        if not key:
+            continue
+        match = existing.get(key)
+        if match is None:
+            cursor = conn.execute(
+                "INSERT INTO questions (website_id, question_text, category) VALUES (?, ?, ?)",
+                (website_id, text.strip(), AUTO_GENERATED_CATEGORY)
+            )
+            match = existing[key] = {'id': cursor.lastrowid, 'is_active': 1}
+        elif not match['is_active']:
+            conn.execute("UPDATE questions SET is_active = 1 WHERE id = ?", (match['id'],))
+            match['is_active'] = 1
+        if match['id'] not in merged_ids:
+            merged_ids.append(match['id'])
+
+    cursor = conn.execute(
+        ROTATE_QUESTION_BANK_SQL,
+        (website_id, '[' + ','.join(str(i) for i in merged_ids) + ']', website_id, max_size)
+    )
+    return merged_ids, cursor.rowcount
@@ -0,0 +1,110 @@
+import sqlite3
+
+# One row per (day, website, llm_service). Accuracy is kept as count / sum / sum of
+# squares so averages and standard deviations can be derived without the raw rows.
+CREATE_ROLLUPS_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS analysis_rollups (
+        day TEXT NOT NULL,
+        website_id INTEGER NOT NULL,
+        llm_service TEXT NOT NULL,
+        analysis_count INTEGER NOT NULL DEFAULT 0,
+        misrepresentation_count INTEGER NOT NULL DEFAULT 0,
+        accuracy_count INTEGER NOT NULL DEFAULT 0,
+        accuracy_sum REAL NOT NULL DEFAULT 0,
+        accuracy_sum_sq REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, website_id, llm_service)
+    )
+'''
+
+# Keeps the rollups in the same transaction as every analysis_results insert,
+# including batched inserts from the write-behind writer. There is deliberately
+# no DELETE trigger: archiving old results must not change historical totals.
+CREATE_ROLLUP_TRIGGER_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS trg_analysis_results_rollup
+    AFTER INSERT ON analysis_results
+    BEGIN
+        INSERT INTO analysis_rollups (
+            day, website_id, llm_service, analysis_count, misrepresentation_count,
+            accuracy_count, accuracy_sum, accuracy_sum_sq
+        )
+        SELECT
+            date(NEW.analyzed_at),
+            COALESCE(q.website_id, 0),
+            lr.llm_service,
+            1,
+            CASE WHEN NEW.misrepresentation_detected = 1 THEN 1 ELSE 0 END,
+            CASE WHEN NEW.accuracy_score IS NULL THEN 0 ELSE 1 END,
+            COALESCE(NEW.accuracy_score, 0),
+            COALESCE(NEW.accuracy_score * NEW.accuracy_score, 0)
+        FROM llm_responses lr
+        JOIN questions q ON lr.question_id = q.id
+        WHERE lr.id = NEW.llm_response_id
+        ON CONFLICT (day, website_id, llm_service) DO UPDATE SET
+            analysis_count = analysis_count + excluded.analysis_count,
+            misrepresentation_count = misrepresentation_count + excluded.misrepresentation_count,
+            accuracy_count = accuracy_count + excluded.accuracy_count,
+            accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+            accuracy_sum_sq = accuracy_sum_sq + excluded.accuracy_sum_sq;
+    END
+'''
+
+REBUILD_ROLLUPS_SQL = '''
+    INSERT INTO analysis_rollups (
+        day, website_id, llm_service, analysis_count, misrepresentation_count,
+        accuracy_count, accuracy_sum, accuracy_sum_sq
+    )
+    SELECT
+        date(ar.analyzed_at),
+        COALESCE(q.website_id, 0),
+        lr.llm_service,
+        COUNT(*),
+        SUM(CASE WHEN ar.misrepresentation_detected = 1 THEN 1 ELSE 0 END),
+        COUNT(ar.accuracy_score),
+        COALESCE(SUM(ar.accuracy_score), 0),
+        COALESCE(SUM(ar.accuracy_score * ar.accuracy_score), 0)
+    FROM analysis_results ar
+    JOIN llm_responses lr ON ar.llm_response_id = lr.id
+    JOIN questions q ON lr.question_id = q.id
+    GROUP BY date(ar.analyzed_at), COALESCE(q.website_id, 0), lr.llm_service
+'''
+
+ROLLUP_TOTALS_SQL = '''
+    SELECT
+        COALESCE(SUM(analysis_count), 0) as total_analyses,
+        COALESCE(SUM(misrepresentation_count), 0) as total_misrepresentations,
+        COALESCE(SUM(accuracy_count), 0) as accuracy_count,
+        COALESCE(SUM(accuracy_sum), 0) as accuracy_sum,
+        COALESCE(SUM(accuracy_sum_sq), 0) as accuracy_sum_sq
+    FROM analysis_rollups
+'''
+
+ROLLUP_MISREPRESENTATIONS_BY_WEBSITE_SQL = '''
+    SELECT
+        w.name,
+        w.url,
+        r.misrepresentation_count
+    FROM (
+        SELECT website_id, SUM(misrepresentation_count) as misrepresentation_count
+        FROM analysis_rollups
+        GROUP BY website_id
+    ) r
+    JOIN websites w ON r.website_id = w.id
+    WHERE r.misrepresentation_count > 0
+    ORDER BY r.misrepresentation_count DESC
+'''
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> int:
+    """Recompute all rollups from analysis_results inside the caller's transaction"""
+    conn.execute("DELETE FROM analysis_rollups")
+    conn.execute(REBUILD_ROLLUPS_SQL)
+    return conn.execute("SELECT COUNT(*) FROM analysis_rollups").fetchone()[0]
+
+
+def accuracy_stats(count: int, total: float, total_sq: float) -> dict:
+    """Mean and population standard deviation from count / sum / sum of squares"""
+    if not count:
+        return {'mean': 0.0, 'stddev': 0.0}
+    mean = total / count
+    variance = max(total_sq / count - mean * mean, 0.0)
+    return {'mean': mean, 'stddev': variance ** 0.5}
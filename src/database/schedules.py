@@ -0,0 +1,58 @@
+# Per-website monitoring cadence, persisted so the scheduler resumes where it left
+# off after a restart. interval_hours is the current adaptive interval;
+# base_interval_hours optionally overrides the scheduler's base interval for a site.
+CREATE_WEBSITE_SCHEDULES_SQL = '''
+    CREATE TABLE IF NOT EXISTS website_schedules (
+        website_id INTEGER PRIMARY KEY,
+        base_interval_hours REAL,
+        interval_hours REAL NOT NULL,
+        next_due_at TIMESTAMP NOT NULL,
+        last_enqueued_at TIMESTAMP,
+        stable_runs INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (website_id) REFERENCES websites (id)
+    )
+'''
+
+UPSERT_WEBSITE_SCHEDULE_SQL = '''
+    INSERT INTO website_schedules (website_id, interval_hours, next_due_at, last_enqueued_at, stable_runs)
+    VALUES (:website_id, :interval_hours, :next_due_at, :last_enqueued_at, :stable_runs)
+    ON CONFLICT (website_id) DO UPDATE SET
+        interval_hours = excluded.interval_hours,
+        next_due_at = excluded.next_due_at,
+        last_enqueued_at = excluded.last_enqueued_at,
+        stable_runs = excluded.stable_runs,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# A NULL interval clears the override; the adaptive interval restarts from the new base
+SET_BASE_INTERVAL_SQL = '''
+    INSERT INTO website_schedules (website_id, base_interval_hours, interval_hours, next_due_at)
+    VALUES (?, ?, COALESCE(?, ?), CURRENT_TIMESTAMP)
+    ON CONFLICT (website_id) DO UPDATE SET
+        base_interval_hours = excluded.base_interval_hours,
+        interval_hours = excluded.interval_hours,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# What happened to a website since it was last enqueued: whether it was scraped at
+# all and whether new content was stored (unchanged scrapes store none). Unchanged
+# sites may be skipped without new analyses, so misrepresentations are counted over
+# a separate recency window
+SCHEDULE_SIGNALS_SQL = '''
+    SELECT
+        COALESCE((SELECT last_scraped >= :since FROM websites WHERE id = :website_id), 0) AS checked,
+        EXISTS (
+            SELECT 1 FROM website_content WHERE website_id = :website_id AND scraped_at >= :since
+        ) AS content_changed,
+        (SELECT COUNT(*) FROM analysis_results
+         WHERE website_id = :website_id AND analyzed_at >= :misrepresentations_since
+           AND misrepresentation_detected = 1
+        ) AS misrepresentations
+'''
+
+HAS_UNFINISHED_WEBSITE_JOBS_SQL = '''
+    SELECT 1 FROM monitoring_jobs
+    WHERE website_id = ? AND state IN ('pending', 'running')
+    LIMIT 1
+'''
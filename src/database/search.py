@@ -0,0 +1,172 @@
+import html
+import re
+import sqlite3
+from typing import List
+
+# External-content FTS5 indexes over llm_responses and questions are kept in sync
+# by triggers. Scraped content lives compressed in content_blobs, which triggers
+# cannot read, so its index is contentless and maintained by blob_store instead.
+FTS_SCHEMA_STATEMENTS = [
+    '''CREATE VIRTUAL TABLE IF NOT EXISTS llm_responses_fts USING fts5(
+           response_text, content='llm_responses', content_rowid='id', tokenize='porter unicode61'
+       )''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_llm_responses_fts_insert AFTER INSERT ON llm_responses BEGIN
+           INSERT INTO llm_responses_fts (rowid, response_text) VALUES (NEW.id, NEW.response_text);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_llm_responses_fts_delete AFTER DELETE ON llm_responses BEGIN
+           INSERT INTO llm_responses_fts (llm_responses_fts, rowid, response_text)
+           VALUES ('delete', OLD.id, OLD.response_text);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_llm_responses_fts_update AFTER UPDATE OF response_text ON llm_responses BEGIN
+           INSERT INTO llm_responses_fts (llm_responses_fts, rowid, response_text)
+           VALUES ('delete', OLD.id, OLD.response_text);
+           INSERT INTO llm_responses_fts (rowid, response_text) VALUES (NEW.id, NEW.response_text);
+       END''',
+    '''CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+           question_text, content='questions', content_rowid='id', tokenize='porter unicode61'
+       )''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_questions_fts_insert AFTER INSERT ON questions BEGIN
+           INSERT INTO questions_fts (rowid, question_text) VALUES (NEW.id, NEW.question_text);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_questions_fts_delete AFTER DELETE ON questions BEGIN
+           INSERT INTO questions_fts (questions_fts, rowid, question_text)
+           VALUES ('delete', OLD.id, OLD.question_text);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_questions_fts_update AFTER UPDATE OF question_text ON questions BEGIN
+           INSERT INTO questions_fts (questions_fts, rowid, question_text)
+           VALUES ('delete', OLD.id, OLD.question_text);
+           INSERT INTO questions_fts (rowid, question_text) VALUES (NEW.id, NEW.question_text);
+       END''',
+    '''CREATE VIRTUAL TABLE IF NOT EXISTS content_blobs_fts USING fts5(
+           content, content='', tokenize='porter unicode61'
+       )''',
+    "INSERT INTO llm_responses_fts (llm_responses_fts) VALUES ('rebuild')",
+    "INSERT INTO questions_fts (questions_fts) VALUES ('rebuild')",
+]
+
+SEARCH_SCOPES = ('responses', 'questions', 'content')
+
+# Every page ranks all matches before skipping `offset` rows, so deep paging is capped
+SEARCH_MAX_OFFSET = 1000
+
+# snippet() wraps matches in these control characters; render_snippet escapes the
+# text and only then turns them into <mark> tags
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+SEARCH_RESPONSES_SQL = '''
+    SELECT
+        lr.id,
+        lr.question_id,
+        lr.llm_service,
+        lr.queried_at,
+        q.question_text,
+        q.website_id,
+        w.name as website_name,
+        snippet(llm_responses_fts, 0, char(2), char(3), '…', 24) as snippet,
+        bm25(llm_responses_fts) as rank
+    FROM llm_responses_fts
+    JOIN llm_responses lr ON lr.id = llm_responses_fts.rowid
+    LEFT JOIN questions q ON lr.question_id = q.id
+    LEFT JOIN websites w ON q.website_id = w.id
+    WHERE llm_responses_fts MATCH ?
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+'''
+
+SEARCH_QUESTIONS_SQL = '''
+    SELECT
+        q.id,
+        q.website_id,
+        q.category,
+        q.created_at,
+        w.name as website_name,
+        snippet(questions_fts, 0, char(2), char(3), '…', 24) as snippet,
+        bm25(questions_fts) as rank
+    FROM questions_fts
+    JOIN questions q ON q.id = questions_fts.rowid
+    LEFT JOIN websites w ON q.website_id = w.id
+    WHERE questions_fts MATCH ?
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+'''
+
+SEARCH_CONTENT_SQL = '''
+    SELECT
+        cb.hash as blob_hash,
+        wc.id as content_id,
+        wc.website_id,
+        wc.title,
+        wc.scraped_at,
+        w.name as website_name,
+        w.url as website_url,
+        bm25(content_blobs_fts) as rank
+    FROM content_blobs_fts
+    JOIN content_blobs cb ON cb.id = content_blobs_fts.rowid
+    JOIN website_content wc ON wc.id = (
+        SELECT id FROM website_content
+        WHERE blob_hash = cb.hash
+        ORDER BY scraped_at DESC, id DESC
+        LIMIT 1
+    )
+    LEFT JOIN websites w ON wc.website_id = w.id
+    WHERE content_blobs_fts MATCH ?
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+'''
+
+
+def build_fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all words (prefix match with a trailing *)"""
+    terms = []
+    for token in re.findall(r'\w+\*?', text):
+        prefix = token.endswith('*')
+        word = token.rstrip('*')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    return " ".join(terms)
+
+
+def index_blob_text(conn: sqlite3.Connection, blob_rowid: int, text: str):
+    conn.execute("INSERT INTO content_blobs_fts (rowid, content) VALUES (?, ?)", (blob_rowid, text))
+
+
+def unindex_blob_text(conn: sqlite3.Connection, blob_rowid: int, text: str):
+    # Contentless tables need the original text to remove its tokens
+    conn.execute(
+        "INSERT INTO content_blobs_fts (content_blobs_fts, rowid, content) VALUES ('delete', ?, ?)",
+        (blob_rowid, text)
+    )
+
+
+def render_snippet(snippet: str) -> str:
+    """HTML-escape an FTS snippet and turn its match markers into <mark> tags"""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def highlight_snippet(text: str, query_text: str, window: int = 24) -> str:
+    """Build an HTML-escaped, highlighted snippet in Python for contentless FTS matches"""
+    words = text.split()
+    if not words:
+        return ""
+    terms = [t.rstrip('*').lower() for t in re.findall(r'\w+\*?', query_text)]
+
+    def matches(word: str) -> bool:
+        cleaned = re.sub(r'\W+', '', word).lower()
+        # Prefix comparison roughly mirrors the porter stemmer used by the index
+        return any(cleaned.startswith(term[:max(len(term) - 2, 3)]) for term in terms if term)
+
+    first = next((i for i, word in enumerate(words) if matches(word)), 0)
+    start = max(first - window // 3, 0)
+    end = min(start + window, len(words))
+
+    pieces: List[str] = [
+        f"<mark>{html.escape(word)}</mark>" if matches(word) else html.escape(word)
+        for word in words[start:end]
+    ]
+    prefix = "… " if start > 0 else ""
+    suffix = " …" if end < len(words) else ""
+    return prefix + " ".join(pieces) + suffix
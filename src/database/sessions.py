@@ -0,0 +1,49 @@
+# Session states: queued -> running -> completed, or cancelled from queued/running.
+# Sessions wait in 'queued' while the concurrent session limit is reached; workers
+# only claim jobs of running sessions.
+SESSION_QUEUED = 'queued'
+SESSION_RUNNING = 'running'
+SESSION_COMPLETED = 'completed'
+SESSION_CANCELLED = 'cancelled'
+ACTIVE_SESSION_STATES = (SESSION_QUEUED, SESSION_RUNNING)
+
+SESSION_INDEX_STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS idx_monitoring_sessions_status ON monitoring_sessions (status, id)",
+]
+
+INSERT_SESSION_SQL = '''
+    INSERT INTO monitoring_sessions (session_name, started_at, status)
+    VALUES (?, ?, ?)
+'''
+
+# Websites that an active session still has work for, so a new request for them
+# can be coalesced into that session instead of paying for the same LLM calls twice
+ACTIVE_SESSION_WEBSITES_SQL = '''
+    SELECT website_id, MIN(session_id) AS session_id
+    FROM monitoring_jobs
+    WHERE state IN ('pending', 'running')
+      AND session_id IN (SELECT id FROM monitoring_sessions WHERE status IN ('queued', 'running'))
+    GROUP BY website_id
+'''
+
+# Start the oldest queued session if fewer than the limit are running; one statement,
+# so processes promoting at the same time cannot exceed the limit
+PROMOTE_QUEUED_SESSION_SQL = '''
+    UPDATE monitoring_sessions SET status = 'running', started_at = ?
+    WHERE id = (SELECT id FROM monitoring_sessions WHERE status = 'queued' ORDER BY id LIMIT 1)
+      AND (SELECT COUNT(*) FROM monitoring_sessions WHERE status = 'running') < ?
+    RETURNING id
+'''
+
+CANCEL_SESSION_SQL = '''
+    UPDATE monitoring_sessions SET status = 'cancelled', completed_at = ?
+    WHERE id = ? AND status IN ('queued', 'running')
+'''
+
+# Leased jobs are cancelled too; their owners' checkpoints then fail the lease check
+CANCEL_SESSION_JOBS_SQL = '''
+    UPDATE monitoring_jobs
+    SET state = 'cancelled', error = 'Session cancelled', lease_expires_at = NULL,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE session_id = ? AND state IN ('pending', 'running')
+'''
@@ -0,0 +1,90 @@
+# Token and cost accounting for LLM calls. Daily spend per model is kept as a
+# small rollup so budget checks are a few primary-key lookups, and each session
+# carries its own running totals next to its pre-flight estimate.
+CREATE_SPEND_DAILY_SQL = '''
+    CREATE TABLE IF NOT EXISTS llm_spend_daily (
+        day TEXT NOT NULL,
+        model TEXT NOT NULL,
+        calls INTEGER NOT NULL DEFAULT 0,
+        prompt_tokens INTEGER NOT NULL DEFAULT 0,
+        completion_tokens INTEGER NOT NULL DEFAULT 0,
+        total_tokens INTEGER NOT NULL DEFAULT 0,
+        cost_usd REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, model)
+    )
+'''
+
+ADD_SESSION_SPEND_STATEMENTS = [
+    "ALTER TABLE monitoring_sessions ADD COLUMN tokens_used INTEGER DEFAULT 0",
+    "ALTER TABLE monitoring_sessions ADD COLUMN cost_usd REAL DEFAULT 0",
+    "ALTER TABLE monitoring_sessions ADD COLUMN estimated_tokens INTEGER",
+    "ALTER TABLE monitoring_sessions ADD COLUMN estimated_cost_usd REAL",
+    "ALTER TABLE monitoring_sessions ADD COLUMN budget_status TEXT DEFAULT 'ok'",
+]
+
+RECORD_DAILY_SPEND_SQL = '''
+    INSERT INTO llm_spend_daily (day, model, calls, prompt_tokens, completion_tokens, total_tokens, cost_usd)
+    VALUES (date('now'), :model, 1, :prompt_tokens, :completion_tokens, :total_tokens, :cost_usd)
+    ON CONFLICT (day, model) DO UPDATE SET
+        calls = calls + 1,
+        prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+        completion_tokens = completion_tokens + excluded.completion_tokens,
+        total_tokens = total_tokens + excluded.total_tokens,
+        cost_usd = cost_usd + excluded.cost_usd
+'''
+
+RECORD_SESSION_SPEND_SQL = '''
+    UPDATE monitoring_sessions
+    SET tokens_used = COALESCE(tokens_used, 0) + :total_tokens,
+        cost_usd = COALESCE(cost_usd, 0) + :cost_usd
+    WHERE id = :session_id
+'''
+
+# Batched judging: judge calls made for several answers at once, the answers they
+# covered, and the prompt tokens saved against judging each answer on its own
+ADD_SESSION_JUDGE_BATCH_STATEMENTS = [
+    "ALTER TABLE monitoring_sessions ADD COLUMN judge_batches INTEGER DEFAULT 0",
+    "ALTER TABLE monitoring_sessions ADD COLUMN judge_batched_answers INTEGER DEFAULT 0",
+    "ALTER TABLE monitoring_sessions ADD COLUMN judge_tokens_saved INTEGER DEFAULT 0",
+]
+
+RECORD_JUDGE_BATCH_SQL = '''
+    UPDATE monitoring_sessions
+    SET judge_batches = COALESCE(judge_batches, 0) + 1,
+        judge_batched_answers = COALESCE(judge_batched_answers, 0) + :answers,
+        judge_tokens_saved = COALESCE(judge_tokens_saved, 0) + :tokens_saved
+    WHERE id = :session_id
+'''
+
+# Spend a budget check compares against: the session, today overall and today for one model
+SPEND_SNAPSHOT_SQL = '''
+    SELECT
+        COALESCE((SELECT tokens_used FROM monitoring_sessions WHERE id = :session_id), 0) AS session_tokens,
+        COALESCE((SELECT cost_usd FROM monitoring_sessions WHERE id = :session_id), 0) AS session_cost,
+        COALESCE((SELECT SUM(total_tokens) FROM llm_spend_daily WHERE day = date('now')), 0) AS daily_tokens,
+        COALESCE((SELECT SUM(cost_usd) FROM llm_spend_daily WHERE day = date('now')), 0) AS daily_cost,
+        COALESCE((SELECT total_tokens FROM llm_spend_daily WHERE day = date('now') AND model = :model), 0)
+            AS model_tokens,
+        COALESCE((SELECT cost_usd FROM llm_spend_daily WHERE day = date('now') AND model = :model), 0)
+            AS model_cost
+'''
+
+# Latest verdict on the same question, model and scraped content
+LAST_VERDICT_SQL = '''
+    SELECT ar.accuracy_score, ar.misrepresentation_detected, ar.confidence
+    FROM llm_responses lr
+    JOIN analysis_results ar ON ar.llm_response_id = lr.id
+    WHERE lr.question_id = ? AND lr.llm_service = ? AND ar.website_content_id = ?
+    ORDER BY ar.id DESC
+    LIMIT 1
+'''
+
+_BUDGET_STATUS_RANK = "CASE {} WHEN 'ok' THEN 0 WHEN 'degraded' THEN 1 ELSE 2 END"
+
+# Budget status only moves forward: ok -> degraded -> exhausted
+ESCALATE_BUDGET_STATUS_SQL = '''
+    UPDATE monitoring_sessions SET budget_status = :status
+    WHERE id = :session_id
+      AND ''' + _BUDGET_STATUS_RANK.format("COALESCE(budget_status, 'ok')") + '''
+        < ''' + _BUDGET_STATUS_RANK.format(":status") + '''
+'''
@@ -0,0 +1,178 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+
+class WriteRecord:
+    """A pending write: a callable run inside the batch transaction"""
+
+    __slots__ = ('func', 'future')
+
+    def __init__(self, func: Callable[[sqlite3.Connection], object]):
+        self.func = func
+        self.future = Future()
+
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """Background writer that group-commits queued writes.
+
+    Each write is a callable taking the connection, such as the checkpoint of a
+    question job (its response, analysis and job state). Writes are taken from a
+    bounded queue and run in one transaction per `batch_size` writes or
+    `flush_interval_ms` milliseconds, whichever comes first; callers receive the
+    callable's return value through the Future returned by submit_call().
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], batch_size: int = 100,
+                 flush_interval_ms: int = 50, max_queue_size: int = 1000):
+        self._connect = connect
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_queue_size = max_queue_size
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'records_submitted': 0,
+            'records_written': 0,
+            'records_failed': 0,
+            'batches_committed': 0,
+            'max_queue_depth': 0,
+            'producer_waits': 0,
+            'producer_wait_seconds': 0.0,
+            'last_batch_size': 0,
+            'last_commit_ms': 0.0
+        }
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._thread.start()
+
+        print(f"Write-behind writer started (batch_size={batch_size}, "
+              f"flush_interval_ms={flush_interval_ms}, max_queue_size={max_queue_size})")
+
+    def submit_call(self, func: Callable[[sqlite3.Connection], object]) -> Future:
+        """Queue a callable that runs inside the next batch transaction"""
+        return self._enqueue(WriteRecord(func))
+
+    def _enqueue(self, record: WriteRecord) -> Future:
+        if self._closed:
+            raise RuntimeError("Write-behind writer is closed")
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Backpressure: the producer blocks until the writer catches up
+            wait_started = time.perf_counter()
+            self._queue.put(record)
+            with self._stats_lock:
+                self._stats['producer_waits'] += 1
+                self._stats['producer_wait_seconds'] += time.perf_counter() - wait_started
+
+        with self._stats_lock:
+            self._stats['records_submitted'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+        return record.future
+
+    def _run(self):
+        conn = self._connect()
+        stopping = False
+
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    record = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            self._write_batch(conn, batch)
+
+        # Flush on shutdown: drain whatever is still queued
+        remaining_records = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not _STOP:
+                remaining_records.append(record)
+        for start in range(0, len(remaining_records), self.batch_size):
+            self._write_batch(conn, remaining_records[start:start + self.batch_size])
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[WriteRecord]):
+        started = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            results = [record.func(conn) for record in batch]
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            if len(batch) > 1:
+                # Isolate the failing record so the rest of the batch still commits
+                print(f"Write-behind batch of {len(batch)} failed ({str(e)}), retrying records individually")
+                for record in batch:
+                    self._write_batch(conn, [record])
+            else:
+                print(f"Write-behind record failed: {str(e)}")
+                batch[0].future.set_exception(e)
+                with self._stats_lock:
+                    self._stats['records_failed'] += 1
+            return
+
+        for record, result in zip(batch, results):
+            record.future.set_result(result)
+
+        with self._stats_lock:
+            self._stats['records_written'] += len(batch)
+            self._stats['batches_committed'] += 1
+            self._stats['last_batch_size'] = len(batch)
+            self._stats['last_commit_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+    def queue_depth(self) -> int:
+        """Number of records waiting to be written"""
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict:
+        """Throughput and backpressure metrics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_capacity'] = self.max_queue_size
+        stats['queue_utilization'] = round(stats['queue_depth'] / max(self.max_queue_size, 1), 3)
+        stats['avg_batch_size'] = round(stats['records_written'] / max(stats['batches_committed'], 1), 2)
+        stats['producer_wait_seconds'] = round(stats['producer_wait_seconds'], 3)
+        return stats
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until everything submitted so far is committed"""
+        marker = self.submit_call(lambda conn: None)
+        try:
+            marker.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: float = 30.0):
+        """Stop accepting records, flush the queue and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        print(f"Write-behind writer stopped: {self.get_stats()['records_written']} records written")
@@ -0,0 +1,171 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from .cache import ResponseCache, cache_from_env
+from .client import LLMClientMixin, http_client_options, http_pool_settings
+from .resilience import guard_for
+
+
+class AsyncLLMClient(LLMClientMixin):
+    """Asynchronous counterpart of LLMClient on AsyncOpenAI.
+
+    All calls share one httpx.AsyncClient connection pool (keep-alive, connection
+    limits and optional HTTP/2 from the LITELLM_* pool settings), so hundreds of
+    requests can be in flight against the LiteLLM proxy from one event loop.
+    Results have the same shapes as LLMClient's and go through the same response
+    cache. Close it with aclose() or use it as an async context manager.
+    """
+
+    def __init__(self, target_models: List[str] = None, judge_model: str = None,
+                 http_client: Optional[httpx.AsyncClient] = None, max_in_flight: int = None,
+                 cache: ResponseCache = None):
+        self._init_models(target_models, judge_model)
+
+        self.http_settings = http_pool_settings()
+        # Requests beyond the pool size would only wait for a connection inside httpx
+        self.max_in_flight = max_in_flight or self.http_settings['max_connections']
+        self.owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(**http_client_options(self.http_settings))
+        self.client = AsyncOpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            http_client=self.http_client,
+            max_retries=0
+        )
+        # Shared with LLMClient instances calling the same endpoint
+        self.guard = guard_for(self.base_url or "default")
+        self._semaphore = None
+        self.cache = cache if cache is not None else cache_from_env()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it belongs to the loop the client is used from
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    async def _complete(self, request: Dict, timeout: Optional[float]):
+        """chat.completions.create through the endpoint guard, within max_in_flight"""
+        async with self.semaphore:
+            return await self.guard.acall(
+                lambda: self.client.chat.completions.create(**request, **self._call_options(timeout))
+            )
+
+    async def query_llm(self, question: str, context: str = "", model: str = None, timeout: float = None,
+                        fresh: bool = False) -> Dict:
+        """Query the LLM service (a target model, by default LITELLM_MODEL) with a question"""
+        request = self._request('query', question=question, context=context, model=model)
+        result = None if fresh else self._cached_result('query', request)
+        if result is not None:
+            return result
+        try:
+            response = await self._complete(request, timeout)
+            result = self._query_result(response, request['model'])
+            self._store_result('query', request, result)
+            return result
+
+        except Exception as e:
+            return self._query_error(e)
+
+    async def analyze_accuracy(self, llm_response: str, actual_content: str, question: str,
+                               timeout: float = None, fresh: bool = False) -> Dict:
+        """Analyze the accuracy of LLM response against actual website content"""
+        request = self._request('analysis', llm_response=llm_response, actual_content=actual_content,
+                                question=question)
+        result = None if fresh else self._cached_result('analysis', request)
+        if result is not None:
+            return result
+        try:
+            response = await self._complete(request, timeout)
+            result = self._analysis_result(response)
+            self._store_result('analysis', request, result)
+            return result
+
+        except Exception as e:
+            return self._analysis_error(e)
+
+    async def analyze_accuracy_batch(self, items: List[Dict], actual_content: str, timeout: float = None,
+                                     fresh: bool = False) -> Dict:
+        """Judge several answers against the same website content, sending the content once"""
+        batch = self._new_batch()
+        pending = []
+        for item in items:
+            cached = self._cached_verdict(item, actual_content, fresh)
+            if cached is not None:
+                batch["results"][item['id']] = cached
+            else:
+                pending.append(item)
+
+        todo = [pending] if pending else []
+        try:
+            while todo:
+                chunk = todo.pop()
+                if len(chunk) == 1:
+                    item = chunk[0]
+                    result = await self.analyze_accuracy(item['response'], actual_content, item['question'],
+                                                         timeout=timeout, fresh=True)
+                    self._add_single_verdict(batch, item, result)
+                    continue
+                response = await self._complete(self._batch_request(chunk, actual_content), timeout)
+                todo.extend(self._apply_batch_answer(batch, chunk, actual_content, response))
+        except Exception as e:
+            return self._finish_batch(batch, e)
+        return self._finish_batch(batch)
+
+    async def generate_questions(self, website_content: str, website_name: str, num_questions: int = 5,
+                                 timeout: float = None, fresh: bool = False) -> List[str]:
+        """Generate relevant questions based on website content"""
+        request = self._request('questions', website_content=website_content, website_name=website_name,
+                                num_questions=num_questions)
+        questions = None if fresh else self._cached_result('questions', request)
+        if questions is not None:
+            return questions
+        try:
+            response = await self._complete(request, timeout)
+            questions = self._parse_questions(response.choices[0].message.content, num_questions)
+            if questions:
+                self._store_result('questions', request, questions)
+            return questions
+
+        except Exception as e:
+            return self._fallback_questions(website_name, e)
+
+    async def query_many(self, questions: List[str], model: str = None, context: str = "",
+                         timeout: float = None, fresh: bool = False) -> List[Dict]:
+        """Query one model with many questions concurrently; results are in question order"""
+        return await asyncio.gather(*[
+            self.query_llm(question, context=context, model=model, timeout=timeout, fresh=fresh)
+            for question in questions
+        ])
+
+    async def test_connection(self) -> bool:
+        """Test connection to the LLM service"""
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "user", "content": "Hello, please respond with 'Connection successful'"}
+                ],
+                max_tokens=50
+            )
+            result = "connection successful" in response.choices[0].message.content.lower()
+            print(f"Connection test result: {'Success' if result else 'Failed'}")
+            return result
+
+        except Exception as e:
+            print(f"Connection test failed: {str(e)}")
+            return False
+
+    async def aclose(self):
+        """Close the connection pool, unless it was passed in by the caller"""
+        if self.owns_http_client:
+            await self.http_client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..database.llm_cache import SQLiteCacheTier
+
+# Kinds of cacheable LLM calls and the client methods making them
+CALL_TYPES = {'query_llm': 'query', 'analyze_accuracy': 'analysis', 'generate_questions': 'questions'}
+
+# Answers of the monitored models are not cached unless LLM_CACHE_TTL_QUERY_HOURS
+# is set: scheduled sessions measure what the models answer now
+DEFAULT_TTL_HOURS = {'query': 0, 'analysis': 168, 'questions': 168}
+
+
+def cache_key(model: str, messages: List[Dict], max_tokens: int, temperature: float) -> str:
+    """Hash of everything that determines a completion request"""
+    request = json.dumps([model, messages, max_tokens, temperature], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+
+class MemoryCacheTier:
+    """The most recently used responses held in memory, up to `max_entries`"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, call_type: str, value: str, expires_at: float):
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+
+class ResponseCache:
+    """Successful LLM results, looked up by a hash of the request, through a list of tiers.
+
+    Tiers are tried fastest first (the in-memory LRU, then SQLite); a hit in a
+    slower tier is copied into the faster ones. Each kind of call has its own
+    TTL, and a TTL of 0 leaves that kind uncached. Any object with get, put,
+    clear and size methods can be a tier.
+    """
+
+    def __init__(self, tiers: List, ttl_hours: Dict[str, float] = None):
+        self.tiers = tiers
+        self.ttl_hours = {**DEFAULT_TTL_HOURS, **(ttl_hours or {})}
+        self.lock = threading.Lock()
+        self.counters = {call_type: {'hits': 0, 'misses': 0, 'bypassed': 0, 'stores': 0, 'tokens_saved': 0,
+                                     'tier_hits': {tier.name: 0 for tier in tiers}}
+                         for call_type in self.ttl_hours}
+
+    def enabled_for(self, call_type: str) -> bool:
+        return self.ttl_hours.get(call_type, 0) > 0
+
+    def _count(self, call_type: str, counter: str, amount: int = 1):
+        with self.lock:
+            self.counters[call_type][counter] += amount
+
+    def get(self, call_type: str, key: str):
+        """Cached result of a request, or None"""
+        if not self.enabled_for(call_type):
+            return None
+        now = time.time()
+        for i, tier in enumerate(self.tiers):
+            try:
+                entry = tier.get(key, now)
+            except Exception as e:
+                print(f"LLM cache {tier.name} lookup failed: {str(e)}")
+                continue
+            if entry is None:
+                continue
+            value, expires_at = entry
+            for faster in self.tiers[:i]:
+                faster.put(key, call_type, value, expires_at)
+            result = json.loads(value)
+            with self.lock:
+                counters = self.counters[call_type]
+                counters['hits'] += 1
+                counters['tier_hits'][tier.name] += 1
+                if isinstance(result, dict):
+                    counters['tokens_saved'] += int((result.get('usage') or {}).get('total_tokens') or 0)
+            return result
+        self._count(call_type, 'misses')
+        return None
+
+    def put(self, call_type: str, key: str, result):
+        if not self.enabled_for(call_type):
+            return
+        value = json.dumps(result)
+        expires_at = time.time() + self.ttl_hours[call_type] * 3600
+        for tier in self.tiers:
+            try:
+                tier.put(key, call_type, value, expires_at)
+            except Exception as e:
+                print(f"LLM cache {tier.name} store failed: {str(e)}")
+        self._count(call_type, 'stores')
+
+    def bypass(self, call_type: str):
+        """Count a lookup skipped for a fresh sample"""
+        if self.enabled_for(call_type):
+            self._count(call_type, 'bypassed')
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            by_type = json.loads(json.dumps(self.counters))
+        for counters in by_type.values():
+            lookups = counters['hits'] + counters['misses']
+            counters['hit_rate'] = round(counters['hits'] / lookups, 3) if lookups else 0.0
+        sizes = {}
+        for tier in self.tiers:
+            try:
+                sizes[tier.name] = tier.size()
+            except Exception:
+                sizes[tier.name] = None
+        return {'ttl_hours': self.ttl_hours, 'entries': sizes, 'calls': by_type}
+
+
+def cache_from_env() -> Optional[ResponseCache]:
+    """Response cache configured by the LLM_CACHE_* variables; None when disabled"""
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    tiers = [MemoryCacheTier(int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", 1000)))]
+    cache_path = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+    if cache_path:
+        tiers.append(SQLiteCacheTier(cache_path))
+    ttl_hours = {
+        call_type: float(os.getenv(f"LLM_CACHE_TTL_{call_type.upper()}_HOURS", default))
+        for call_type, default in DEFAULT_TTL_HOURS.items()
+    }
+    return ResponseCache(tiers, ttl_hours)
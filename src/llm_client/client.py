@@ -1,5 +1,6 @@
 
 
+import importlib.util
 import os
 import json
 from typing import Dict, List, Optional
@@ -7,29 +8,73 @@ from openai import OpenAI
 import httpx
 from dotenv import load_dotenv
 
+from .cache import CALL_TYPES, ResponseCache, cache_from_env, cache_key
+from .resilience import guard_for
+from .retrieval import PassageIndex
+
 load_dotenv()
 
-class LLMClient:
-    def __init__(self):
+
+def http_pool_settings() -> Dict:
+    """Connection pool, HTTP/2 and timeout settings shared by the sync and async clients"""
+    return {
+        'max_connections': int(os.getenv("LITELLM_MAX_CONNECTIONS", 100)),
+        'max_keepalive_connections': int(os.getenv("LITELLM_MAX_KEEPALIVE_CONNECTIONS", 20)),
+        'keepalive_expiry': float(os.getenv("LITELLM_KEEPALIVE_EXPIRY", 30)),
+        'http2': os.getenv("LITELLM_HTTP2", "false").lower() in ("1", "true", "yes"),
+        'timeout': float(os.getenv("LITELLM_TIMEOUT", 600)),
+        'connect_timeout': float(os.getenv("LITELLM_CONNECT_TIMEOUT", 10)),
+    }
+
+
+def http_client_options(settings: Dict) -> Dict:
+    """httpx.Client/AsyncClient keyword arguments for the pool settings"""
+    http2 = settings['http2']
+    if http2 and importlib.util.find_spec("h2") is None:
+        print("LITELLM_HTTP2 needs the h2 package (pip install 'httpx[http2]'); using HTTP/1.1")
+        http2 = False
+    return {
+        'limits': httpx.Limits(
+            max_connections=settings['max_connections'],
+            max_keepalive_connections=settings['max_keepalive_connections'],
+            keepalive_expiry=settings['keepalive_expiry']
+        ),
+        'timeout': httpx.Timeout(settings['timeout'], connect=settings['connect_timeout']),
+        'http2': http2
+    }
+
+
+# Completion tokens allowed per answer judged in a batch
+BATCH_JUDGE_TOKENS_PER_ITEM = 350
+
+# Characters of website content a judge prompt holds; longer content is cut down
+# to its passages most relevant to the answers judged
+JUDGE_CONTENT_CHARS = 3000
+
+
+class LLMClientMixin:
+    """Prompts, response cache and result parsing shared by LLMClient and AsyncLLMClient"""
+
+    def _init_models(self, target_models: List[str] = None, judge_model: str = None):
         self.base_url = os.getenv("LITELLM_BASE_URL")
         self.api_key = os.getenv("LITELLM_API_KEY")
         self.model = os.getenv("LITELLM_MODEL")
         
-        print(f"Initializing LLM Client with base URL: {self.base_url}")
-        print(f"Using model: {self.model}")
-        
-        # Initialize OpenAI client with custom base URL
-        self.client = OpenAI(
-            base_url=self.base_url,
-            api_key=self.api_key
-        )
+        # Models whose answers are monitored (empty: just LITELLM_MODEL), and the model
+        # that generates questions and judges answers
+        if target_models is None:
+            target_models = [m.strip() for m in os.getenv("LITELLM_TARGET_MODELS", "").split(",") if m.strip()]
+        self.target_models = target_models
+        self.judge_model = judge_model or os.getenv("LITELLM_JUDGE_MODEL") or self.model
 
-    def query_llm(self, question: str, context: str = "") -> Dict:
-        """Query the LLM service with a question"""
-        print(f"Querying LLM with question: {question[:100]}...")
-        
-        try:
-            prompt = f"""
+    def _judge_content(self, actual_content: str, queries: List[str]) -> str:
+        """`actual_content` within the judge prompt's limit, keeping the passages most relevant to `queries`"""
+        if len(actual_content) <= JUDGE_CONTENT_CHARS:
+            return actual_content
+        return PassageIndex(actual_content).select(queries, JUDGE_CONTENT_CHARS)
+
+    def _query_prompt(self, question: str, context: str = "") -> str:
+        return f"""
 You are being asked about a governmental organization. Please provide accurate information based on your knowledge.
 
 Question: {question}
@@ -38,51 +83,17 @@ Question: {question}
 
 Please provide a clear, factual response.
 """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.1
-            )
-            
-            result = {
-                "response": response.choices[0].message.content,
-                "model": self.model,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
-                    "completion_tokens": response.usage.completion_tokens if response.usage else 0,
-                    "total_tokens": response.usage.total_tokens if response.usage else 0
-                },
-                "success": True
-            }
-            
-            print(f"LLM response received: {len(result['response'])} characters")
-            return result
-            
-        except Exception as e:
-            print(f"Error querying LLM: {str(e)}")
-            return {
-                "response": "",
-                "error": str(e),
-                "success": False
-            }
 
-    def analyze_accuracy(self, llm_response: str, actual_content: str, question: str) -> Dict:
-        """Analyze the accuracy of LLM response against actual website content"""
-        print(f"Analyzing accuracy for question: {question[:50]}...")
-        
-        try:
-            analysis_prompt = f"""
+    def _analysis_prompt(self, llm_response: str, actual_content: str, question: str) -> str:
+        actual_content = self._judge_content(actual_content, [f"{question} {llm_response}"])
+        return f"""
 You are an expert fact-checker analyzing whether an LLM's response accurately represents information from an official government website.
 
 QUESTION ASKED: {question}
 
 LLM'S RESPONSE: {llm_response}
 
-ACTUAL WEBSITE CONTENT: {actual_content[:3000]}
+ACTUAL WEBSITE CONTENT: {actual_content}
 
 Please analyze:
 1. Is the LLM's response factually accurate based on the website content?
@@ -99,73 +110,9 @@ Provide your analysis in the following JSON format:
     "confidence": 0.9
 }}
 """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                max_tokens=800,
-                temperature=0.1
-            )
-            
-            analysis_text = response.choices[0].message.content
-            
-            # Try to extract JSON from the response
-            try:
-                # Look for JSON in the response
-                start_idx = analysis_text.find('{')
-                end_idx = analysis_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_str = analysis_text[start_idx:end_idx]
-                    analysis_result = json.loads(json_str)
-                else:
-                    # Fallback if no JSON found
-                    analysis_result = {
-                        "accuracy_score": 0.5,
-                        "misrepresentation_detected": "misrepresentation" in analysis_text.lower(),
-                        "analysis_summary": analysis_text[:500],
-                        "specific_issues": [],
-                        "confidence": 0.5
-                    }
-                    
-            except json.JSONDecodeError:
-                print("Failed to parse JSON from analysis response, using fallback")
-                analysis_result = {
-                    "accuracy_score": 0.5,
-                    "misrepresentation_detected": "inaccurate" in analysis_text.lower() or "misrepresentation" in analysis_text.lower(),
-                    "analysis_summary": analysis_text[:500],
-                    "specific_issues": [],
-                    "confidence": 0.5
-                }
-            
-            analysis_result["raw_analysis"] = analysis_text
-            analysis_result["success"] = True
-            
-            print(f"Analysis completed. Accuracy score: {analysis_result.get('accuracy_score', 'N/A')}")
-            print(f"Misrepresentation detected: {analysis_result.get('misrepresentation_detected', 'N/A')}")
-            
-            return analysis_result
-            
-        except Exception as e:
-            print(f"Error in accuracy analysis: {str(e)}")
-            return {
-                "accuracy_score": 0.0,
-                "misrepresentation_detected": True,
-                "analysis_summary": f"Analysis failed: {str(e)}",
-                "specific_issues": [f"Analysis error: {str(e)}"],
-                "confidence": 0.0,
-                "success": False,
-                "error": str(e)
-            }
 
-    def generate_questions(self, website_content: str, website_name: str, num_questions: int = 5) -> List[str]:
-        """Generate relevant questions based on website content"""
-        print(f"Generating {num_questions} questions for {website_name}")
-        
-        try:
-            prompt = f"""
+    def _questions_prompt(self, website_content: str, website_name: str, num_questions: int) -> str:
+        return f"""
 Based on the following content from the government website "{website_name}", generate {num_questions} specific, factual questions that would test whether an LLM accurately represents the information on this website.
 
 Website Content: {website_content[:2000]}
@@ -178,41 +125,449 @@ Generate questions that:
 
 Return only the questions, one per line, numbered 1-{num_questions}.
 """
+
+    def _batch_analysis_prompt(self, items: List[Dict], actual_content: str) -> str:
+        answers = "\n\n".join(
+            f"ITEM ID: {item['id']}\nQUESTION ASKED: {item['question']}\nLLM'S RESPONSE: {item['response']}"
+            for item in items
+        )
+        actual_content = self._judge_content(actual_content,
+                                             [f"{item['question']} {item['response']}" for item in items])
+        return f"""
+You are an expert fact-checker analyzing whether LLM responses accurately represent information from an official government website.
+
+ACTUAL WEBSITE CONTENT: {actual_content}
+
+Analyze each of the following {len(items)} items against the website content:
+
+{answers}
+
+For each item:
+1. Is the LLM's response factually accurate based on the website content?
+2. Are there any misrepresentations, omissions, or inaccuracies?
+3. Rate the accuracy on a scale of 0.0 to 1.0 (where 1.0 is perfectly accurate)
+4. Is there evidence of misrepresentation? (Yes/No)
+
+Provide your analysis as a JSON array with one object per item, in the following format:
+[
+    {{
+        "id": "item id",
+        "accuracy_score": 0.85,
+        "misrepresentation_detected": false,
+        "analysis_summary": "Brief summary of your analysis",
+        "specific_issues": ["List any specific issues found"],
+        "confidence": 0.9
+    }}
+]
+"""
+
+    def _request(self, call_type: str, question: str = None, context: str = "", model: str = None,
+                 llm_response: str = None, actual_content: str = None, website_content: str = None,
+                 website_name: str = None, num_questions: int = 5) -> Dict:
+        """chat.completions.create arguments of a client call; they are also its cache key"""
+        if call_type == 'query':
+            model = model or self.model
+            prompt, max_tokens, temperature = self._query_prompt(question, context), 1000, 0.1
+        elif call_type == 'analysis':
+            model = self.judge_model
+            prompt, max_tokens, temperature = self._analysis_prompt(llm_response, actual_content, question), 800, 0.1
+        else:
+            model = self.judge_model
+            prompt = self._questions_prompt(website_content, website_name, num_questions)
+            max_tokens, temperature = 600, 0.3
+        return {
+            'model': model,
+            'messages': [{"role": "user", "content": prompt}],
+            'max_tokens': max_tokens,
+            'temperature': temperature
+        }
+
+    def _batch_request(self, items: List[Dict], actual_content: str) -> Dict:
+        return {
+            'model': self.judge_model,
+            'messages': [{"role": "user", "content": self._batch_analysis_prompt(items, actual_content)}],
+            'max_tokens': BATCH_JUDGE_TOKENS_PER_ITEM * len(items),
+            'temperature': 0.1
+        }
+
+    @staticmethod
+    def _call_options(timeout: Optional[float]) -> Dict:
+        """Per-call request options; without a timeout the pool's default applies"""
+        return {'timeout': timeout} if timeout else {}
+
+    def _cached_result(self, call_type: str, request: Dict):
+        """Cached result of a request, marked as cached and free of token usage; None on a miss"""
+        if self.cache is None:
+            return None
+        result = self.cache.get(call_type, cache_key(**request))
+        if isinstance(result, dict):
+            result['cached'] = True
+            result['usage'] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        return result
+
+    def _store_result(self, call_type: str, request: Dict, result):
+        if self.cache is not None:
+            self.cache.put(call_type, cache_key(**request), result)
+
+    def cached(self, method_name: str, fresh: bool = False, **kwargs):
+        """Cached result of a query_llm/analyze_accuracy/generate_questions call, or None.
+
+        Lets callers skip rate limits and budgets for calls that cost nothing;
+        with `fresh` the lookup is skipped (and counted as bypassed).
+        """
+        call_type = CALL_TYPES.get(method_name)
+        kwargs.pop('timeout', None)
+        if self.cache is None or call_type is None:
+            return None
+        if fresh:
+            self.cache.bypass(call_type)
+            return None
+        return self._cached_result(call_type, self._request(call_type, **kwargs))
+
+    @staticmethod
+    def _usage(response) -> Dict:
+        return {
+            "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
+            "completion_tokens": response.usage.completion_tokens if response.usage else 0,
+            "total_tokens": response.usage.total_tokens if response.usage else 0
+        }
+
+    @staticmethod
+    def _add_usage(total: Dict, usage: Optional[Dict]) -> Dict:
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            total[key] = total.get(key, 0) + int((usage or {}).get(key) or 0)
+        return total
+
+    def _query_result(self, response, model: str) -> Dict:
+        """Result dict of a successful query_llm call"""
+        result = {
+            "response": response.choices[0].message.content,
+            "model": model,
+            "usage": self._usage(response),
+            "success": True
+        }
+        print(f"LLM response received: {len(result['response'])} characters")
+        return result
+
+    def _query_error(self, error: Exception) -> Dict:
+        print(f"Error querying LLM: {str(error)}")
+        return {
+            "response": "",
+            "error": str(error),
+            "success": False
+        }
+
+    def _analysis_result(self, response) -> Dict:
+        """Result dict of a successful analyze_accuracy call, parsed from the judge's answer"""
+        analysis_text = response.choices[0].message.content
+        
+        # Try to extract JSON from the response
+        try:
+            # Look for JSON in the response
+            start_idx = analysis_text.find('{')
+            end_idx = analysis_text.rfind('}') + 1
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=600,
-                temperature=0.3
-            )
-            
-            questions_text = response.choices[0].message.content
+            if start_idx != -1 and end_idx != -1:
+                json_str = analysis_text[start_idx:end_idx]
+                result = json.loads(json_str)
+            else:
+                # Fallback if no JSON found
+                result = {
+                    "accuracy_score": 0.5,
+                    "misrepresentation_detected": "misrepresentation" in analysis_text.lower(),
+                    "analysis_summary": analysis_text[:500],
+                    "specific_issues": [],
+                    "confidence": 0.5
+                }
+                
+        except json.JSONDecodeError:
+            print("Failed to parse JSON from analysis response, using fallback")
+            result = {
+                "accuracy_score": 0.5,
+                "misrepresentation_detected": "inaccurate" in analysis_text.lower() or "misrepresentation" in analysis_text.lower(),
+                "analysis_summary": analysis_text[:500],
+                "specific_issues": [],
+                "confidence": 0.5
+            }
+        
+        result["raw_analysis"] = analysis_text
+        result["judge_model"] = self.judge_model
+        result["usage"] = self._usage(response)
+        result["success"] = True
+        
+        print(f"Analysis completed. Accuracy score: {result.get('accuracy_score', 'N/A')}")
+        print(f"Misrepresentation detected: {result.get('misrepresentation_detected', 'N/A')}")
+        return result
+
+    def _analysis_error(self, error: Exception) -> Dict:
+        print(f"Error in accuracy analysis: {str(error)}")
+        # A failed judge call says nothing about the answer: no score, and no false alarm
+        return {
+            "accuracy_score": None,
+            "misrepresentation_detected": False,
+            "analysis_summary": f"Analysis failed: {str(error)}",
+            "specific_issues": [f"Analysis error: {str(error)}"],
+            "confidence": 0.0,
+            "success": False,
+            "error": str(error)
+        }
+
+    def _parse_questions(self, questions_text: str, num_questions: int) -> List[str]:
+        questions = []
+        for line in questions_text.split('\n'):
+            line = line.strip()
+            if line and (line[0].isdigit() or line.startswith('-')):
+                # Remove numbering and clean up
+                question = line.split('.', 1)[-1].strip()
+                question = question.lstrip('- ').strip()
+                if question and question.endswith('?'):
+                    questions.append(question)
+        
+        print(f"Generated {len(questions)} questions")
+        return questions[:num_questions]
+
+    def _fallback_questions(self, website_name: str, error: Exception) -> List[str]:
+        print(f"Error generating questions: {str(error)}")
+        return [
+            f"What is the main purpose of {website_name}?",
+            f"What services does {website_name} provide?",
+            f"Who is the current leadership of {website_name}?",
+            f"What are the key policies mentioned on {website_name}?",
+            f"How can citizens contact {website_name}?"
+        ]
+
+    @staticmethod
+    def _new_batch() -> Dict:
+        return {"results": {}, "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                "calls": 0, "success": True}
+
+    def _item_request(self, item: Dict, actual_content: str) -> Dict:
+        """Request of judging one batch item on its own, the key its verdict is cached under"""
+        return self._request('analysis', llm_response=item['response'], actual_content=actual_content,
+                             question=item['question'])
+
+    def _cached_verdict(self, item: Dict, actual_content: str, fresh: bool):
+        """Cached verdict of a batch item judged on its own; fresh samples count as bypassed"""
+        if self.cache is None:
+            return None
+        if fresh:
+            self.cache.bypass('analysis')
+            return None
+        return self._cached_result('analysis', self._item_request(item, actual_content))
+
+    @staticmethod
+    def _parse_batch_analysis(analysis_text: str, item_ids: List[str]) -> Optional[Dict[str, Dict]]:
+        """Verdicts of a batch judge answer by item id; None if it holds no JSON array"""
+        start_idx = analysis_text.find('[')
+        end_idx = analysis_text.rfind(']') + 1
+        if start_idx == -1 or end_idx <= start_idx:
+            return None
+        try:
+            parsed = json.loads(analysis_text[start_idx:end_idx])
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(parsed, list):
+            return None
+        
+        verdicts = {}
+        for entry in parsed:
+            if isinstance(entry, dict) and str(entry.get('id')) in item_ids:
+                verdicts[str(entry['id'])] = entry
+        return verdicts
+
+    def _batch_verdict(self, entry: Dict, usage: Dict, batch_size: int) -> Dict:
+        """One item's verdict from a batch judge answer, shaped like an analyze_accuracy result"""
+        result = {key: value for key, value in entry.items() if key != 'id'}
+        result.setdefault("accuracy_score", 0.5)
+        result.setdefault("misrepresentation_detected", False)
+        result.setdefault("analysis_summary", "")
+        result.setdefault("specific_issues", [])
+        result.setdefault("confidence", 0.5)
+        result["raw_analysis"] = json.dumps(entry)
+        result["judge_model"] = self.judge_model
+        result["usage"] = usage
+        result["success"] = True
+        result["batch_size"] = batch_size
+        return result
+
+    def _apply_batch_answer(self, batch: Dict, items: List[Dict], actual_content: str, response) -> List[List[Dict]]:
+        """Record the verdicts of a batch judge answer; returns the sub-batches still to judge.
+
+        An answer without a usable JSON array splits the batch in halves; items it
+        left out are judged again as a smaller batch.
+        """
+        usage = self._usage(response)
+        self._add_usage(batch["usage"], usage)
+        batch["calls"] += 1
+        verdicts = self._parse_batch_analysis(response.choices[0].message.content or "",
+                                              [item['id'] for item in items])
+        if not verdicts:
+            print(f"Could not parse the batch judge answer for {len(items)} items, splitting the batch")
+            half = len(items) // 2
+            return [items[:half], items[half:]]
+        
+        share = {key: value // len(items) for key, value in usage.items()}
+        for item in items:
+            if item['id'] in verdicts:
+                result = self._batch_verdict(verdicts[item['id']], share, len(items))
+                batch["results"][item['id']] = result
+                self._store_result('analysis', self._item_request(item, actual_content), result)
+        missing = [item for item in items if item['id'] not in verdicts]
+        if missing:
+            print(f"Batch judge answer left out {len(missing)} items, judging them again")
+            return [missing]
+        return []
+
+    def _add_single_verdict(self, batch: Dict, item: Dict, result: Dict):
+        """Record the verdict of a batch item judged on its own by analyze_accuracy"""
+        batch["calls"] += 1
+        self._add_usage(batch["usage"], result.get("usage"))
+        if not result.get("success"):
+            raise RuntimeError(result.get("error", "Unknown error"))
+        batch["results"][item['id']] = result
+
+    @staticmethod
+    def _finish_batch(batch: Dict, error: Exception = None) -> Dict:
+        if error is not None:
+            print(f"Error in batch accuracy analysis: {str(error)}")
+            batch["success"] = False
+            batch["error"] = str(error)
+        if not batch["calls"]:
+            # Every verdict came from the response cache
+            batch["cached"] = True
+        print(f"Batch analysis completed: {len(batch['results'])} verdicts in {batch['calls']} calls")
+        return batch
+
+
+class LLMClient(LLMClientMixin):
+    def __init__(self, target_models: List[str] = None, judge_model: str = None, cache: ResponseCache = None):
+        self._init_models(target_models, judge_model)
+        
+        print(f"Initializing LLM Client with base URL: {self.base_url}")
+        print(f"Using model: {self.model}")
+        if self.target_models:
+            print(f"Target models: {', '.join(self.target_models)}")
+        print(f"Judge model: {self.judge_model}")
+        
+        # Initialize OpenAI client with custom base URL, on a pooled keep-alive connection pool
+        self.http_settings = http_pool_settings()
+        self.client = OpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            http_client=httpx.Client(**http_client_options(self.http_settings)),
+            max_retries=0
+        )
+        # Retries, circuit breaker and adaptive concurrency, shared per endpoint
+        self.guard = guard_for(self.base_url or "default")
+        
+        # Successful results of identical requests are reused (LLM_CACHE_* settings)
+        self.cache = cache if cache is not None else cache_from_env()
+
+    def _complete(self, request: Dict, timeout: Optional[float]):
+        """chat.completions.create through the endpoint guard"""
+        return self.guard.call(
+            lambda: self.client.chat.completions.create(**request, **self._call_options(timeout))
+        )
+
+    def query_llm(self, question: str, context: str = "", model: str = None, timeout: float = None,
+                  fresh: bool = False) -> Dict:
+        """Query the LLM service (a target model, by default LITELLM_MODEL) with a question.
+
+        Results may come from the response cache unless `fresh` is set.
+        """
+        request = self._request('query', question=question, context=context, model=model)
+        model = request['model']
+        print(f"Querying {model} with question: {question[:100]}...")
+        
+        result = None if fresh else self._cached_result('query', request)
+        if result is not None:
+            return result
+        
+        try:
+            response = self._complete(request, timeout)
+            result = self._query_result(response, model)
+            self._store_result('query', request, result)
+            return result
             
-            # Parse questions from the response
-            questions = []
-            for line in questions_text.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    # Remove numbering and clean up
-                    question = line.split('.', 1)[-1].strip()
-                    question = question.lstrip('- ').strip()
-                    if question and question.endswith('?'):
-                        questions.append(question)
+        except Exception as e:
+            return self._query_error(e)
+
+    def analyze_accuracy(self, llm_response: str, actual_content: str, question: str,
+                         timeout: float = None, fresh: bool = False) -> Dict:
+        """Analyze the accuracy of LLM response against actual website content"""
+        print(f"Analyzing accuracy for question: {question[:50]}...")
+        request = self._request('analysis', llm_response=llm_response, actual_content=actual_content,
+                                question=question)
+        
+        result = None if fresh else self._cached_result('analysis', request)
+        if result is not None:
+            return result
+        
+        try:
+            response = self._complete(request, timeout)
+            result = self._analysis_result(response)
+            self._store_result('analysis', request, result)
+            return result
             
-            print(f"Generated {len(questions)} questions")
-            return questions[:num_questions]
+        except Exception as e:
+            return self._analysis_error(e)
+
+    def analyze_accuracy_batch(self, items: List[Dict], actual_content: str, timeout: float = None,
+                               fresh: bool = False) -> Dict:
+        """Judge several answers against the same website content, sending the content once.
+
+        `items` are dicts with 'id', 'question' and 'response'. Returns 'results',
+        an analyze_accuracy-shaped verdict per item id, with the summed 'usage' and
+        number of 'calls'. Unparseable answers split the batch; single items are
+        judged by analyze_accuracy. On an error 'success' is false and 'results'
+        holds the verdicts made so far.
+        """
+        print(f"Analyzing accuracy for a batch of {len(items)} answers...")
+        batch = self._new_batch()
+        pending = []
+        for item in items:
+            cached = self._cached_verdict(item, actual_content, fresh)
+            if cached is not None:
+                batch["results"][item['id']] = cached
+            else:
+                pending.append(item)
+        
+        todo = [pending] if pending else []
+        try:
+            while todo:
+                chunk = todo.pop()
+                if len(chunk) == 1:
+                    item = chunk[0]
+                    result = self.analyze_accuracy(item['response'], actual_content, item['question'],
+                                                   timeout=timeout, fresh=True)
+                    self._add_single_verdict(batch, item, result)
+                    continue
+                response = self._complete(self._batch_request(chunk, actual_content), timeout)
+                todo.extend(self._apply_batch_answer(batch, chunk, actual_content, response))
+        except Exception as e:
+            return self._finish_batch(batch, e)
+        return self._finish_batch(batch)
+
+    def generate_questions(self, website_content: str, website_name: str, num_questions: int = 5,
+                           timeout: float = None, fresh: bool = False) -> List[str]:
+        """Generate relevant questions based on website content"""
+        print(f"Generating {num_questions} questions for {website_name}")
+        request = self._request('questions', website_content=website_content, website_name=website_name,
+                                num_questions=num_questions)
+        
+        questions = None if fresh else self._cached_result('questions', request)
+        if questions is not None:
+            return questions
+        
+        try:
+            response = self._complete(request, timeout)
+            questions = self._parse_questions(response.choices[0].message.content, num_questions)
+            if questions:
+                self._store_result('questions', request, questions)
+            return questions
             
         except Exception as e:
-            print(f"Error generating questions: {str(e)}")
-            return [
-                f"What is the main purpose of {website_name}?",
-                f"What services does {website_name} provide?",
-                f"Who is the current leadership of {website_name}?",
-                f"What are the key policies mentioned on {website_name}?",
-                f"How can citizens contact {website_name}?"
-            ]
+            return self._fallback_questions(website_name, e)
 
     def test_connection(self) -> bool:
         """Test connection to the LLM service"""
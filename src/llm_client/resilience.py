@@ -0,0 +1,382 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import httpx
+import openai
+
+# Statuses worth retrying: timeouts, conflicts, throttling and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Calls to an endpoint are refused while its circuit breaker is open"""
+
+
+def error_status(error: Exception) -> Optional[int]:
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+def is_throttle(error: Exception) -> bool:
+    return error_status(error) == 429
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (openai.APIConnectionError, httpx.TransportError)):
+        return True
+    return error_status(error) in RETRYABLE_STATUS
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After or retry-after-ms), if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return max(0.0, float(headers['retry-after-ms']) / 1000.0)
+    except ValueError:
+        pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff that defers to the server's Retry-After"""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Wait before retry number `attempt` (1 = first retry)"""
+        requested = retry_after(error)
+        if requested is not None:
+            return min(requested, self.max_delay)
+        # Full jitter spreads retries of calls that failed together
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint that keeps failing.
+
+    After `failure_threshold` consecutive failures (server errors, timeouts,
+    connection errors) the circuit opens and calls fail fast for
+    `reset_seconds`; then one trial call is let through, and its outcome closes
+    the circuit or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.rejected = 0
+        self.opened = 0
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may be made now"""
+        with self.lock:
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = CIRCUIT_HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == CIRCUIT_CLOSED:
+                return
+            if self.state == CIRCUIT_HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(f"Circuit open after {self.failures} consecutive failures; "
+                               f"retrying the endpoint in {retry_in:.0f}s")
+
+    def record_success(self):
+        with self.lock:
+            self.state = CIRCUIT_CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """Free the trial slot of a half-open circuit after a call that says nothing about
+        the endpoint's health (throttled or cancelled); the next call becomes the trial"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == CIRCUIT_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != CIRCUIT_OPEN:
+                    self.opened += 1
+                    print(f"Circuit breaker opened after {self.failures} consecutive failures")
+                self.state = CIRCUIT_OPEN
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {'state': self.state, 'consecutive_failures': self.failures,
+                    'times_opened': self.opened, 'rejected_calls': self.rejected}
+
+
+class AIMDController:
+    """Concurrency limit tuned by additive increase / multiplicative decrease.
+
+    Every successful call adds `increase / limit` (about `increase` per round of
+    `limit` calls); a throttled call multiplies the limit by `decrease`, at most
+    once per `cooldown` seconds so one burst of 429s counts once.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 64,
+                 increase: float = 1.0, decrease: float = 0.5, cooldown: float = 1.0):
+        self.minimum = max(1.0, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.last_decrease = 0.0
+        self.calls = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def on_success(self):
+        with self.lock:
+            self.calls += 1
+            self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+    def on_throttle(self):
+        with self.lock:
+            self.calls += 1
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self.last_decrease >= self.cooldown:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self.last_decrease = now
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'limit': int(self.limit),
+                'min': int(self.minimum),
+                'max': int(self.maximum),
+                'calls': self.calls,
+                'throttled': self.throttled,
+                'throttle_rate': round(self.throttled / self.calls, 3) if self.calls else 0.0
+            }
+
+
+class EndpointGuard:
+    """Retries, circuit breaker and adaptive concurrency for the calls to one LLM endpoint.
+
+    Shared by every client of the endpoint in this process (see guard_for), so
+    they back off and open the circuit together. Threads wait for a slot under
+    the AIMD limit; event loops have their own waiters under the same limit, and
+    every release wakes both.
+    """
+
+    def __init__(self, endpoint: str, policy: RetryPolicy, breaker: CircuitBreaker, aimd: AIMDController):
+        self.endpoint = endpoint
+        self.policy = policy
+        self.breaker = breaker
+        self.aimd = aimd
+        self.in_flight = 0
+        self.retries = 0
+        self.condition = threading.Condition()
+        self.async_conditions: Dict[asyncio.AbstractEventLoop, asyncio.Condition] = {}
+
+    def _on_error(self, error: Exception):
+        if is_throttle(error):
+            self.aimd.on_throttle()
+            self.breaker.release_trial()
+        elif is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            # The endpoint answered; the request itself was bad
+            self.breaker.record_success()
+
+    def _on_success(self):
+        self.breaker.record_success()
+        self.aimd.on_success()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """Wait before the next attempt, or None when the error is final"""
+        if not is_retryable(error) or attempt >= self.policy.max_attempts:
+            return None
+        with self.condition:
+            self.retries += 1
+        delay = self.policy.delay(attempt, error)
+        print(f"LLM call to {self.endpoint} failed ({str(error)[:100]}); retry {attempt} in {delay:.1f}s")
+        return delay
+
+    def _acquire(self):
+        with self.condition:
+            while self.in_flight >= self.aimd.current:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def _release(self):
+        """Free a slot and wake the waiting threads and event loops, wherever the call ran"""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+            loops = list(self.async_conditions.items())
+        for loop, condition in loops:
+            notify = self._notify(condition)
+            try:
+                asyncio.run_coroutine_threadsafe(notify, loop)
+            except RuntimeError:
+                # The loop was closed; its waiters are gone
+                notify.close()
+                with self.condition:
+                    self.async_conditions.pop(loop, None)
+
+    @staticmethod
+    async def _notify(condition: asyncio.Condition):
+        async with condition:
+            condition.notify_all()
+
+    def call(self, fn: Callable):
+        """Make a call, retrying retryable errors; raises the last error or CircuitOpenError"""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_call()
+            try:
+                self._acquire()
+            except BaseException:
+                # Interrupted while waiting for a slot; give back a half-open trial
+                self.breaker.release_trial()
+                raise
+            try:
+                result = fn()
+            except Exception as e:
+                error = e
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+            else:
+                self._on_success()
+                return result
+            finally:
+                self._release()
+            self._on_error(error)
+            delay = self._retry_delay(attempt, error)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+
+    def _async_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        with self.condition:
+            condition = self.async_conditions.get(loop)
+            if condition is None:
+                condition = self.async_conditions[loop] = asyncio.Condition()
+        return condition
+
+    async def acall(self, fn: Callable):
+        """Async counterpart of call(); `fn` returns an awaitable"""
+        condition = self._async_condition()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_call()
+            try:
+                async with condition:
+                    await condition.wait_for(lambda: self.in_flight < self.aimd.current)
+                    with self.condition:
+                        self.in_flight += 1
+            except BaseException:
+                # Cancelled while waiting for a slot; give back a half-open trial
+                self.breaker.release_trial()
+                raise
+            try:
+                result = await fn()
+            except Exception as e:
+                error = e
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+            else:
+                self._on_success()
+                return result
+            finally:
+                self._release()
+            self._on_error(error)
+            delay = self._retry_delay(attempt, error)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+
+    def status(self) -> Dict:
+        with self.condition:
+            in_flight, retries = self.in_flight, self.retries
+        return {
+            'endpoint': self.endpoint,
+            'in_flight': in_flight,
+            'retries': retries,
+            'max_attempts': self.policy.max_attempts,
+            'circuit': self.breaker.status(),
+            'concurrency': self.aimd.status()
+        }
+
+
+_guards: Dict[str, EndpointGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def guard_for(endpoint: str) -> EndpointGuard:
+    """The process-wide guard of an endpoint, configured by the LITELLM_RETRY/BREAKER/CONCURRENCY settings"""
+    with _guards_lock:
+        guard = _guards.get(endpoint)
+        if guard is None:
+            guard = _guards[endpoint] = EndpointGuard(
+                endpoint,
+                RetryPolicy(
+                    max_attempts=int(os.getenv("LITELLM_RETRY_ATTEMPTS", 4)),
+                    base_delay=float(os.getenv("LITELLM_RETRY_BASE_SECONDS", 0.5)),
+                    max_delay=float(os.getenv("LITELLM_RETRY_MAX_SECONDS", 30))
+                ),
+                CircuitBreaker(
+                    failure_threshold=int(os.getenv("LITELLM_BREAKER_FAILURES", 5)),
+                    reset_seconds=float(os.getenv("LITELLM_BREAKER_RESET_SECONDS", 30))
+                ),
+                AIMDController(
+                    initial=float(os.getenv("LITELLM_CONCURRENCY_INITIAL", 4)),
+                    minimum=float(os.getenv("LITELLM_CONCURRENCY_MIN", 1)),
+                    maximum=float(os.getenv("LITELLM_CONCURRENCY_MAX", 32)),
+                    decrease=float(os.getenv("LITELLM_CONCURRENCY_DECREASE", 0.5))
+                )
+            )
+        return guard
@@ -0,0 +1,114 @@
+import math
+import re
+from collections import Counter
+from itertools import zip_longest
+from typing import List
+
+# Passages longer than this are split at sentence ends, so one long paragraph
+# cannot take a whole context budget
+MAX_PASSAGE_CHARS = 600
+
+STOPWORDS = set("""
+a about above after again all also am an and any are as at be been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him
+his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who whom why will with
+would you your yours
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in re.findall(r"[a-z0-9]+", text.lower()) if token not in STOPWORDS]
+
+
+def split_passage(text: str, max_chars: int = MAX_PASSAGE_CHARS) -> List[str]:
+    """A passage cut into pieces of at most about `max_chars`, at sentence ends where possible"""
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    pieces, current = [], ""
+    for sentence in re.split(r"(?<=[.!?])\s+", text):
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class PassageIndex:
+    """BM25 index over the passages of one scraped page.
+
+    `passages` are the scraper's heading-prefixed paragraphs in page order; pages
+    scraped without them are split from their text. select() returns the most
+    relevant passages for some queries within a character budget, in page order, or
+    the whole text when it fits the budget anyway.
+    """
+
+    def __init__(self, text: str, passages: List[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.text = text or ""
+        self.passages = [piece for passage in (passages or [self.text]) for piece in split_passage(passage)]
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(tokenize(passage)) for passage in self.passages]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        document_frequency = Counter(term for counts in self.term_counts for term in counts)
+        count = len(self.passages)
+        self.idf = {term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+    def scores(self, query: str) -> List[float]:
+        """BM25 score of every passage for `query`"""
+        terms = Counter(tokenize(query))
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            score = 0.0
+            for term, weight in terms.items():
+                tf = counts.get(term)
+                if tf:
+                    score += weight * self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, queries: List[str], max_chars: int, top_k: int = 3) -> str:
+        """The `top_k` passages most relevant to each of `queries` that fit in `max_chars`, in page order.
+
+        Several queries (the answers of a batch, the headings of a page) take
+        turns picking their next best passage. Passages matching no query are
+        left out; when nothing matches, the start of the page is used.
+        """
+        if len(self.text) <= max_chars or not self.passages:
+            return self.text[:max_chars]
+        rankings = []
+        for query in queries:
+            scores = self.scores(query)
+            ranked = sorted(range(len(self.passages)), key=lambda i: (-scores[i], i))
+            rankings.append([i for i in ranked[:top_k] if scores[i] > 0])
+        
+        order, seen = [], set()
+        for picks in zip_longest(*rankings):
+            for i in picks:
+                if i is not None and i not in seen:
+                    seen.add(i)
+                    order.append(i)
+        
+        chosen, used = [], 0
+        for i in order:
+            size = len(self.passages[i]) + (2 if chosen else 0)
+            if used + size > max_chars:
+                continue
+            chosen.append(i)
+            used += size
+        if not chosen:
+            return self.text[:max_chars]
+        return "\n\n".join(self.passages[i] for i in sorted(chosen))
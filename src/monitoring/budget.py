@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+BUDGET_OK = 'ok'
+BUDGET_DEGRADED = 'degraded'
+BUDGET_EXHAUSTED = 'exhausted'
+
+# Completion caps the LLM client requests per kind of call, and the rough prompt
+# size of its template, used for pre-flight estimates. A batched judge call
+# ('judge_batch') gets its completion cap per answer in the batch.
+MAX_COMPLETION_TOKENS = {'generate': 600, 'query': 1000, 'judge': 800, 'judge_batch': 350}
+PROMPT_OVERHEAD_TOKENS = {'generate': 120, 'query': 60, 'judge': 220, 'judge_batch': 260}
+# Longest scraped content excerpt the generate and judge prompts include
+PROMPT_CONTENT_CHARS = {'generate': 2000, 'judge': 3000}
+
+
+class BudgetExceeded(Exception):
+    """An LLM call would exceed a session, daily or per-model budget"""
+
+
+def estimate_tokens(text_chars: int) -> int:
+    """Rough token count of `text_chars` characters of English text"""
+    return (text_chars + 3) // 4
+
+
+def _load_json_env(name: str) -> Dict:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except ValueError:
+        print(f"Ignoring invalid JSON in {name}")
+        return {}
+
+
+class BudgetGovernor:
+    """Token and cost limits per session, per day and per model, with a price table.
+
+    Every LLM call is checked before it is made against its pre-flight estimate
+    (prompt size plus the completion cap) and recorded with its reported usage
+    afterwards. Past MONITOR_BUDGET_DEGRADE_AT of any limit the session is
+    degraded (callers skip optional calls); past a limit calls are refused with
+    BudgetExceeded. A limit of 0 means unlimited.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.session_tokens = int(os.getenv("MONITOR_BUDGET_SESSION_TOKENS", 0))
+        self.session_cost = float(os.getenv("MONITOR_BUDGET_SESSION_COST", 0))
+        self.daily_tokens = int(os.getenv("MONITOR_BUDGET_DAILY_TOKENS", 0))
+        self.daily_cost = float(os.getenv("MONITOR_BUDGET_DAILY_COST", 0))
+        # {"model": {"daily_tokens": N, "daily_cost": X}}
+        self.model_limits = _load_json_env("MONITOR_BUDGET_MODEL_LIMITS")
+        # USD per million tokens: {"model": {"input": 3.0, "output": 15.0}, "default": {...}}
+        self.prices = _load_json_env("MONITOR_MODEL_PRICES")
+        self.degrade_at = float(os.getenv("MONITOR_BUDGET_DEGRADE_AT", 0.8))
+
+        # Estimates of calls in flight in this process, so parallel calls cannot all
+        # pass the same check
+        self.reserved = {'session': {}, 'daily': [0, 0.0], 'model': {}}
+        self.session_states = {}
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return any([self.session_tokens, self.session_cost, self.daily_tokens, self.daily_cost, self.model_limits])
+
+    def price(self, model: str) -> Dict:
+        return self.prices.get(model) or self.prices.get('default') or {}
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        price = self.price(model)
+        return (prompt_tokens * float(price.get('input', 0))
+                + completion_tokens * float(price.get('output', 0))) / 1_000_000
+
+    def estimate(self, purpose: str, model: str, prompt_chars: int = 0, batch_size: int = 1) -> Tuple[int, int, float]:
+        """Pre-flight (prompt tokens, completion tokens, cost) upper estimate of one call"""
+        prompt_tokens = PROMPT_OVERHEAD_TOKENS.get(purpose, 100) + estimate_tokens(prompt_chars)
+        completion_tokens = MAX_COMPLETION_TOKENS.get(purpose, 1000) * batch_size
+        return prompt_tokens, completion_tokens, self.cost(model, prompt_tokens, completion_tokens)
+
+    def estimate_session(self, websites: int, questions_per_website: int, models: Dict[str, str],
+                         judge_model: str) -> Tuple[int, float]:
+        """Pre-flight (tokens, cost) estimate of a session, generating questions for every site"""
+        tokens, cost = 0, 0.0
+        prompt, completion, call_cost = self.estimate('generate', judge_model, PROMPT_CONTENT_CHARS['generate'])
+        tokens += websites * (prompt + completion)
+        cost += websites * call_cost
+        questions = websites * questions_per_website
+        for model in models.values():
+            prompt, completion, call_cost = self.estimate('query', model)
+            tokens += questions * (prompt + completion)
+            cost += questions * call_cost
+            prompt, completion, call_cost = self.estimate('judge', judge_model, PROMPT_CONTENT_CHARS['judge'] + 4000)
+            tokens += questions * (prompt + completion)
+            cost += questions * call_cost
+        return tokens, round(cost, 6)
+
+    def _limits(self, snapshot: Dict, model: str, session_id: Optional[int]):
+        """(name, used, limit) for every configured limit, including in-flight reservations.
+
+        Called with self.lock held.
+        """
+        session_reserved = self.reserved['session'].get(session_id, [0, 0.0])
+        daily_reserved = self.reserved['daily']
+        model_reserved = self.reserved['model'].get(model, [0, 0.0])
+        model_limits = self.model_limits.get(model, {})
+        limits = [
+            ('session tokens', snapshot['session_tokens'] + session_reserved[0], self.session_tokens),
+            ('session cost', snapshot['session_cost'] + session_reserved[1], self.session_cost),
+            ('daily tokens', snapshot['daily_tokens'] + daily_reserved[0], self.daily_tokens),
+            ('daily cost', snapshot['daily_cost'] + daily_reserved[1], self.daily_cost),
+            (f"{model} daily tokens", snapshot['model_tokens'] + model_reserved[0],
+             float(model_limits.get('daily_tokens', 0))),
+            (f"{model} daily cost", snapshot['model_cost'] + model_reserved[1],
+             float(model_limits.get('daily_cost', 0))),
+        ]
+        if session_id is None:
+            limits = limits[2:]
+        return [(name, used, limit) for name, used, limit in limits if limit]
+
+    def check(self, session_id: Optional[int], purpose: str, model: str, prompt_chars: int = 0,
+              batch_size: int = 1, reserve: bool = False) -> str:
+        """Budget state if the call is made; raises BudgetExceeded if it would break a limit.
+
+        With `reserve` the call's estimate is reserved in the same critical section
+        as the comparison, so parallel calls cannot all pass one check; release it
+        with _release().
+        """
+        if not self.enabled:
+            return BUDGET_OK
+        prompt_tokens, completion_tokens, cost = self.estimate(purpose, model, prompt_chars, batch_size)
+        tokens = prompt_tokens + completion_tokens
+
+        state, exceeded = BUDGET_OK, None
+        with self.lock:
+            snapshot = self.db.get_spend_snapshot(session_id, model)
+            for name, used, limit in self._limits(snapshot, model, session_id):
+                projected = used + (cost if name.endswith('cost') else tokens)
+                if projected > limit:
+                    exceeded = f"Budget exhausted: {name} limit {limit:g} reached (used {used:g})"
+                    break
+                if projected >= limit * self.degrade_at:
+                    state = BUDGET_DEGRADED
+            if exceeded is None and reserve:
+                self._adjust_reserved(session_id, model, tokens, cost, 1)
+
+        if exceeded is not None:
+            self._escalate(session_id, BUDGET_EXHAUSTED)
+            raise BudgetExceeded(exceeded)
+        if state == BUDGET_DEGRADED:
+            self._escalate(session_id, BUDGET_DEGRADED)
+        return state
+
+    def _escalate(self, session_id: Optional[int], state: str):
+        """Record a session's worse budget state once"""
+        if session_id is None:
+            return
+        order = [BUDGET_OK, BUDGET_DEGRADED, BUDGET_EXHAUSTED]
+        with self.lock:
+            if order.index(self.session_states.get(session_id, BUDGET_OK)) >= order.index(state):
+                return
+            self.session_states[session_id] = state
+        self.db.escalate_session_budget_status(session_id, state)
+
+    def _adjust_reserved(self, session_id: Optional[int], model: str, tokens: int, cost: float, sign: int):
+        """Add (sign 1) or remove (sign -1) an in-flight estimate; called with self.lock held"""
+        for bucket in (self.reserved['session'].setdefault(session_id, [0, 0.0]),
+                       self.reserved['daily'],
+                       self.reserved['model'].setdefault(model, [0, 0.0])):
+            bucket[0] += sign * tokens
+            bucket[1] += sign * cost
+
+    def _release(self, session_id: Optional[int], model: str, tokens: int, cost: float):
+        with self.lock:
+            self._adjust_reserved(session_id, model, tokens, cost, -1)
+
+    def spend(self, session_id: Optional[int], purpose: str, model: str, prompt_chars: int, call,
+              batch_size: int = 1):
+        """Check the budget, make `call` and record its usage (reported, else the estimate).
+
+        The call's estimate stays reserved until its spend is recorded. Returns
+        (result, budget state at the time of the check).
+        """
+        state = self.check(session_id, purpose, model, prompt_chars, batch_size, reserve=True)
+        prompt_tokens, completion_tokens, cost = self.estimate(purpose, model, prompt_chars, batch_size)
+        reserved_tokens, reserved_cost = prompt_tokens + completion_tokens, cost
+        try:
+            result = call()
+            self._record(session_id, model, result, prompt_tokens, completion_tokens)
+            return result, state
+        finally:
+            if self.enabled:
+                self._release(session_id, model, reserved_tokens, reserved_cost)
+
+    def _record(self, session_id: Optional[int], model: str, result, prompt_tokens: int, completion_tokens: int):
+        """Record a call's spend: its reported usage, else the estimate; cached and failed calls cost nothing"""
+        if isinstance(result, dict) and result.get('cached'):
+            # Served from the response cache: nothing was spent
+            return
+        usage = result.get('usage') if isinstance(result, dict) else None
+        if not usage and isinstance(result, dict) and result.get('success') is False:
+            # Failed calls report no usage; they are not charged
+            return
+        if usage and usage.get('total_tokens'):
+            prompt_tokens = int(usage.get('prompt_tokens') or 0)
+            completion_tokens = int(usage.get('completion_tokens') or 0)
+            if not prompt_tokens and not completion_tokens:
+                completion_tokens = int(usage['total_tokens'])
+        try:
+            self.db.record_llm_spend(session_id, model, prompt_tokens, completion_tokens,
+                                     self.cost(model, prompt_tokens, completion_tokens))
+        except Exception as e:
+            print(f"Failed to record LLM spend: {str(e)}")
+
+    def status(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'limits': {
+                'session_tokens': self.session_tokens,
+                'session_cost': self.session_cost,
+                'daily_tokens': self.daily_tokens,
+                'daily_cost': self.daily_cost,
+                'models': self.model_limits
+            },
+            'degrade_at': self.degrade_at,
+            'prices': self.prices
+        }
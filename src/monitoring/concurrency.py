@@ -0,0 +1,70 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Hashable
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.total_wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available; returns the time spent waiting"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.total_wait_seconds += waited
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class KeyedLimiter:
+    """Caps concurrent work per key (website, LLM endpoint) with lazily created semaphores"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.semaphores: Dict[Hashable, threading.BoundedSemaphore] = {}
+        self.in_flight: Dict[Hashable, int] = {}
+        self.lock = threading.Lock()
+
+    def _semaphore(self, key: Hashable) -> threading.BoundedSemaphore:
+        with self.lock:
+            if key not in self.semaphores:
+                self.semaphores[key] = threading.BoundedSemaphore(self.limit)
+                self.in_flight[key] = 0
+            return self.semaphores[key]
+
+    @contextmanager
+    def slot(self, key: Hashable):
+        semaphore = self._semaphore(key)
+        with semaphore:
+            with self.lock:
+                self.in_flight[key] += 1
+            try:
+                yield
+            finally:
+                with self.lock:
+                    self.in_flight[key] -= 1
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {str(key): count for key, count in self.in_flight.items()}
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Event types published while a session runs
+SESSION_STARTED = 'session_started'
+SESSION_COMPLETED = 'session_completed'
+SESSION_CANCELLED = 'session_cancelled'
+WEBSITE_STARTED = 'website_started'
+WEBSITE_COMPLETED = 'website_completed'
+WEBSITE_FAILED = 'website_failed'
+QUESTION_ANSWERED = 'question_answered'
+QUESTION_FAILED = 'question_failed'
+MISREPRESENTATION_FOUND = 'misrepresentation_found'
+
+FINAL_EVENTS = (SESSION_COMPLETED, SESSION_CANCELLED)
+
+
+def format_sse(event: Dict) -> str:
+    """One event in the text/event-stream wire format; events without an id cannot be resumed from"""
+    event_id = f"id: {event['id']}\n" if event.get('id') else ""
+    return f"{event_id}event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class Subscription:
+    """Events of one session delivered to an asyncio consumer (an SSE response).
+
+    Publishers run on pipeline threads, so events are handed to the consumer's
+    event loop. A consumer that falls more than `max_queue` events behind is cut
+    off rather than buffering without bound; it can reconnect with Last-Event-ID.
+    """
+
+    def __init__(self, session_id: int, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.session_id = session_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def deliver(self, event: Optional[Dict]):
+        """Hand an event (None: end of stream) to the consumer; safe from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The consumer's loop is closed; it is going away
+            pass
+
+    def _put(self, event: Optional[Dict]):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[Dict]:
+        """Next event, None once the stream ended; raises asyncio.TimeoutError when idle"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventBus:
+    """In-process publish/subscribe of monitoring progress, per session.
+
+    Each event gets an increasing id and is kept in a short per-session history,
+    so a reconnecting client resumes after the last id it saw. The bus also folds
+    events into a progress snapshot of each session, which is what a client loads
+    before it starts streaming. Only the most recent sessions are kept.
+    """
+
+    def __init__(self, history: int = 500, max_sessions: int = 20, subscriber_queue: int = 1000):
+        self.history = history
+        self.max_sessions = max_sessions
+        self.subscriber_queue = subscriber_queue
+        self.lock = threading.Lock()
+        self.last_id = 0
+        self.sessions = OrderedDict()
+        self.subscribers: Dict[int, List[Subscription]] = {}
+
+    def _session(self, session_id: int) -> Dict:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = {
+                'events': deque(maxlen=self.history),
+                'snapshot': {
+                    'session_id': session_id,
+                    'status': 'running',
+                    'started_at': datetime.now().isoformat(),
+                    'updated_at': None,
+                    'last_event_id': 0,
+                    'websites': {'total': 0, 'started': 0, 'completed': 0, 'failed': 0},
+                    'questions': {'queued': 0, 'answered': 0, 'failed': 0, 'judge_skipped': 0},
+                    'misrepresentations': 0,
+                    'models': {},
+                    'recent_errors': deque(maxlen=20)
+                }
+            }
+            self.sessions[session_id] = session
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return session
+
+    def publish(self, session_id: int, event_type: str, **data):
+        """Record an event for a session and push it to the session's subscribers"""
+        with self.lock:
+            self.last_id += 1
+            event = {
+                'id': self.last_id,
+                'type': event_type,
+                'session_id': session_id,
+                'timestamp': datetime.now().isoformat(),
+                **data
+            }
+            session = self._session(session_id)
+            session['events'].append(event)
+            self._apply(session['snapshot'], event)
+            subscribers = list(self.subscribers.get(session_id, ()))
+
+        for subscription in subscribers:
+            subscription.deliver(event)
+            if event_type in FINAL_EVENTS:
+                subscription.deliver(None)
+
+    def _apply(self, snapshot: Dict, event: Dict):
+        """Fold an event into the session's progress snapshot"""
+        snapshot['last_event_id'] = event['id']
+        snapshot['updated_at'] = event['timestamp']
+        event_type = event['type']
+        websites, questions = snapshot['websites'], snapshot['questions']
+
+        if event_type == SESSION_STARTED:
+            # A resumed session starts from the work its jobs already finished
+            snapshot['status'] = 'running'
+            websites['total'] = event.get('total_websites', 0)
+            websites['completed'] = event.get('websites_completed', 0)
+            websites['started'] = websites['completed']
+            questions['queued'] = event.get('questions_queued', 0)
+            questions['answered'] = event.get('questions_answered', 0)
+        elif event_type == WEBSITE_STARTED:
+            websites['started'] += 1
+        elif event_type == WEBSITE_COMPLETED:
+            websites['completed'] += 1
+            questions['queued'] += event.get('questions', 0)
+        elif event_type == WEBSITE_FAILED:
+            websites['failed'] += 1
+        elif event_type == QUESTION_ANSWERED:
+            questions['answered'] += 1
+            questions['judge_skipped'] += int(bool(event.get('judge_skipped')))
+            model = snapshot['models'].setdefault(event.get('llm_service'), {'answered': 0, 'misrepresentations': 0})
+            model['answered'] += 1
+            model['misrepresentations'] += int(bool(event.get('misrepresentation')))
+        elif event_type == QUESTION_FAILED:
+            questions['failed'] += 1
+        elif event_type == MISREPRESENTATION_FOUND:
+            snapshot['misrepresentations'] += 1
+        elif event_type == SESSION_COMPLETED:
+            snapshot['status'] = 'completed'
+        elif event_type == SESSION_CANCELLED:
+            snapshot['status'] = 'cancelled'
+
+        if event.get('error'):
+            snapshot['recent_errors'].append({'id': event['id'], 'type': event_type, 'error': event['error']})
+
+    def snapshot(self, session_id: int) -> Optional[Dict]:
+        """Progress of a session as of its last event; None if the bus never saw it"""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            snapshot = json.loads(json.dumps(session['snapshot'], default=list))
+        return snapshot
+
+    def knows(self, session_id: int) -> bool:
+        with self.lock:
+            return session_id in self.sessions
+
+    def subscribe(self, session_id: int, loop: asyncio.AbstractEventLoop,
+                  last_event_id: int = 0) -> Subscription:
+        """Subscribe to a session's events, first replaying those after `last_event_id`"""
+        subscription = Subscription(session_id, loop, self.subscriber_queue)
+        with self.lock:
+            session = self.sessions.get(session_id)
+            missed = [e for e in session['events'] if e['id'] > last_event_id] if session else []
+            finished = bool(session) and session['snapshot']['status'] in ('completed', 'cancelled')
+            self.subscribers.setdefault(session_id, []).append(subscription)
+        for event in missed:
+            subscription.deliver(event)
+        if finished:
+            subscription.deliver(None)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            subscribers = self.subscribers.get(subscription.session_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self.subscribers.pop(subscription.session_id, None)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'last_event_id': self.last_id,
+                'sessions': list(self.sessions),
+                'subscribers': sum(len(s) for s in self.subscribers.values())
+            }
@@ -1,27 +1,175 @@
 
 
 
+import os
+import socket
 import time
-import schedule
+import uuid
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
+from collections import defaultdict
+from urllib.parse import urlparse
 import asyncio
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
 
 from ..database.models import DatabaseManager
 from ..web_scraper.scraper import WebScraper
+from ..database.jobs import JOB_COMPLETED, UNFINISHED_JOB_STATES, LeaseLostError, job_options, job_result
+from ..llm_client.cache import CALL_TYPES
 from ..llm_client.client import LLMClient
+from ..llm_client.retrieval import PassageIndex
+from .budget import (BUDGET_DEGRADED, BUDGET_EXHAUSTED, BUDGET_OK, PROMPT_CONTENT_CHARS, BudgetExceeded,
+                     BudgetGovernor)
+from .concurrency import KeyedLimiter, TokenBucket
+from . import events
+from .events import EventBus
+from .pipeline import MonitoringPipeline, stage_concurrency
+from .scheduler import AdaptiveScheduler
+from .sessions import SessionManager
 
 class MonitoringSystem:
-    def __init__(self):
-        self.db = DatabaseManager()
-        self.scraper = WebScraper()
-        self.llm_client = LLMClient()
+    def __init__(self, db: DatabaseManager = None, scraper: WebScraper = None, llm_client: LLMClient = None):
+        self.db = db or DatabaseManager()
+        self.scraper = scraper or WebScraper()
+        self.llm_client = llm_client or LLMClient()
         self.is_running = False
         self.current_session_id = None
         
-        print("Monitoring system initialized")
+        # Websites run in parallel and so do questions within a website; LLM calls
+        # are capped per endpoint and paced by a token bucket instead of fixed sleeps.
+        # A client with an endpoint guard caps its endpoint itself, with a limit
+        # tuned by AIMD from throttling, so the fixed per-endpoint cap is skipped.
+        self.max_concurrency = int(os.getenv("MONITOR_MAX_CONCURRENCY", 4))
+        self.per_website_concurrency = int(os.getenv("MONITOR_PER_WEBSITE_CONCURRENCY", 2))
+        self.per_endpoint_concurrency = int(os.getenv("MONITOR_PER_ENDPOINT_CONCURRENCY", 4))
+        self.question_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.website_limiter = KeyedLimiter(self.per_website_concurrency)
+        self.endpoint_limiter = KeyedLimiter(self.per_endpoint_concurrency)
+        self.llm_rate_limiter = TokenBucket(
+            rate=float(os.getenv("MONITOR_LLM_REQUESTS_PER_SECOND", 2)),
+            capacity=float(os.getenv("MONITOR_LLM_BURST", 4))
+        )
+        self.llm_endpoint = urlparse(getattr(self.llm_client, 'base_url', None) or '').netloc or 'default'
+        self.llm_guard = getattr(self.llm_client, 'guard', None)
+        
+        # Inline sessions run as a staged pipeline; each stage has its own worker
+        # count, and bounded queues between stages keep memory flat
+        self.stage_concurrency = stage_concurrency(self.max_concurrency)
+        self.stage_queue_size = int(os.getenv("MONITOR_STAGE_QUEUE_SIZE", 2 * self.max_concurrency))
+        self.pipelines = {}
+        self.last_pipeline_metrics = None
+        
+        # Progress events of the sessions this process runs, for SSE streams and snapshots
+        self.events = EventBus(history=int(os.getenv("MONITOR_EVENT_HISTORY", 500)))
+        
+        # Token/cost budgets: degraded sessions skip optional LLM calls, exhausted ones stop
+        self.budget = BudgetGovernor(self.db)
+        self.skip_judge_confidence = float(os.getenv("MONITOR_BUDGET_SKIP_JUDGE_CONFIDENCE", 0.8))
+        
+        # The pipeline judges answers to the same scraped content together, sending
+        # the content once per batch; a partial batch waits at most the given time
+        self.judge_batch_size = max(1, int(os.getenv("MONITOR_JUDGE_BATCH_SIZE", 5)))
+        self.judge_batch_wait = float(os.getenv("MONITOR_JUDGE_BATCH_WAIT_MS", 500)) / 1000.0
+        
+        # Prompts include the scraped passages most relevant to the call (BM25 over
+        # the page's passages) within a token budget, instead of the page's start
+        self.judge_context_chars = min(PROMPT_CONTENT_CHARS['judge'],
+                                       4 * int(os.getenv("MONITOR_JUDGE_CONTEXT_TOKENS", 500)))
+        self.generate_context_chars = min(PROMPT_CONTENT_CHARS['generate'],
+                                          4 * int(os.getenv("MONITOR_GENERATE_CONTEXT_TOKENS", 300)))
+        
+        # Incremental mode: unchanged sites re-ask their existing questions, or are
+        # skipped entirely while their last analysis is younger than the TTL
+        self.incremental = os.getenv("MONITOR_INCREMENTAL", "true").lower() in ("1", "true", "yes")
+        self.unchanged_ttl_hours = float(os.getenv("MONITOR_UNCHANGED_TTL_HOURS", 24))
+        self.questions_per_website = int(os.getenv("MONITOR_QUESTIONS_PER_WEBSITE", 5))
+        self.question_bank_size = int(os.getenv("MONITOR_QUESTION_BANK_SIZE", 10))
+        
+        # Each (website, question, model) is a durable job, so sessions can resume.
+        # Every question is asked to each target model; without configured targets
+        # the default model's answers are stored under the "LiteLLM" service as before.
+        self.target_models = list(getattr(self.llm_client, 'target_models', None) or [])
+        self.llm_services = self.target_models or ["LiteLLM"]
+        self.active_sessions = set()
+        self.sessions_lock = threading.Lock()
+        
+        # Jobs are leased to one process at a time and kept alive by heartbeats. In
+        # 'worker' execution mode sessions are only enqueued; worker.py runs them.
+        self.execution_mode = os.getenv("MONITOR_EXECUTION_MODE", "inline").lower()
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = float(os.getenv("MONITOR_JOB_LEASE_SECONDS", 120))
+        self.max_job_attempts = int(os.getenv("MONITOR_JOB_MAX_ATTEMPTS", 3))
+        self.job_poll_seconds = float(os.getenv("MONITOR_JOB_POLL_SECONDS", 2))
+        self.held_jobs = set()
+        self.held_jobs_lock = threading.Lock()
+        self.heartbeat_thread = None
+        self.scheduler = None
+        
+        # Sessions are submitted through the manager, which coalesces overlapping
+        # requests and caps how many sessions run at once
+        self.sessions = SessionManager(self)
+        
+        per_endpoint = 'adaptive' if self.llm_guard else self.per_endpoint_concurrency
+        print(f"Monitoring system initialized (concurrency: {self.max_concurrency}, "
+              f"per website: {self.per_website_concurrency}, per endpoint: {per_endpoint})")
+
+    def _call_llm(self, method, *args, **kwargs):
+        """Run an LLM client call under the per-endpoint cap and the rate limiter"""
+        if self.llm_guard is not None:
+            self.llm_rate_limiter.acquire()
+            return method(*args, **kwargs)
+        with self.endpoint_limiter.slot(self.llm_endpoint):
+            self.llm_rate_limiter.acquire()
+            return method(*args, **kwargs)
+
+    def _publish(self, session_id: Optional[int], event_type: str, **data):
+        """Publish a progress event; events never interrupt the work they describe"""
+        if session_id is None:
+            return
+        try:
+            self.events.publish(session_id, event_type, **data)
+        except Exception as e:
+            print(f"Failed to publish {event_type} event: {str(e)}")
+
+    def _spend_llm(self, session_id: Optional[int], purpose: str, priced_as: str, prompt_chars: int, method,
+                   fresh: bool = False, batch_size: int = 1, **kwargs):
+        """Make an LLM call within the session's budget and record its spend as `priced_as`.
+
+        Cached results cost nothing, so they skip the budget and rate limits; with
+        `fresh` the cache is bypassed and a new sample is taken (and cached).
+        """
+        cached = getattr(self.llm_client, 'cached', None)
+        if cached is not None:
+            if method.__name__ in CALL_TYPES:
+                result = cached(method.__name__, fresh=fresh, **kwargs)
+                if result is not None:
+                    return result
+                fresh = True
+            # Batch calls look their items up themselves
+            kwargs['fresh'] = fresh
+        result, _ = self.budget.spend(session_id, purpose, priced_as, prompt_chars,
+                                      lambda: self._call_llm(method, **kwargs), batch_size)
+        return result
+
+    @property
+    def batch_judging(self) -> bool:
+        return self.judge_batch_size > 1 and hasattr(self.llm_client, 'analyze_accuracy_batch')
+
+    def _model_name(self, model: Optional[str] = None) -> str:
+        """Model a call is priced and budgeted as (None: the default model)"""
+        return model or getattr(self.llm_client, 'model', None) or 'default'
+
+    @property
+    def judge_model(self) -> str:
+        return getattr(self.llm_client, 'judge_model', None) or self._model_name()
+
+    def _budget_state(self, session_id: Optional[int], purpose: str, model: str, prompt_chars: int = 0) -> str:
+        try:
+            return self.budget.check(session_id, purpose, model, prompt_chars)
+        except BudgetExceeded:
+            return BUDGET_EXHAUSTED
 
     def start_monitoring_session(self, session_name: str = None) -> int:
         """Start a new monitoring session"""
@@ -44,7 +192,7 @@ class MonitoringSystem:
         return session_id
 
     def complete_monitoring_session(self, session_id: int, total_questions: int, misrepresentations_found: int):
-        """Complete a monitoring session"""
+        """Complete a monitoring session (cancelled sessions keep their status)"""
         print(f"Completing monitoring session {session_id}")
         
         with self.db.get_connection() as conn:
@@ -53,207 +201,600 @@ class MonitoringSystem:
                 UPDATE monitoring_sessions 
                 SET completed_at = ?, status = 'completed', 
                     total_questions = ?, misrepresentations_found = ?
-                WHERE id = ?
+                WHERE id = ? AND status != 'cancelled'
             ''', (datetime.now(), total_questions, misrepresentations_found, session_id))
             conn.commit()
         
+        if cursor.rowcount == 0:
+            print(f"Session {session_id} was cancelled. Questions: {total_questions}")
+            return
         print(f"Session {session_id} completed. Questions: {total_questions}, Misrepresentations: {misrepresentations_found}")
+        self._publish(session_id, events.SESSION_COMPLETED, total_questions=total_questions,
+                      misrepresentations_found=misrepresentations_found)
 
-    def monitor_website(self, website_id: int) -> Dict:
-        """Monitor a single website"""
-        print(f"Monitoring website ID: {website_id}")
-        
-        # Get website details
-        websites = self.db.get_websites()
-        website = next((w for w in websites if w['id'] == website_id), None)
-        
-        if not website:
-            print(f"Website with ID {website_id} not found")
-            return {'success': False, 'error': 'Website not found'}
-        
+    def monitor_website(self, website_id: int, force: bool = False) -> Dict:
+        """Monitor a single website in its own session"""
+        session = self.monitor_all_websites(force=force, website_ids=[website_id])
+        if not session.get('website_results'):
+            return {'success': False, 'error': session.get('error', 'Website not found')}
+        return session['website_results'][0]
+
+    def _prepare_website(self, website: Dict, force: bool, session_id: int = None, fresh: bool = False) -> Dict:
+        """Scrape a website and load its question bank (the work of a website job).
+
+        Returns the website report; on success 'content_id' and 'question_ids'
+        name the scrape to judge against and the questions to ask.
+        """
+        results, scrape_result = self._scrape_website(website, force, session_id)
+        if scrape_result is not None:
+            self._generate_website_questions(website, results, scrape_result, session_id, fresh)
+        return results
+
+    def _scrape_website(self, website: Dict, force: bool, session_id: int = None):
+        """Scrape step of a website job: returns (report, scrape result).
+
+        The scrape result is None when the report is already final (failed scrape,
+        skipped site, or unchanged content re-asking its banked questions);
+        otherwise questions still have to be generated from it.
+        """
+        website_id = website['id']
         print(f"Monitoring website: {website['name']} ({website['url']})")
+        self._publish(session_id, events.WEBSITE_STARTED, website_id=website_id, website_name=website['name'])
         
         results = {
             'website_id': website_id,
             'website_name': website['name'],
             'website_url': website['url'],
             'scraping_success': False,
+            'mode': 'full',
+            'skip_reason': None,
             'questions_generated': 0,
             'questions_analyzed': 0,
             'misrepresentations_found': 0,
+            'llm_calls': 0,
+            'content_id': None,
+            'question_ids': [],
             'errors': []
         }
         
-        try:
-            # Step 1: Scrape website content
-            print("Step 1: Scraping website content...")
-            scrape_result = self.scraper.scrape_website(website['url'])
-            
-            if not scrape_result.get('success', False):
-                error_msg = f"Failed to scrape website: {scrape_result.get('error', 'Unknown error')}"
-                print(error_msg)
-                results['errors'].append(error_msg)
-                return results
-            
-            results['scraping_success'] = True
-            
+        # Step 1: Scrape website content
+        print("Step 1: Scraping website content...")
+        scrape_result = self.scraper.scrape_website(website['url'])
+        
+        if not scrape_result.get('success', False):
+            error_msg = f"Failed to scrape website: {scrape_result.get('error', 'Unknown error')}"
+            print(error_msg)
+            results['errors'].append(error_msg)
+            return results, None
+        
+        results['scraping_success'] = True
+        
+        latest = self.db.get_latest_content(website_id)
+        content_changed = latest is None or latest['content_hash'] != scrape_result['content_hash']
+        
+        if content_changed or force:
             # Store scraped content
-            content_id = self.db.add_website_content(
+            results['content_id'] = self.db.add_website_content(
                 website_id=website_id,
                 title=scrape_result['title'],
                 content=scrape_result['content'],
-                content_hash=scrape_result['content_hash']
-            )
-            
-            # Step 2: Generate questions based on content
-            print("Step 2: Generating questions...")
-            questions = self.llm_client.generate_questions(
-                website_content=scrape_result['content'],
-                website_name=website['name'],
-                num_questions=5
+                content_hash=scrape_result['content_hash'],
+                passages=scrape_result.get('passages')
             )
+        else:
+            results['content_id'] = latest['id']
+            self.db.mark_website_checked(website_id)
             
-            results['questions_generated'] = len(questions)
-            
-            if not questions:
-                error_msg = "No questions generated"
-                print(error_msg)
-                results['errors'].append(error_msg)
-                return results
-            
-            # Step 3: Process each question
-            print(f"Step 3: Processing {len(questions)} questions...")
-            
-            for i, question in enumerate(questions, 1):
-                print(f"Processing question {i}/{len(questions)}: {question[:50]}...")
-                
+            # Incremental mode: skip unchanged sites while their last analysis is fresh
+            if (self.incremental and self.unchanged_ttl_hours > 0
+                    and self.db.was_analyzed_within(website_id, self.unchanged_ttl_hours)):
+                results['mode'] = 'skipped'
+                results['skip_reason'] = f"content unchanged and analyzed within the last {self.unchanged_ttl_hours:g}h"
+                print(f"Skipping {website['name']}: {results['skip_reason']}")
+                results['content_id'] = None
+                results['success'] = True
+                return results, None
+        
+        # Step 2: Load the question bank, generating questions only for new content
+        has_bank = self.db.has_generated_questions(website_id)
+        if not has_bank or (content_changed and self._budget_state(
+                session_id, 'generate', self.judge_model, self.generate_context_chars) == BUDGET_OK):
+            return results, scrape_result
+        
+        bank = self.db.get_question_bank(website_id, self.question_bank_size)
+        results['mode'] = 'requery'
+        if content_changed:
+            # Over budget: judge the new content with the questions already banked
+            results['skip_reason'] = "budget limit near, question generation skipped"
+        else:
+            results['skip_reason'] = "content unchanged, question generation skipped"
+        print(f"Re-asking {len(bank)} banked questions ({results['skip_reason']})")
+        self._set_question_bank(results, bank)
+        return results, None
+
+    def _generate_website_questions(self, website: Dict, results: Dict, scrape_result: Dict,
+                                    session_id: int = None, fresh: bool = False):
+        """Generate step of a website job: refresh the question bank from new content"""
+        print("Step 2: Generating questions...")
+        # Each heading picks its best passages in turn, so questions cover the whole page
+        index = PassageIndex(scrape_result['content'], scrape_result.get('passages'))
+        context = index.select(scrape_result.get('headings') or [scrape_result.get('title') or website['name']],
+                               self.generate_context_chars)
+        generated = self._spend_llm(
+            session_id, 'generate', self.judge_model, len(context),
+            self.llm_client.generate_questions,
+            website_content=context,
+            website_name=website['name'],
+            num_questions=self.questions_per_website,
+            fresh=fresh
+        )
+        results['llm_calls'] += 1
+        results['questions_generated'] = len(generated)
+        bank = self.db.refresh_question_bank(website['id'], generated, self.question_bank_size)
+        self._set_question_bank(results, bank)
+
+    def _set_question_bank(self, results: Dict, bank: List[Dict]):
+        if not bank:
+            error_msg = "No questions generated"
+            print(error_msg)
+            results['errors'].append(error_msg)
+            results['content_id'] = None
+            return
+        
+        results['question_ids'] = [q['id'] for q in bank]
+        results['success'] = True
+
+    def _claim(self, job: Dict) -> bool:
+        """Lease a job to this process; False if another process holds it"""
+        if not self.db.claim_job(job['id'], self.worker_id, self.lease_seconds):
+            return False
+        self._hold(job['id'])
+        return True
+
+    def _hold(self, job_id: int):
+        with self.held_jobs_lock:
+            self.held_jobs.add(job_id)
+            if self.heartbeat_thread is None:
+                self.heartbeat_thread = threading.Thread(target=self._heartbeat, daemon=True)
+                self.heartbeat_thread.start()
+
+    def _release(self, job_id: int):
+        with self.held_jobs_lock:
+            self.held_jobs.discard(job_id)
+
+    def _heartbeat(self):
+        """Keep the leases of in-progress jobs alive so no other process takes them over"""
+        while True:
+            time.sleep(max(self.lease_seconds / 3, 1))
+            with self.held_jobs_lock:
+                job_ids = sorted(self.held_jobs)
+            if job_ids:
                 try:
-                    # Add question to database
-                    question_id = self.db.add_question(
-                        website_id=website_id,
-                        question_text=question,
-                        category="auto-generated"
-                    )
-                    
-                    # Query LLM with the question
-                    llm_response = self.llm_client.query_llm(question)
-                    
-                    if not llm_response.get('success', False):
-                        error_msg = f"LLM query failed for question {i}: {llm_response.get('error', 'Unknown error')}"
-                        print(error_msg)
-                        results['errors'].append(error_msg)
-                        continue
-                    
-                    # Store LLM response
-                    response_id = self.db.add_llm_response(
-                        question_id=question_id,
-                        llm_service="LiteLLM",
-                        response_text=llm_response['response'],
-                        metadata=llm_response.get('usage', {})
-                    )
-                    
-                    # Analyze accuracy
-                    analysis_result = self.llm_client.analyze_accuracy(
-                        llm_response=llm_response['response'],
-                        actual_content=scrape_result['content'],
-                        question=question
-                    )
-                    
-                    if analysis_result.get('success', False):
-                        # Store analysis result
-                        self.db.add_analysis_result(
-                            llm_response_id=response_id,
-                            website_content_id=content_id,
-                            accuracy_score=analysis_result.get('accuracy_score', 0.0),
-                            misrepresentation_detected=analysis_result.get('misrepresentation_detected', False),
-                            analysis_details=str(analysis_result)
-                        )
-                        
-                        results['questions_analyzed'] += 1
-                        
-                        if analysis_result.get('misrepresentation_detected', False):
-                            results['misrepresentations_found'] += 1
-                            print(f"⚠️  Misrepresentation detected for question: {question[:50]}...")
-                    else:
-                        error_msg = f"Analysis failed for question {i}: {analysis_result.get('error', 'Unknown error')}"
-                        print(error_msg)
-                        results['errors'].append(error_msg)
-                    
-                    # Small delay between questions
-                    time.sleep(1)
-                    
+                    self.db.renew_leases(self.worker_id, job_ids, self.lease_seconds)
                 except Exception as e:
-                    error_msg = f"Error processing question {i}: {str(e)}"
-                    print(error_msg)
-                    results['errors'].append(error_msg)
-                    continue
-            
-            print(f"Website monitoring completed for {website['name']}")
-            print(f"Questions analyzed: {results['questions_analyzed']}")
-            print(f"Misrepresentations found: {results['misrepresentations_found']}")
-            
-            results['success'] = True
-            return results
-            
+                    print(f"Lease heartbeat failed: {str(e)}")
+
+    def claim_next_job(self) -> Optional[Dict]:
+        """Lease the next job of any session from the shared job table"""
+        self.db.fail_exhausted_jobs(self.max_job_attempts)
+        job = self.db.claim_next_job(self.worker_id, self.lease_seconds)
+        if job is not None:
+            self._hold(job['id'])
+        else:
+            # Idle: start sessions queued while the session limit was reached
+            self.sessions.promote()
+        return job
+
+    def run_job(self, job: Dict):
+        """Run a job leased with claim_next_job, then close its session if it was the last one"""
+        try:
+            if job['kind'] == 'website':
+                website = next((w for w in self.db.get_websites() if w['id'] == job['website_id']), None)
+                self._execute_website_job(job, website)
+            else:
+                with self._question_slot([job]):
+                    self._execute_question_job(job, self._job_content(job['content_id']), 1, 1)
+        except LeaseLostError as e:
+            print(str(e))
+        finally:
+            self._release(job['id'])
+        
+        self.db.flush_writes()
+        self.finish_session_if_done(job['session_id'])
+
+    @contextmanager
+    def _question_slot(self, jobs: List[Dict]):
+        """Hold a global question slot and the per-website slot of each (website, model) of `jobs`.
+
+        Per-website slots are taken in sorted order, so batches spanning several
+        models cannot deadlock each other.
+        """
+        keys = sorted({(job['website_id'], job['llm_service']) for job in jobs})
+        with self.question_slots, ExitStack() as slots:
+            for key in keys:
+                slots.enter_context(self.website_limiter.slot(key))
+            yield
+
+    def _job_content(self, content_id: Optional[int]) -> PassageIndex:
+        """Passage index of the scraped content a question job is judged against"""
+        content = self.db.get_website_content(content_id) if content_id else None
+        return PassageIndex((content or {}).get('content') or "", (content or {}).get('passages'))
+
+    def _execute_website_job(self, job: Dict, website: Optional[Dict]) -> bool:
+        """Scrape a site and enqueue its question jobs; the job must be leased by this process"""
+        if website is None:
+            self.db.fail_job(job['id'], f"Website with ID {job['website_id']} not found", lease_owner=self.worker_id)
+            return False
+        
+        try:
+            options = job_options(job)
+            results = self._prepare_website(website, bool(options.get('force')), job['session_id'],
+                                            bool(options.get('fresh')))
         except Exception as e:
-            error_msg = f"Error monitoring website {website_id}: {str(e)}"
+            self._fail_website_job(job, e)
+            return False
+        return self._checkpoint_website_job(job, results)
+
+    def _fail_website_job(self, job: Dict, error: Exception):
+        if isinstance(error, LeaseLostError):
+            print(str(error))
+            return
+        error_msg = f"Error monitoring website {job['website_id']}: {str(error)}"
+        print(error_msg)
+        try:
+            self.db.fail_job(job['id'], error_msg, lease_owner=self.worker_id)
+        except LeaseLostError as lost:
+            print(str(lost))
+            return
+        self._publish(job['session_id'], events.WEBSITE_FAILED, website_id=job['website_id'], error=error_msg)
+
+    def _checkpoint_website_job(self, job: Dict, results: Dict) -> bool:
+        """Finish a website job from its report; on success its question jobs now exist"""
+        if not results.get('success'):
+            error_msg = "; ".join(results['errors']) or "Unknown error"
+            self.db.fail_job(job['id'], error_msg, result=results, lease_owner=self.worker_id)
+            self._publish(job['session_id'], events.WEBSITE_FAILED, website_id=job['website_id'], error=error_msg)
+            return False
+        
+        # Checkpoint: the website is done and its question jobs exist, atomically
+        self.db.complete_website_job(
+            job['id'], results, results['content_id'], results['question_ids'], self.llm_services,
+            lease_owner=self.worker_id
+        )
+        self._publish(job['session_id'], events.WEBSITE_COMPLETED, website_id=job['website_id'],
+                      website_name=results.get('website_name'), mode=results['mode'],
+                      skip_reason=results['skip_reason'],
+                      questions=len(results['question_ids']) * len(self.llm_services))
+        return True
+
+    def _execute_question_job(self, job: Dict, content: PassageIndex, index: int, total: int):
+        """Ask one banked question to the job's model, judge the answer and checkpoint the leased job"""
+        label = f"{index}/{total}"
+        outcome = {'analyzed': False, 'misrepresentation': False, 'llm_calls': 0}
+        try:
+            llm_response = self._query_answer(job, outcome, label)
+            if llm_response is None:
+                return
+            analysis_result, error_msg = self._judge_answer(job, content, llm_response, outcome, label)
+            self._checkpoint_answer(job, llm_response, analysis_result, outcome, error_msg)
+        except Exception as e:
+            self._fail_question_job(job, outcome, e, label)
+
+    def _query_answer(self, job: Dict, outcome: Dict, label: str) -> Optional[Dict]:
+        """Query step: ask the question to the job's model; None (and the job failed) on error"""
+        question = job['question_text']
+        print(f"Processing question {label} ({job['llm_service']}): {question[:50]}...")
+        
+        # Jobs of the legacy "LiteLLM" service go to the default model
+        model = job['llm_service'] if job['llm_service'] in self.target_models else None
+        llm_response = self._spend_llm(
+            job['session_id'], 'query', self._model_name(model), len(question),
+            self.llm_client.query_llm, fresh=bool(job_options(job).get('fresh')), question=question, model=model
+        )
+        outcome['llm_calls'] += 1
+        
+        if not llm_response.get('success', False):
+            error_msg = f"LLM query failed for question {label}: {llm_response.get('error', 'Unknown error')}"
             print(error_msg)
-            results['errors'].append(error_msg)
-            results['success'] = False
-            return results
+            self.db.fail_job(job['id'], error_msg, result=outcome, lease_owner=self.worker_id)
+            self._publish_question_failed(job, error_msg)
+            return None
+        return llm_response
 
-    def monitor_all_websites(self) -> Dict:
-        """Monitor all active websites"""
-        print("Starting monitoring of all websites...")
+    def _judge_answer(self, job: Dict, content: PassageIndex, llm_response: Dict, outcome: Dict, label: str):
+        """Judge step: analyze an answer against the scraped content; returns (analysis, error).
+
+        Near the budget limit, answers whose previous verdict (same question, model
+        and content) was accurate with high confidence are stored unjudged; once the
+        budget is exhausted answers are stored with an error instead of a verdict.
+        """
+        context = self._judge_context(content, [(job, llm_response)])
+        prompt_chars = self._judge_prompt_chars(job, context, llm_response)
+        skipped = self._judge_gate(job, prompt_chars, outcome, label)
+        if skipped is not None:
+            return skipped
+        return self._judge_call(job, context, llm_response, outcome, label, prompt_chars)
+
+    def _judge_context(self, content: PassageIndex, answers: List[tuple], max_chars: int = None) -> str:
+        """Passages relevant to the (job, llm_response) answers judged together; each answer is a query"""
+        queries = [f"{job['question_text']} {llm_response['response']}" for job, llm_response in answers]
+        return content.select(queries, max_chars or self.judge_context_chars)
+
+    def _judge_call(self, job: Dict, context: str, llm_response: Dict, outcome: Dict, label: str,
+                    prompt_chars: int):
+        analysis_result = self._spend_llm(
+            job['session_id'], 'judge', self.judge_model, prompt_chars,
+            self.llm_client.analyze_accuracy,
+            fresh=bool(job_options(job).get('fresh')),
+            llm_response=llm_response['response'],
+            actual_content=context,
+            question=job['question_text']
+        )
+        outcome['llm_calls'] += 1
+        return self._verdict(job, analysis_result, outcome, label)
+
+    def _judge_prompt_chars(self, job: Dict, context: str, llm_response: Dict) -> int:
+        return len(context) + len(llm_response['response']) + len(job['question_text'])
+
+    def _judge_gate(self, job: Dict, prompt_chars: int, outcome: Dict, label: str) -> Optional[tuple]:
+        """Budget gate of a judge call: None to judge the answer, else the (analysis, error) to store"""
+        try:
+            state = self.budget.check(job['session_id'], 'judge', self.judge_model, prompt_chars)
+        except BudgetExceeded as e:
+            print(f"Judge skipped for question {label}: {str(e)}")
+            return None, str(e)
+        if state == BUDGET_DEGRADED and self._judge_skippable(job):
+            outcome['judge_skipped'] = True
+            print(f"Judge skipped for question {label}: budget limit near and last verdict was confident")
+            return None, None
+        return None
+
+    def _judge_answers(self, items: List[Dict], content: PassageIndex):
+        """Judge step for several answers judged against the same content, in batched judge calls.
+
+        Items carry 'job', 'response', 'outcome' and 'label' and get their
+        'context', 'analysis' and 'error' set. The budget gate applies to each
+        answer; the others are judged judge_batch_size at a time.
+        """
+        to_judge = []
+        for item in items:
+            job = item['job']
+            item['context'] = self._judge_context(content, [(job, item['response'])])
+            skipped = self._judge_gate(job, self._judge_prompt_chars(job, item['context'], item['response']),
+                                       item['outcome'], item['label'])
+            if skipped is not None:
+                item['analysis'], item['error'] = skipped
+            else:
+                to_judge.append(item)
         
-        session_id = self.start_monitoring_session()
+        for start in range(0, len(to_judge), self.judge_batch_size):
+            batch = to_judge[start:start + self.judge_batch_size]
+            if len(batch) > 1:
+                self._judge_batch(batch, content)
+                continue
+            item = batch[0]
+            item['analysis'], item['error'] = self._judge_call(
+                item['job'], item['context'], item['response'], item['outcome'], item['label'],
+                self._judge_prompt_chars(item['job'], item['context'], item['response'])
+            )
+
+    def _judge_batch(self, items: List[Dict], content: PassageIndex):
+        """One batch judge call for up to judge_batch_size answers, recording the tokens it saved.
+
+        The batch shares one context: its answers take turns picking passages,
+        within the per-answer budget times the batch size (at most the judge
+        prompt's content limit).
+        """
+        session_id = items[0]['job']['session_id']
+        context = self._judge_context(
+            content, [(item['job'], item['response']) for item in items],
+            min(PROMPT_CONTENT_CHARS['judge'], self.judge_context_chars * len(items))
+        )
+        prompt_chars = len(context) + sum(
+            len(item['job']['question_text']) + len(item['response']['response']) for item in items
+        )
+        batch = self._spend_llm(
+            session_id, 'judge_batch', self.judge_model, prompt_chars,
+            self.llm_client.analyze_accuracy_batch,
+            fresh=bool(job_options(items[0]['job']).get('fresh')),
+            batch_size=len(items),
+            items=[{'id': str(item['job']['id']), 'question': item['job']['question_text'],
+                    'response': item['response']['response']} for item in items],
+            actual_content=context
+        )
+        items[0]['outcome']['llm_calls'] += batch.get('calls', 0)
+        
+        for item in items:
+            analysis_result = batch['results'].get(str(item['job']['id'])) or {
+                'success': False, 'error': batch.get('error') or "No verdict in the batch judge answer"
+            }
+            item['analysis'], item['error'] = self._verdict(item['job'], analysis_result, item['outcome'],
+                                                           item['label'])
         
-        websites = self.db.get_websites(active_only=True)
+        judged = [item for item in items if not (item['analysis'] or {}).get('cached')]
+        if batch.get('calls') and len(judged) > 1:
+            self._record_judge_batch(session_id, judged, context, batch)
+
+    def _record_judge_batch(self, session_id: int, items: List[Dict], context: str, batch: Dict):
+        """Prompt tokens a batch saved over judging its answers one by one.
+
+        The batch's measured prompt tokens are compared with an estimate of the
+        single calls, calibrated against the batch call when it took one call. A
+        batch the judge answered badly (split and retried) can save less than
+        nothing; it is recorded as such.
+        """
+        single = sum(self.budget.estimate('judge', self.judge_model,
+                                          self._judge_prompt_chars(item['job'], item['context'], item['response']))[0]
+                     for item in items)
+        prompt_chars = len(context) + sum(
+            len(item['job']['question_text']) + len(item['response']['response']) for item in items
+        )
+        batched = self.budget.estimate('judge_batch', self.judge_model, prompt_chars, len(items))[0]
+        measured = (batch.get('usage') or {}).get('prompt_tokens') or batched
+        calibration = measured / batched if batch['calls'] == 1 else 1.0
+        saved = round(single * calibration) - measured
+        try:
+            self.db.record_judge_batch(session_id, len(items), saved)
+        except Exception as e:
+            print(f"Failed to record judge batch: {str(e)}")
+        print(f"Judged {len(items)} answers in {batch['calls']} calls, about {saved} prompt tokens saved")
+
+    def _verdict(self, job: Dict, analysis_result: Dict, outcome: Dict, label: str):
+        """Outcome of a judge call for one answer: (analysis, error)"""
+        if not analysis_result.get('success', False):
+            error_msg = f"Analysis failed for question {label}: {analysis_result.get('error', 'Unknown error')}"
+            print(error_msg)
+            return analysis_result, error_msg
         
-        if not websites:
-            print("No active websites found to monitor")
-            return {'success': False, 'error': 'No active websites found'}
+        outcome['analyzed'] = True
+        if analysis_result.get('misrepresentation_detected', False):
+            outcome['misrepresentation'] = True
+            print(f"⚠️  Misrepresentation detected for question: {job['question_text'][:50]}...")
+        return analysis_result, None
+
+    def _judge_skippable(self, job: Dict) -> bool:
+        """Whether the last verdict on this question, model and content was confidently accurate"""
+        verdict = self.db.get_last_verdict(job['question_id'], job['llm_service'], job['content_id'])
+        return bool(verdict) and not verdict['misrepresentation_detected'] and \
+            (verdict['confidence'] or 0) >= self.skip_judge_confidence and \
+            (verdict['accuracy_score'] or 0) >= self.skip_judge_confidence
+
+    def _checkpoint_answer(self, job: Dict, llm_response: Dict, analysis_result: Dict, outcome: Dict,
+                           error_msg: Optional[str]) -> Future:
+        """Persist step: store the response, its analysis and the job state in one transaction"""
+        metadata = dict(llm_response.get('usage', {}))
+        if llm_response.get('model'):
+            metadata['model'] = llm_response['model']
+        if llm_response.get('cached'):
+            metadata['cached'] = True
         
-        print(f"Found {len(websites)} websites to monitor")
+        checkpoint = self.db.checkpoint_question_job(
+            job_id=job['id'],
+            question_id=job['question_id'],
+            llm_service=job['llm_service'],
+            response_text=llm_response['response'],
+            metadata=metadata,
+            website_content_id=job['content_id'],
+            analysis=analysis_result if outcome['analyzed'] else None,
+            result=outcome,
+            error=error_msg,
+            lease_owner=self.worker_id
+        )
+        checkpoint.add_done_callback(
+            lambda f: f.exception() and print(f"Checkpoint of job {job['id']} failed: {f.exception()}")
+        )
         
-        overall_results = {
-            'session_id': session_id,
-            'total_websites': len(websites),
-            'websites_processed': 0,
-            'total_questions': 0,
-            'total_misrepresentations': 0,
-            'website_results': [],
-            'errors': []
+        answered = {
+            'website_id': job['website_id'],
+            'question_id': job['question_id'],
+            'llm_service': job['llm_service'],
+            'question': job['question_text'][:200]
         }
+        analysis = analysis_result if outcome['analyzed'] else {}
+        self._publish(job['session_id'], events.QUESTION_ANSWERED, **answered,
+                      accuracy_score=analysis.get('accuracy_score'),
+                      misrepresentation=outcome['misrepresentation'],
+                      judge_skipped=bool(outcome.get('judge_skipped')), error=error_msg)
+        if outcome['misrepresentation']:
+            self._publish(job['session_id'], events.MISREPRESENTATION_FOUND, **answered,
+                          accuracy_score=analysis.get('accuracy_score'),
+                          summary=analysis.get('analysis_summary'), issues=analysis.get('specific_issues'))
+        return checkpoint
+
+    def _publish_question_failed(self, job: Dict, error_msg: str):
+        self._publish(job['session_id'], events.QUESTION_FAILED, website_id=job['website_id'],
+                      question_id=job['question_id'], llm_service=job['llm_service'], error=error_msg)
+
+    def _fail_question_job(self, job: Dict, outcome: Dict, error: Exception, label: str):
+        if isinstance(error, LeaseLostError):
+            print(str(error))
+            return
+        error_msg = f"Error processing question {label}: {str(error)}"
+        print(error_msg)
+        try:
+            self.db.fail_job(job['id'], error_msg, result=outcome, lease_owner=self.worker_id)
+        except LeaseLostError as lost:
+            print(str(lost))
+            return
+        self._publish_question_failed(job, error_msg)
+
+    def monitor_all_websites(self, force: bool = False, website_ids: List[int] = None,
+                             session_name: str = None, fresh: bool = False) -> Dict:
+        """Monitor all active websites (or the given ones) in a new resumable session.
+
+        Runs the session in this thread when it can start now. Websites an active
+        session is already monitoring are left to it, and when the concurrent
+        session limit is reached the session is queued; in worker execution mode
+        it is only enqueued for the workers. A `fresh` session bypasses the LLM
+        response cache and samples every answer anew.
+        """
+        print("Starting monitoring of all websites...")
+        submitted = self.sessions.submit(website_ids, force, session_name, run_here=True, fresh=fresh)
+        if submitted['success'] and submitted['created'] and submitted['status'] == 'running' \
+                and self.execution_mode != 'worker':
+            return self.run_session(submitted['session_id'])
+        return submitted
+
+    def estimate_session(self, session_id: int, website_count: int):
+        """Record a session's pre-flight token and cost estimate, as if every website needed new questions"""
+        models = {service: self._model_name(service if service in self.target_models else None)
+                  for service in self.llm_services}
+        estimated_tokens, estimated_cost = self.budget.estimate_session(
+            website_count, self.question_bank_size, models, self.judge_model
+        )
+        self.db.set_session_estimate(session_id, estimated_tokens, estimated_cost)
+        print(f"Session {session_id} estimate: up to {estimated_tokens} tokens, ${estimated_cost:.4f}")
+        if ((self.budget.session_tokens and estimated_tokens > self.budget.session_tokens)
+                or (self.budget.session_cost and estimated_cost > self.budget.session_cost)):
+            print(f"Session {session_id} may exceed its budget; it will degrade and then stop when limits are hit")
+
+    def run_session(self, session_id: int) -> Dict:
+        """Run a session's unfinished jobs in this process and complete it once nothing is left.
+
+        Jobs leased by other live processes are waited for; jobs whose owner died
+        are taken over when their lease expires.
+        """
+        with self.sessions_lock:
+            if session_id in self.active_sessions:
+                raise ValueError(f"Session {session_id} is already running")
+            self.active_sessions.add(session_id)
         
-        # Monitor each website
-        for website in websites:
-            print(f"\n{'='*50}")
-            print(f"Monitoring website: {website['name']}")
-            print(f"{'='*50}")
+        try:
+            started = time.monotonic()
+            stage_metrics = None
+            job_counts = self.db.get_job_counts(session_id)
+            self._publish(session_id, events.SESSION_STARTED,
+                          total_websites=sum(job_counts.get('website', {}).values()),
+                          websites_completed=job_counts.get('website', {}).get(JOB_COMPLETED, 0),
+                          questions_queued=sum(job_counts.get('question', {}).values()),
+                          questions_answered=job_counts.get('question', {}).get(JOB_COMPLETED, 0))
             
-            try:
-                result = self.monitor_website(website['id'])
-                overall_results['website_results'].append(result)
-                
-                if result.get('success', False):
-                    overall_results['websites_processed'] += 1
-                    overall_results['total_questions'] += result.get('questions_analyzed', 0)
-                    overall_results['total_misrepresentations'] += result.get('misrepresentations_found', 0)
+            while True:
+                website_jobs = self.db.get_session_jobs(session_id, kind='website', states=UNFINISHED_JOB_STATES)
+                question_jobs = self.db.get_session_jobs(session_id, kind='question', states=UNFINISHED_JOB_STATES)
                 
-                overall_results['errors'].extend(result.get('errors', []))
+                pipeline = MonitoringPipeline(self, session_id)
+                self.pipelines[session_id] = pipeline
+                try:
+                    stage_metrics = pipeline.run(website_jobs, question_jobs)
+                finally:
+                    self.pipelines.pop(session_id, None)
+                self.last_pipeline_metrics = stage_metrics
                 
-            except Exception as e:
-                error_msg = f"Failed to monitor website {website['name']}: {str(e)}"
-                print(error_msg)
-                overall_results['errors'].append(error_msg)
-        
-        # Complete the monitoring session
-        self.complete_monitoring_session(
-            session_id=session_id,
-            total_questions=overall_results['total_questions'],
-            misrepresentations_found=overall_results['total_misrepresentations']
-        )
+                # Make sure every queued result is committed before checking what is left
+                self.db.flush_writes()
+                self.db.fail_exhausted_jobs(self.max_job_attempts, session_id)
+                if self.db.count_unfinished_jobs(session_id) == 0:
+                    break
+                print(f"Session {session_id} is waiting for jobs leased by other processes")
+                time.sleep(self.job_poll_seconds)
+            
+            overall_results = self.finish_session_if_done(session_id)
+            overall_results['duration_seconds'] = round(time.monotonic() - started, 2)
+            overall_results['stages'] = stage_metrics
+        finally:
+            with self.sessions_lock:
+                self.active_sessions.discard(session_id)
         
         print(f"\n{'='*50}")
         print("MONITORING SUMMARY")
@@ -261,11 +802,138 @@ class MonitoringSystem:
         print(f"Websites processed: {overall_results['websites_processed']}/{overall_results['total_websites']}")
         print(f"Total questions analyzed: {overall_results['total_questions']}")
         print(f"Total misrepresentations found: {overall_results['total_misrepresentations']}")
+        print(f"Websites re-queried (unchanged content): {overall_results['websites_requeried']}")
+        print(f"Websites skipped: {len(overall_results['skipped_websites'])}")
+        for skipped in overall_results['skipped_websites']:
+            print(f"  - {skipped['website_name']}: {skipped['reason']}")
+        if len(overall_results['models']) > 1:
+            for service, counts in sorted(overall_results['models'].items()):
+                print(f"  {service}: {counts['questions_analyzed']} analyzed, "
+                      f"{counts['misrepresentations']} misrepresentations")
+        print(f"LLM calls: {overall_results['total_llm_calls']}")
+        spend = overall_results['spend']
+        print(f"Spend: {spend.get('tokens_used') or 0} tokens, ${spend.get('cost_usd') or 0:.4f} "
+              f"(budget {spend.get('budget_status') or 'ok'}, judge skipped {overall_results['judge_skipped']})")
         print(f"Total errors: {len(overall_results['errors'])}")
+        print(f"Duration: {overall_results['duration_seconds']}s")
+        for name, metrics in (stage_metrics or {}).items():
+            print(f"  {name:<8} {metrics['processed']:>5} items  {metrics['throughput_per_second']:>7}/s  "
+                  f"utilization {metrics['utilization']:.0%}  max queue {metrics['max_queue_depth']}")
         
         overall_results['success'] = True
         return overall_results
 
+    def finish_session_if_done(self, session_id: int) -> Dict:
+        """Mark a session completed once all its jobs are finished; returns its report"""
+        overall_results = self.get_session_report(session_id)
+        if overall_results['unfinished_jobs'] == 0:
+            self.complete_monitoring_session(
+                session_id=session_id,
+                total_questions=overall_results['total_questions'],
+                misrepresentations_found=overall_results['total_misrepresentations']
+            )
+            # A session slot is free: start the next queued session
+            self.sessions.promote()
+        return overall_results
+
+    def get_session_report(self, session_id: int) -> Dict:
+        """Build the session report from its job rows, so resumed sessions report all their work"""
+        jobs = self.db.get_session_jobs(session_id)
+        website_jobs = [job for job in jobs if job['kind'] == 'website']
+        question_jobs = defaultdict(list)
+        for job in jobs:
+            if job['kind'] == 'question':
+                question_jobs[job['website_id']].append(job)
+        
+        overall_results = {
+            'session_id': session_id,
+            'total_websites': len(website_jobs),
+            'websites_processed': 0,
+            'total_questions': 0,
+            'total_misrepresentations': 0,
+            'total_llm_calls': 0,
+            'websites_requeried': 0,
+            'skipped_websites': [],
+            'unfinished_jobs': sum(1 for job in jobs if job['state'] in UNFINISHED_JOB_STATES),
+            'judge_skipped': 0,
+            'spend': self.db.get_session_spend(session_id),
+            'models': {},
+            'website_results': [],
+            'errors': []
+        }
+        
+        for job in website_jobs:
+            result = job_result(job) or {'website_id': job['website_id'], 'llm_calls': 0, 'errors': []}
+            result.pop('question_ids', None)
+            result['job_state'] = job['state']
+            result['success'] = job['state'] == JOB_COMPLETED
+            if job['error'] and job['error'] not in result['errors']:
+                result['errors'].append(job['error'])
+            
+            for question_job in question_jobs[job['website_id']]:
+                outcome = job_result(question_job)
+                result['llm_calls'] = result.get('llm_calls', 0) + outcome.get('llm_calls', 0)
+                result['questions_analyzed'] = result.get('questions_analyzed', 0) + int(outcome.get('analyzed', False))
+                result['misrepresentations_found'] = (result.get('misrepresentations_found', 0)
+                                                      + int(outcome.get('misrepresentation', False)))
+                if question_job['error']:
+                    result['errors'].append(question_job['error'])
+                overall_results['judge_skipped'] += int(outcome.get('judge_skipped', False))
+                if job['state'] == JOB_COMPLETED:
+                    counts = overall_results['models'].setdefault(
+                        question_job['llm_service'], {'questions_analyzed': 0, 'misrepresentations': 0}
+                    )
+                    counts['questions_analyzed'] += int(outcome.get('analyzed', False))
+                    counts['misrepresentations'] += int(outcome.get('misrepresentation', False))
+            
+            overall_results['website_results'].append(result)
+            if result['success']:
+                overall_results['websites_processed'] += 1
+                overall_results['total_questions'] += result.get('questions_analyzed', 0)
+                overall_results['total_misrepresentations'] += result.get('misrepresentations_found', 0)
+            
+            overall_results['total_llm_calls'] += result.get('llm_calls', 0)
+            if result.get('mode') == 'requery':
+                overall_results['websites_requeried'] += 1
+            elif result.get('mode') == 'skipped':
+                overall_results['skipped_websites'].append({
+                    'website_id': result['website_id'],
+                    'website_name': result.get('website_name'),
+                    'reason': result.get('skip_reason')
+                })
+            
+            overall_results['errors'].extend(result['errors'])
+        
+        return overall_results
+
+    def resume_session(self, session_id: int) -> Dict:
+        """Resume a session after a crash, redoing only its unfinished jobs"""
+        session = self.db.get_session(session_id)
+        if session is not None and session['status'] not in ('queued', 'running'):
+            raise ValueError(f"Session {session_id} is {session['status']} and cannot be resumed")
+        reset = self.db.reset_interrupted_jobs(session_id)
+        print(f"Resuming monitoring session {session_id} ({reset} interrupted jobs reset)")
+        self.current_session_id = session_id
+        return self.run_session(session_id)
+
+    def resume_interrupted_sessions(self) -> List[Dict]:
+        """Resume every session still marked running that this process is not running.
+
+        Only used in inline execution mode; workers pick up unfinished jobs themselves.
+        """
+        if self.execution_mode == 'worker':
+            return []
+        # Sessions queued before the restart start as slots allow
+        self.sessions.promote()
+        results = []
+        for session in self.db.get_sessions_by_status('running'):
+            if session['id'] not in self.active_sessions and session['id'] not in self.sessions.threads:
+                try:
+                    results.append(self.resume_session(session['id']))
+                except ValueError as e:
+                    print(str(e))
+        return results
+
     def add_website_to_monitor(self, url: str, name: str, description: str = "") -> int:
         """Add a new website to monitor"""
         print(f"Adding website to monitoring: {name} ({url})")
@@ -280,20 +948,15 @@ class MonitoringSystem:
         return website_id
 
     def setup_scheduled_monitoring(self, interval_hours: int = 6):
-        """Setup scheduled monitoring"""
+        """Setup scheduled monitoring with per-website adaptive intervals around `interval_hours`"""
         print(f"Setting up scheduled monitoring every {interval_hours} hours")
         
-        schedule.clear()
-        schedule.every(interval_hours).hours.do(self.monitor_all_websites)
-        
-        def run_scheduler():
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+        if self.scheduler is not None:
+            self.scheduler.stop()
         
-        self.scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
+        self.scheduler = AdaptiveScheduler(self, base_interval_hours=interval_hours)
         self.is_running = True
-        self.scheduler_thread.start()
+        self.scheduler.start()
         
         print("Scheduled monitoring started")
 
@@ -301,16 +964,82 @@ class MonitoringSystem:
         """Stop scheduled monitoring"""
         print("Stopping scheduled monitoring...")
         self.is_running = False
-        schedule.clear()
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
         print("Scheduled monitoring stopped")
 
+    def set_website_interval(self, website_id: int, interval_hours: Optional[float]):
+        """Override the monitoring interval of one website (None restores the default)"""
+        if self.scheduler is not None:
+            self.scheduler.set_interval(website_id, interval_hours)
+        else:
+            self.db.set_website_interval(website_id, interval_hours, float(os.getenv("MONITOR_SCHEDULE_HOURS", 6)))
+
+    def get_schedule(self) -> List[Dict]:
+        """Per-website cadence of the running scheduler, or the persisted one when stopped"""
+        if self.scheduler is not None:
+            return self.scheduler.snapshot()
+        return self.db.get_website_schedules()
+
+    def get_session_progress(self, session_id: int) -> Optional[Dict]:
+        """Snapshot of a session: its row, job counts and spend, plus live progress if it runs here"""
+        session = self.db.get_session(session_id)
+        if session is None:
+            return None
+        pipeline = self.pipelines.get(session_id)
+        return {
+            'session_id': session_id,
+            'session_name': session['session_name'],
+            'status': session['status'],
+            'started_at': session['started_at'],
+            'completed_at': session['completed_at'],
+            'jobs': self.db.get_job_counts(session_id),
+            'spend': self.db.get_session_spend(session_id),
+            'stages': pipeline.metrics() if pipeline else None,
+            'live': self.events.snapshot(session_id)
+        }
+
+    def llm_cache_stats(self) -> Optional[Dict]:
+        """Hit/miss metrics of the LLM response cache; None when it is disabled"""
+        cache = getattr(self.llm_client, 'cache', None)
+        return cache.stats() if cache is not None else None
+
     def get_monitoring_status(self) -> Dict:
         """Get current monitoring status"""
         return {
             'is_running': self.is_running,
             'current_session_id': self.current_session_id,
-            'scheduled_jobs': len(schedule.jobs),
-            'active_websites': len(self.db.get_websites(active_only=True))
+            'scheduled_jobs': len(self.scheduler.schedules) if self.scheduler else 0,
+            'active_websites': len(self.db.get_websites(active_only=True)),
+            'active_sessions': sorted(self.active_sessions),
+            'execution_mode': self.execution_mode,
+            'llm_services': self.llm_services,
+            'judge_model': getattr(self.llm_client, 'judge_model', None),
+            'worker_id': self.worker_id,
+            'held_jobs': len(self.held_jobs),
+            'pipelines': {session_id: pipeline.metrics() for session_id, pipeline in list(self.pipelines.items())},
+            'last_pipeline_metrics': self.last_pipeline_metrics,
+            'write_behind': self.db.get_write_behind_stats(),
+            'budget': self.budget.status(),
+            'llm_cache': self.llm_cache_stats(),
+            'llm_endpoint': self.llm_guard.status() if self.llm_guard else None,
+            'events': self.events.stats(),
+            'sessions': {
+                'max_concurrent': self.sessions.max_running,
+                'running_here': sorted(self.sessions.threads),
+                'queued': [s['id'] for s in self.db.get_sessions_by_status('queued')]
+            },
+            'concurrency': {
+                'max_concurrency': self.max_concurrency,
+                'per_website': self.per_website_concurrency,
+                'per_endpoint': self.llm_guard.aimd.current if self.llm_guard else self.per_endpoint_concurrency,
+                'llm_requests_per_second': self.llm_rate_limiter.rate,
+                'llm_rate_limit_wait_seconds': round(self.llm_rate_limiter.total_wait_seconds, 2),
+                'llm_in_flight': {self.llm_endpoint: self.llm_guard.in_flight} if self.llm_guard
+                                 else self.endpoint_limiter.snapshot(),
+                'judge_batch_size': self.judge_batch_size if self.batch_judging else 1
+            }
         }
 
     def test_system_components(self) -> Dict:
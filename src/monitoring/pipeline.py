@@ -0,0 +1,400 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from ..database.jobs import JOB_PENDING, job_options
+from ..llm_client.retrieval import PassageIndex
+
+STAGE_ORDER = ['scrape', 'generate', 'query', 'judge', 'persist']
+
+_STOP = object()
+
+
+class Stage:
+    """A pool of worker threads draining a bounded queue, with throughput and depth metrics.
+
+    put() blocks while the queue is full, so a slow stage holds back the stages
+    feeding it instead of letting work pile up in memory.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Dict], None], concurrency: int, queue_size: int,
+                 on_error: Optional[Callable[[Dict, Exception], None]] = None):
+        self.name = name
+        self.handler = handler
+        self.on_error = on_error
+        self.concurrency = max(1, concurrency)
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.threads = []
+        self.lock = threading.Lock()
+        self.started_at = None
+        self.stopped_at = None
+        self.processed = 0
+        self.failed = 0
+        self.in_progress = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self.backpressure_seconds = 0.0
+
+    def start(self):
+        self.started_at = time.monotonic()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def put(self, item: Dict):
+        """Queue an item, blocking while the stage is saturated"""
+        waited = time.monotonic()
+        self.queue.put(item)
+        waited = time.monotonic() - waited
+        with self.lock:
+            self.backpressure_seconds += waited
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def close(self):
+        """Let the workers exit once every item queued so far is handled"""
+        for _ in self.threads:
+            self.queue.put(_STOP)
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+        self.stopped_at = time.monotonic()
+
+    def drain(self):
+        """Wait until every item queued so far has been handled"""
+        self.queue.join()
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                return
+            started = time.monotonic()
+            with self.lock:
+                self.in_progress += 1
+            failed = False
+            try:
+                self.handler(item)
+            except Exception as e:
+                failed = True
+                print(f"Stage {self.name} failed: {str(e)}")
+                if self.on_error is not None:
+                    try:
+                        self.on_error(item, e)
+                    except Exception as handler_error:
+                        print(f"Stage {self.name} error handler failed: {str(handler_error)}")
+            finally:
+                with self.lock:
+                    self.in_progress -= 1
+                    self.processed += 1
+                    self.failed += int(failed)
+                    self.busy_seconds += time.monotonic() - started
+                self.queue.task_done()
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            elapsed = ((self.stopped_at or time.monotonic()) - self.started_at) if self.started_at else 0.0
+            return {
+                'concurrency': self.concurrency,
+                'processed': self.processed,
+                'failed': self.failed,
+                'in_progress': self.in_progress,
+                'queue_depth': self.queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'queue_capacity': self.queue.maxsize,
+                'throughput_per_second': round(self.processed / elapsed, 2) if elapsed else 0.0,
+                'utilization': round(self.busy_seconds / (elapsed * self.concurrency), 2) if elapsed else 0.0,
+                'backpressure_seconds': round(self.backpressure_seconds, 2)
+            }
+
+
+class JudgeBatcher:
+    """Answers waiting to be judged together, grouped by the scraped content they are judged against.
+
+    A group is released as a batch once it is full or its oldest answer has
+    waited `max_wait` seconds.
+    """
+
+    def __init__(self, size: int, max_wait: float):
+        self.size = size
+        self.max_wait = max_wait
+        self.groups = OrderedDict()
+        self.lock = threading.Lock()
+
+    def add(self, key, item: Dict) -> Optional[List[Dict]]:
+        """Hold an item; returns its group as a batch when that is now full"""
+        with self.lock:
+            started, items = self.groups.setdefault(key, (time.monotonic(), []))
+            items.append(item)
+            if len(items) < self.size:
+                return None
+            del self.groups[key]
+            return items
+
+    def due(self) -> List[List[Dict]]:
+        """Batches whose oldest answer has waited long enough"""
+        now = time.monotonic()
+        with self.lock:
+            keys = [key for key, (started, _) in self.groups.items() if now - started >= self.max_wait]
+            return [self.groups.pop(key)[1] for key in keys]
+
+    def drain(self) -> List[List[Dict]]:
+        with self.lock:
+            batches = [items for _, items in self.groups.values()]
+            self.groups.clear()
+            return batches
+
+
+class MonitoringPipeline:
+    """One pass over a session's jobs as independent stages joined by bounded queues.
+
+    scrape -> generate -> query -> judge -> persist: website jobs are claimed and
+    scraped, then (for new content) get their questions generated; completing a
+    website job fans its question jobs into the query stage, and each answer is
+    judged and checkpointed by the later stages. A slow judge call therefore no
+    longer holds up the scraping of the next website, and vice versa. Query and
+    judge work holds the same global and per-website slots as worker mode. With batch
+    judging, answers to the same website content are held back briefly and judged
+    a batch at a time.
+    """
+
+    def __init__(self, system, session_id: int):
+        self.system = system
+        self.session_id = session_id
+        self.websites = {w['id']: w for w in system.db.get_websites()}
+        self.contents = OrderedDict()
+        self.contents_lock = threading.Lock()
+        self.sequence = 0
+        self.sequence_lock = threading.Lock()
+
+        queue_size = system.stage_queue_size
+        handlers = {
+            'scrape': (self._scrape, self._website_failed),
+            'generate': (self._generate, self._website_failed),
+            'query': (self._query, self._question_failed),
+            'judge': (self._judge, self._question_failed),
+            'persist': (self._persist, self._question_failed),
+        }
+        self.stages = {
+            name: Stage(name, handlers[name][0], system.stage_concurrency[name], queue_size, handlers[name][1])
+            for name in STAGE_ORDER
+        }
+        self.batcher = JudgeBatcher(system.judge_batch_size, system.judge_batch_wait) \
+            if system.batch_judging else None
+        self.batches_done = threading.Event()
+        self.batch_releaser = None
+
+    def run(self, website_jobs: List[Dict], question_jobs: List[Dict]) -> Dict:
+        """Process the given unfinished jobs; returns the per-stage metrics"""
+        for stage in self.stages.values():
+            stage.start()
+        if self.batcher is not None:
+            self.batch_releaser = threading.Thread(target=self._release_due_batches, name="judge-batcher",
+                                                   daemon=True)
+            self.batch_releaser.start()
+
+        feeders = [
+            threading.Thread(target=self._feed, args=('scrape', website_jobs), daemon=True),
+            threading.Thread(target=self._feed, args=('query', question_jobs), daemon=True),
+        ]
+        for feeder in feeders:
+            feeder.start()
+        for feeder in feeders:
+            feeder.join()
+
+        # Upstream stages emit into downstream ones, so they are drained in order
+        for name in STAGE_ORDER:
+            if name == 'judge' and self.batcher is not None:
+                self._drain_batches()
+            self.stages[name].close()
+            self.stages[name].join()
+        return self.metrics()
+
+    def metrics(self) -> Dict:
+        return {name: self.stages[name].metrics() for name in STAGE_ORDER}
+
+    def _feed(self, stage: str, jobs: List[Dict]):
+        for job in jobs:
+            self.stages[stage].put({'job': job})
+
+    def _label(self) -> str:
+        with self.sequence_lock:
+            self.sequence += 1
+            return str(self.sequence)
+
+    def _content(self, content_id: Optional[int]) -> PassageIndex:
+        """Passage index of the scraped content judged against, cached for the few websites in flight"""
+        with self.contents_lock:
+            if content_id in self.contents:
+                self.contents.move_to_end(content_id)
+                return self.contents[content_id]
+        content = self.system._job_content(content_id)
+        with self.contents_lock:
+            self.contents[content_id] = content
+            while len(self.contents) > self.system.stage_queue_size:
+                self.contents.popitem(last=False)
+        return content
+
+    # Website jobs
+
+    def _scrape(self, item: Dict):
+        job = item['job']
+        if not self.system._claim(job):
+            return
+        website = self.websites.get(job['website_id'])
+        if website is None:
+            self.system.db.fail_job(job['id'], f"Website with ID {job['website_id']} not found",
+                                    lease_owner=self.system.worker_id)
+            self.system._release(job['id'])
+            return
+
+        item['website'] = website
+        item['results'], item['scrape'] = self.system._scrape_website(
+            website, bool(job_options(job).get('force')), self.session_id
+        )
+        if item['scrape'] is not None:
+            self.stages['generate'].put(item)
+        else:
+            self._finish_website(item)
+
+    def _cancelled(self, item: Dict) -> bool:
+        """Drop work of a session cancelled while it was queued between stages"""
+        if not self.system.sessions.is_cancelled(self.session_id):
+            return False
+        self.system._release(item['job']['id'])
+        return True
+
+    def _generate(self, item: Dict):
+        if self._cancelled(item):
+            return
+        self.system._generate_website_questions(item['website'], item['results'], item['scrape'], self.session_id,
+                                                bool(job_options(item['job']).get('fresh')))
+        item['scrape'] = None
+        self._finish_website(item)
+
+    def _finish_website(self, item: Dict):
+        job = item['job']
+        try:
+            completed = self.system._checkpoint_website_job(job, item['results'])
+        finally:
+            self.system._release(job['id'])
+        if not completed:
+            return
+
+        question_jobs = self.system.db.get_session_jobs(
+            self.session_id, kind='question', website_id=job['website_id'], states=(JOB_PENDING,)
+        )
+        print(f"Step 3: Processing {len(question_jobs)} questions...")
+        for question_job in question_jobs:
+            self.stages['query'].put({'job': question_job})
+
+    def _website_failed(self, item: Dict, error: Exception):
+        job = item['job']
+        try:
+            self.system._fail_website_job(job, error)
+        finally:
+            self.system._release(job['id'])
+
+    # Question jobs
+
+    def _query(self, item: Dict):
+        job = item['job']
+        if not self.system._claim(job):
+            return
+        item['label'] = self._label()
+        item['outcome'] = {'analyzed': False, 'misrepresentation': False, 'llm_calls': 0}
+        with self.system._question_slot([job]):
+            item['response'] = self.system._query_answer(job, item['outcome'], item['label'])
+        if item['response'] is None:
+            self.system._release(job['id'])
+            return
+        self.stages['judge'].put(item)
+
+    def _judge(self, item: Dict):
+        if 'batch' in item:
+            self._judge_batch(item['batch'])
+            return
+        if self.batcher is not None:
+            batch = self.batcher.add(item['job']['content_id'], item)
+            if batch:
+                self._judge_batch(batch)
+            return
+        if self._cancelled(item):
+            return
+        content = self._content(item['job']['content_id'])
+        with self.system._question_slot([item['job']]):
+            item['analysis'], item['error'] = self.system._judge_answer(
+                item['job'], content, item['response'], item['outcome'], item['label']
+            )
+        self.stages['persist'].put(item)
+
+    def _judge_batch(self, items: List[Dict]):
+        items = [item for item in items if not self._cancelled(item)]
+        if not items:
+            return
+        try:
+            content = self._content(items[0]['job']['content_id'])
+            with self.system._question_slot([item['job'] for item in items]):
+                self.system._judge_answers(items, content)
+        except Exception as e:
+            print(f"Stage judge failed for a batch of {len(items)} answers: {str(e)}")
+            for item in items:
+                self._question_failed(item, e)
+            return
+        for item in items:
+            self.stages['persist'].put(item)
+
+    def _release_due_batches(self):
+        """Queue partial batches that waited long enough, until the judge stage drains"""
+        while not self.batches_done.wait(self.batcher.max_wait / 2):
+            for batch in self.batcher.due():
+                self.stages['judge'].put({'batch': batch})
+
+    def _drain_batches(self):
+        """Judge every answer still held back, once no more can arrive"""
+        self.batches_done.set()
+        self.batch_releaser.join()
+        while True:
+            self.stages['judge'].drain()
+            batches = self.batcher.drain()
+            if not batches:
+                return
+            for batch in batches:
+                self.stages['judge'].put({'batch': batch})
+
+    def _persist(self, item: Dict):
+        try:
+            self.system._checkpoint_answer(
+                item['job'], item['response'], item['analysis'], item['outcome'], item['error']
+            )
+        finally:
+            self.system._release(item['job']['id'])
+
+    def _question_failed(self, item: Dict, error: Exception):
+        job = item['job']
+        try:
+            if 'outcome' in item:
+                self.system._fail_question_job(job, item['outcome'], error, item.get('label', '?'))
+        finally:
+            self.system._release(job['id'])
+
+
+def stage_concurrency(max_concurrency: int) -> Dict[str, int]:
+    """Worker threads per stage from MONITOR_<STAGE>_CONCURRENCY, defaulting from the global cap"""
+    defaults = {
+        'scrape': max_concurrency,
+        'generate': max(1, max_concurrency // 2),
+        'query': max_concurrency,
+        'judge': max_concurrency,
+        # Checkpoints are single small transactions (or go through the write-behind queue)
+        'persist': 1,
+    }
+    return {
+        name: int(os.getenv(f"MONITOR_{name.upper()}_CONCURRENCY", default))
+        for name, default in defaults.items()
+    }
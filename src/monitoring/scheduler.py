@@ -0,0 +1,247 @@
+import heapq
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def to_timestamp(seconds: float) -> str:
+    """UTC text timestamp comparable with SQLite's CURRENT_TIMESTAMP"""
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def from_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return datetime.strptime(str(value)[:19], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+
+class AdaptiveScheduler:
+    """Per-website monitoring cadence driven by a heap of next-due times.
+
+    Each website has its own interval, starting at the base interval (or its
+    override). When a site comes due, what happened since it was last enqueued
+    adjusts the interval: new content or recent misrepresentations halve it, a
+    stable check backs it off, down to/up to the configured bounds. Due times are
+    jittered so sites do not all fire together, and the state is persisted in
+    website_schedules so restarts keep each site's cadence.
+    """
+
+    def __init__(self, system, base_interval_hours: float = 6):
+        self.system = system
+        self.db = system.db
+        self.base_interval_hours = float(base_interval_hours)
+        self.min_interval_hours = float(os.getenv("MONITOR_SCHEDULE_MIN_HOURS", 1))
+        self.max_interval_hours = float(os.getenv("MONITOR_SCHEDULE_MAX_HOURS", 48))
+        self.backoff = float(os.getenv("MONITOR_SCHEDULE_BACKOFF", 1.5))
+        self.jitter = float(os.getenv("MONITOR_SCHEDULE_JITTER", 0.1))
+        # Upper bound on sleeping, so new websites and stop requests are noticed
+        self.poll_seconds = float(os.getenv("MONITOR_SCHEDULE_POLL_SECONDS", 60))
+
+        self.heap = []
+        self.schedules: Dict[int, Dict] = {}
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.sessions_enqueued = 0
+
+    def _clamp(self, hours: float, base: float) -> float:
+        # A per-site base interval outside the bounds widens them for that site
+        lower = min(self.min_interval_hours, base)
+        upper = max(self.max_interval_hours, base)
+        return min(upper, max(lower, hours))
+
+    def _jittered(self, now: float, hours: float) -> float:
+        """Next due time `hours` from now, spread by +/- the jitter fraction"""
+        return now + hours * 3600 * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _push(self, schedule: Dict):
+        self.schedules[schedule['website_id']] = schedule
+        heapq.heappush(self.heap, (schedule['due'], schedule['website_id']))
+
+    def sync(self):
+        """Load persisted schedules and add any active website that has none yet"""
+        now = time.time()
+        persisted = {row['website_id']: row for row in self.db.get_website_schedules()}
+        active = {w['id']: w for w in self.db.get_websites(active_only=True)}
+        new_schedules = []
+
+        with self.lock:
+            for website_id in list(self.schedules):
+                if website_id not in active:
+                    # The heap entry goes stale and is dropped when popped
+                    del self.schedules[website_id]
+
+            for website_id, website in active.items():
+                if website_id in self.schedules:
+                    continue
+                row = persisted.get(website_id)
+                if row is not None:
+                    schedule = {
+                        'website_id': website_id,
+                        'base_interval_hours': row['base_interval_hours'],
+                        'interval_hours': row['interval_hours'],
+                        'due': from_timestamp(row['next_due_at']),
+                        'last_enqueued_at': row['last_enqueued_at'],
+                        'stable_runs': row['stable_runs']
+                    }
+                else:
+                    # First check at the usual interval after the last scrape, or soon for
+                    # never-scraped sites, spread over a jitter window instead of all at once
+                    interval = self.base_interval_hours
+                    last_scraped = from_timestamp(website.get('last_scraped'))
+                    due = self._jittered(last_scraped, interval) if last_scraped else now
+                    due = max(due, now + random.uniform(0, self.jitter * interval * 3600))
+                    schedule = {
+                        'website_id': website_id,
+                        'base_interval_hours': None,
+                        'interval_hours': interval,
+                        'due': due,
+                        'last_enqueued_at': None,
+                        'stable_runs': 0
+                    }
+                    new_schedules.append(schedule)
+                self._push(schedule)
+
+        if new_schedules:
+            self.db.save_website_schedules([self._row(s) for s in new_schedules])
+
+    def _row(self, schedule: Dict) -> Dict:
+        return {
+            'website_id': schedule['website_id'],
+            'interval_hours': schedule['interval_hours'],
+            'next_due_at': to_timestamp(schedule['due']),
+            'last_enqueued_at': schedule['last_enqueued_at'],
+            'stable_runs': schedule['stable_runs']
+        }
+
+    def _adapt(self, schedule: Dict, now: float):
+        """Adjust a due site's interval from what its previous check found"""
+        base = schedule['base_interval_hours'] or self.base_interval_hours
+        if not schedule['last_enqueued_at']:
+            schedule['interval_hours'] = self._clamp(base, base)
+            return
+
+        # Misrepresentations found within the last base interval keep a site hot
+        signals = self.db.get_schedule_signals(
+            schedule['website_id'], schedule['last_enqueued_at'],
+            min(schedule['last_enqueued_at'], to_timestamp(now - base * 3600))
+        )
+        if signals['misrepresentations']:
+            # Misrepresented sites are never checked less often than their base interval
+            schedule['interval_hours'] = self._clamp(min(schedule['interval_hours'], base) / 2, base)
+            schedule['stable_runs'] = 0
+        elif signals['content_changed']:
+            schedule['interval_hours'] = self._clamp(schedule['interval_hours'] / 2, base)
+            schedule['stable_runs'] = 0
+        elif signals['checked']:
+            schedule['interval_hours'] = self._clamp(schedule['interval_hours'] * self.backoff, base)
+            schedule['stable_runs'] += 1
+        # A failed scrape tells nothing about the site, so its interval is kept
+
+    def pop_due(self, now: float = None) -> List[int]:
+        """Reschedule every due website and return those to enqueue now"""
+        now = now or time.time()
+        due_schedules = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                due, website_id = heapq.heappop(self.heap)
+                schedule = self.schedules.get(website_id)
+                if schedule is None or schedule['due'] != due:
+                    continue
+                due_schedules.append(schedule)
+
+        enqueue, changed = [], []
+        for schedule in due_schedules:
+            if self.db.has_unfinished_website_jobs(schedule['website_id']):
+                # The previous check is still running; look again after the shortest interval
+                schedule['due'] = self._jittered(now, self.min_interval_hours)
+            else:
+                self._adapt(schedule, now)
+                schedule['last_enqueued_at'] = to_timestamp(now)
+                schedule['due'] = self._jittered(now, schedule['interval_hours'])
+                enqueue.append(schedule['website_id'])
+            changed.append(schedule)
+
+        with self.lock:
+            for schedule in changed:
+                if schedule['website_id'] in self.schedules:
+                    self._push(schedule)
+        if changed:
+            self.db.save_website_schedules([self._row(s) for s in changed])
+        return enqueue
+
+    def set_interval(self, website_id: int, interval_hours: Optional[float]):
+        """Override (or with None, reset) a website's base interval.
+
+        The adaptive interval restarts from the new base, and a next check further
+        away than one new interval is brought forward.
+        """
+        self.db.set_website_interval(website_id, interval_hours, self.base_interval_hours)
+        with self.lock:
+            self.schedules.pop(website_id, None)
+        self.sync()
+
+        now = time.time()
+        with self.lock:
+            schedule = self.schedules.get(website_id)
+            if schedule is None or schedule['due'] <= now + schedule['interval_hours'] * 3600:
+                schedule = None
+            else:
+                schedule['due'] = self._jittered(now, schedule['interval_hours'])
+                self._push(schedule)
+        if schedule is not None:
+            self.db.save_website_schedules([self._row(schedule)])
+        self.wake.set()
+
+    def _enqueue(self, website_ids: List[int]):
+        session_name = f"Scheduled Session {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        print(f"Scheduler enqueuing {len(website_ids)} due websites: {website_ids}")
+        self.sessions_enqueued += 1
+        # Inline sessions run on their own thread, so other sites keep their due times
+        self.system.sessions.submit(website_ids=website_ids, session_name=session_name)
+
+    def _run(self):
+        while not self.stopping.is_set():
+            try:
+                self.sync()
+                website_ids = self.pop_due()
+                if website_ids:
+                    self._enqueue(website_ids)
+            except Exception as e:
+                print(f"Scheduler error: {str(e)}")
+
+            with self.lock:
+                delay = self.heap[0][0] - time.time() if self.heap else self.poll_seconds
+            self.wake.wait(min(max(delay, 0), self.poll_seconds))
+            self.wake.clear()
+
+    def start(self):
+        self.sync()
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self.thread.start()
+        print(f"Adaptive scheduler started for {len(self.schedules)} websites "
+              f"(base {self.base_interval_hours:g}h, range {self.min_interval_hours:g}-{self.max_interval_hours:g}h)")
+
+    def stop(self):
+        self.stopping.set()
+        self.wake.set()
+
+    def snapshot(self) -> List[Dict]:
+        """Current cadence of every scheduled website, soonest first"""
+        with self.lock:
+            schedules = sorted(self.schedules.values(), key=lambda s: s['due'])
+            return [{
+                'website_id': s['website_id'],
+                'interval_hours': round(s['interval_hours'], 2),
+                'base_interval_hours': s['base_interval_hours'] or self.base_interval_hours,
+                'next_due_at': to_timestamp(s['due']),
+                'last_enqueued_at': s['last_enqueued_at'],
+                'stable_runs': s['stable_runs']
+            } for s in schedules]
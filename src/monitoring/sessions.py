@@ -0,0 +1,132 @@
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..database.sessions import SESSION_QUEUED, SESSION_RUNNING
+from . import events
+
+
+class SessionManager:
+    """Submits, queues, coalesces and cancels monitoring sessions.
+
+    A submitted session gets its id (the handle for status and cancel) at once.
+    Websites that an active session still has work for are left to that session,
+    so overlapping requests do not pay for the same LLM calls twice. At most
+    MONITOR_MAX_CONCURRENT_SESSIONS sessions run at a time; the rest wait in the
+    'queued' state and start, oldest first, as running sessions end. In inline
+    execution mode started sessions run on threads of this process; in worker
+    mode the workers claim their jobs.
+    """
+
+    def __init__(self, system):
+        self.system = system
+        self.db = system.db
+        self.max_running = max(1, int(os.getenv("MONITOR_MAX_CONCURRENT_SESSIONS", 1)))
+        self.cancelled = set()
+        self.threads: Dict[int, threading.Thread] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, website_ids: List[int] = None, force: bool = False, session_name: str = None,
+               run_here: bool = False, fresh: bool = False) -> Dict:
+        """Create a session for the websites (all active ones by default) and start it if a slot is free.
+
+        With `run_here` the caller runs the new session itself when it starts now
+        (its status is then 'running'); otherwise it is started on a thread.
+        A `fresh` session bypasses the LLM response cache.
+        """
+        if website_ids:
+            websites = [w for w in self.db.get_websites() if w['id'] in website_ids]
+        else:
+            websites = self.db.get_websites(active_only=True)
+        if not websites:
+            print("No active websites found to monitor")
+            return {'success': False, 'error': 'No active websites found'}
+
+        if not session_name:
+            session_name = f"Session {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        options = {'force': force}
+        if fresh:
+            options['fresh'] = True
+        session_id, covered = self.db.enqueue_session(session_name, [w['id'] for w in websites], options=options)
+        result = {
+            'success': True,
+            'session_id': session_id,
+            'created': session_id is not None,
+            'website_ids': [w['id'] for w in websites if w['id'] not in covered],
+            'coalesced': covered
+        }
+        if covered:
+            print(f"Websites {sorted(covered)} are already being monitored by sessions "
+                  f"{sorted(set(covered.values()))}")
+        if session_id is None:
+            # Everything asked for is already in progress: report the session doing it
+            result['session_id'] = min(covered.values())
+            result['status'] = self._status(result['session_id'])
+            result['message'] = "All websites are already being monitored"
+            return result
+
+        print(f"Session {session_id} ({session_name}) created for {len(result['website_ids'])} websites")
+        self.system.estimate_session(session_id, len(result['website_ids']))
+        promoted = self.promote(run_here=session_id if run_here else None)
+        result['status'] = SESSION_RUNNING if session_id in promoted else SESSION_QUEUED
+        if result['status'] == SESSION_QUEUED:
+            print(f"Session {session_id} queued: {self.max_running} sessions already running")
+        result['message'] = f"Session {session_id} {result['status']}"
+        return result
+
+    def promote(self, run_here: Optional[int] = None) -> List[int]:
+        """Start queued sessions while fewer than the limit run; returns the started ones"""
+        promoted = self.db.promote_queued_sessions(self.max_running)
+        for session_id in promoted:
+            self.system.current_session_id = session_id
+            if self.system.execution_mode == 'worker':
+                print(f"Session {session_id} queued for workers")
+            elif session_id != run_here:
+                self.start(session_id)
+        return promoted
+
+    def start(self, session_id: int, resume: bool = False):
+        """Run a session on its own thread of this process"""
+        target = self.system.resume_session if resume else self.system.run_session
+        thread = threading.Thread(target=self._run, args=(target, session_id),
+                                  name=f"session-{session_id}", daemon=True)
+        with self.lock:
+            self.threads[session_id] = thread
+        thread.start()
+
+    def _run(self, target, session_id: int):
+        try:
+            target(session_id)
+        except Exception as e:
+            print(f"Session {session_id} failed: {str(e)}")
+        finally:
+            with self.lock:
+                self.threads.pop(session_id, None)
+
+    def cancel(self, session_id: int) -> bool:
+        """Cancel a queued or running session; work in flight is dropped at its next step"""
+        if not self.db.cancel_session(session_id):
+            return False
+        with self.lock:
+            self.cancelled.add(session_id)
+        print(f"Session {session_id} cancelled")
+        self.system._publish(session_id, events.SESSION_CANCELLED)
+        self.promote()
+        return True
+
+    def is_cancelled(self, session_id: int) -> bool:
+        with self.lock:
+            return session_id in self.cancelled
+
+    def _status(self, session_id: int) -> Optional[str]:
+        session = self.db.get_session(session_id)
+        return session['status'] if session else None
+
+    def list(self, status: str = None, limit: int = 50) -> List[Dict]:
+        sessions = self.db.get_sessions(status, limit)
+        with self.lock:
+            running_here = set(self.threads)
+        for session in sessions:
+            session['running_here'] = session['id'] in running_here or session['id'] in self.system.active_sessions
+        return sessions
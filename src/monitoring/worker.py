@@ -0,0 +1,78 @@
+import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .monitor import MonitoringSystem
+
+
+class MonitoringWorker:
+    """Runs monitoring jobs claimed from the shared job table, separately from the API.
+
+    Any number of workers (processes or hosts sharing the database) can run at
+    once: each job is leased to one worker and its lease is renewed by heartbeats
+    while it runs, so the jobs of a worker that dies are taken over on expiry.
+    """
+
+    def __init__(self, system: MonitoringSystem = None, concurrency: int = None, poll_interval: float = None):
+        self.system = system or MonitoringSystem()
+        # Sessions enqueued by this process (e.g. its scheduler) are left to the workers
+        self.system.execution_mode = 'worker'
+        self.concurrency = concurrency or int(os.getenv("WORKER_CONCURRENCY", self.system.max_concurrency))
+        self.poll_interval = poll_interval or self.system.job_poll_seconds
+        self.stopping = threading.Event()
+        self.in_flight = 0
+        self.in_flight_lock = threading.Lock()
+        self.jobs_run = 0
+
+    def run(self, drain: bool = False):
+        """Claim and run jobs until stopped (or, with `drain`, until no work is left)"""
+        print(f"Worker {self.system.worker_id} started (concurrency: {self.concurrency})")
+        slots = threading.BoundedSemaphore(self.concurrency)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="worker") as executor:
+            while not self.stopping.is_set():
+                slots.acquire()
+                try:
+                    job = self.system.claim_next_job()
+                except Exception as e:
+                    print(f"Failed to claim a job: {str(e)}")
+                    job = None
+
+                if job is None:
+                    slots.release()
+                    with self.in_flight_lock:
+                        idle = self.in_flight == 0
+                    if drain and idle:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+
+                with self.in_flight_lock:
+                    self.in_flight += 1
+                executor.submit(self._run_job, job, slots)
+
+        self.system.db.flush_writes()
+        print(f"Worker {self.system.worker_id} stopped after {self.jobs_run} jobs")
+
+    def _run_job(self, job, slots: threading.BoundedSemaphore):
+        print(f"Worker running {job['kind']} job {job['id']} (session {job['session_id']})")
+        try:
+            self.system.run_job(job)
+        except Exception as e:
+            print(f"Job {job['id']} crashed: {str(e)}")
+        finally:
+            with self.in_flight_lock:
+                self.in_flight -= 1
+                self.jobs_run += 1
+            slots.release()
+
+    def stop(self, *args):
+        """Stop claiming new jobs; jobs in progress are finished first"""
+        if not self.stopping.is_set():
+            print("Worker stopping after in-flight jobs...")
+        self.stopping.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
@@ -72,6 +72,9 @@ class WebScraper:
                     if len(p_text) > 20:  # Only include substantial paragraphs
                         paragraphs.append(p_text)
                 
+                # Retrieval passages: paragraphs in page order, each under its heading
+                passages = self._extract_passages(main_content)
+                
                 # Create content hash for change detection
                 content_hash = hashlib.md5(text_content.encode()).hexdigest()
                 
@@ -81,6 +84,7 @@ class WebScraper:
                     'content': text_content[:10000],  # Limit content size
                     'headings': headings[:20],  # Limit headings
                     'paragraphs': paragraphs[:50],  # Limit paragraphs
+                    'passages': passages,
                     'content_hash': content_hash,
                     'scraped_at': time.time(),
                     'success': True,
@@ -103,6 +107,7 @@ class WebScraper:
                     'content': '',
                     'headings': [],
                     'paragraphs': [],
+                    'passages': [],
                     'content_hash': '',
                     'success': False,
                     'error': 'No main content found'
@@ -124,6 +129,30 @@ class WebScraper:
             }
 
 
+    def _extract_passages(self, main_content, max_chars: int = 30000) -> List[str]:
+        """Paragraphs in page order prefixed by their nearest heading, up to `max_chars` in total.
+
+        Pages whose text is mostly outside <p> elements get no passages; their
+        text is split into passages when it is indexed.
+        """
+        passages = []
+        heading = ""
+        total = 0
+        for element in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p']):
+            text = re.sub(r'\s+', ' ', element.get_text()).strip()
+            if element.name != 'p':
+                heading = text
+                continue
+            if len(text) <= 20:
+                continue
+            passage = f"{heading}: {text}" if heading else text
+            if total + len(passage) > max_chars:
+                return passages
+            passages.append(passage)
+            total += len(passage)
+        
+        page_chars = len(re.sub(r'\s+', ' ', main_content.get_text()).strip())
+        return passages if total >= page_chars / 2 else []
 
     def validate_url(self, url: str) -> bool:
         """Validate if URL is accessible"""
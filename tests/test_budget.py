@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from src.monitoring.budget import BUDGET_DEGRADED, BUDGET_OK, BudgetExceeded, BudgetGovernor
+
+
+class FakeDB:
+    """Spend bookkeeping of the database, in memory"""
+
+    def __init__(self):
+        self.tokens = 0
+        self.lock = threading.Lock()
+        self.statuses = []
+
+    def get_spend_snapshot(self, session_id, model):
+        with self.lock:
+            return {'session_tokens': self.tokens, 'session_cost': 0.0, 'daily_tokens': self.tokens,
+                    'daily_cost': 0.0, 'model_tokens': self.tokens, 'model_cost': 0.0}
+
+    def record_llm_spend(self, session_id, model, prompt_tokens, completion_tokens, cost):
+        with self.lock:
+            self.tokens += prompt_tokens + completion_tokens
+
+    def escalate_session_budget_status(self, session_id, state):
+        self.statuses.append(state)
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    def make(session_tokens):
+        monkeypatch.setenv("MONITOR_BUDGET_SESSION_TOKENS", str(session_tokens))
+        return BudgetGovernor(FakeDB())
+    return make
+
+
+def query_tokens(budget):
+    prompt, completion, _ = budget.estimate('query', 'm')
+    return prompt + completion
+
+
+def test_parallel_calls_cannot_all_pass_one_check(governor):
+    budget = governor(1)
+    per_call = query_tokens(budget)
+    budget.session_tokens = 2 * per_call
+    results = []
+    estimate = budget.estimate
+
+    def slow_estimate(*args, **kwargs):
+        # Widens any gap between a call's check and its reservation
+        time.sleep(0.005)
+        return estimate(*args, **kwargs)
+
+    budget.estimate = slow_estimate
+
+    def call():
+        time.sleep(0.05)
+        return {'usage': {'prompt_tokens': 0, 'completion_tokens': per_call, 'total_tokens': per_call}}
+
+    def worker():
+        try:
+            budget.spend(1, 'query', 'm', 0, call)
+            results.append('made')
+        except BudgetExceeded:
+            results.append('refused')
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count('made') == 2
+    assert budget.db.tokens <= budget.session_tokens
+    assert budget.reserved['session'][1] == [0, 0.0]
+
+
+def test_reservation_is_released_when_the_call_fails(governor):
+    budget = governor(1)
+    budget.session_tokens = query_tokens(budget)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        budget.spend(1, 'query', 'm', 0, fail)
+    assert budget.reserved['daily'] == [0, 0.0]
+    assert budget.spend(1, 'query', 'm', 0, lambda: {'success': False})[1] in (BUDGET_OK, BUDGET_DEGRADED)
+
+
+def test_cached_results_are_not_charged(governor):
+    budget = governor(100000)
+    budget.spend(1, 'query', 'm', 0, lambda: {'cached': True, 'usage': {'total_tokens': 50}})
+    assert budget.db.tokens == 0
+
+
+def test_degraded_near_the_limit(governor):
+    budget = governor(1)
+    budget.session_tokens = int(query_tokens(budget) / 0.9)
+    assert budget.check(1, 'query', 'm') == BUDGET_DEGRADED
+    assert budget.db.statuses == [BUDGET_DEGRADED]
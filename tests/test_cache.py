@@ -0,0 +1,37 @@
+from src.llm_client.cache import cache_from_env, cache_key
+
+
+def memory_cache(monkeypatch, **env):
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    for name in ("LLM_CACHE_ENABLED", "LLM_CACHE_TTL_QUERY_HOURS", "LLM_CACHE_TTL_ANALYSIS_HOURS"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return cache_from_env()
+
+
+KEY = cache_key("m", [{"role": "user", "content": "q"}], 100, 0.1)
+
+
+def test_answers_are_not_cached_by_default(monkeypatch):
+    cache = memory_cache(monkeypatch)
+    cache.put('query', KEY, {"response": "a"})
+    assert cache.get('query', KEY) is None
+    cache.bypass('query')
+    assert cache.stats()['calls']['query']['bypassed'] == 0
+
+
+def test_judgements_are_cached_by_default(monkeypatch):
+    cache = memory_cache(monkeypatch)
+    cache.put('analysis', KEY, {"accuracy_score": 0.9})
+    assert cache.get('analysis', KEY) == {"accuracy_score": 0.9}
+
+
+def test_answer_cache_is_opt_in(monkeypatch):
+    cache = memory_cache(monkeypatch, LLM_CACHE_TTL_QUERY_HOURS="24")
+    cache.put('query', KEY, {"response": "a"})
+    assert cache.get('query', KEY) == {"response": "a"}
+
+
+def test_cache_can_be_disabled(monkeypatch):
+    assert memory_cache(monkeypatch, LLM_CACHE_ENABLED="false") is None
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from src.monitoring import concurrency
+from src.monitoring.concurrency import KeyedLimiter, TokenBucket
+
+
+class Clock:
+    """Fake monotonic clock; sleeping advances it"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(concurrency.time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(concurrency.time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_bucket_allows_a_burst_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert clock.sleeps == []
+
+
+def test_bucket_paces_calls_beyond_the_burst(clock):
+    bucket = TokenBucket(rate=2, capacity=1)
+    bucket.acquire()
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.total_wait_seconds == pytest.approx(1.0)
+
+
+def test_bucket_refills_over_time_without_exceeding_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 10
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_bucket_without_rate_never_waits(clock):
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
+    assert clock.sleeps == []
+
+
+def test_bucket_default_capacity_is_one_second_of_rate():
+    assert TokenBucket(rate=5).capacity == 5
+    assert TokenBucket(rate=0.5).capacity == 1.0
+
+
+def test_keyed_limiter_caps_each_key():
+    limiter = KeyedLimiter(2)
+    lock = threading.Lock()
+    active = {'a': 0, 'b': 0}
+    peak = {'a': 0, 'b': 0}
+
+    def work(key):
+        with limiter.slot(key):
+            with lock:
+                active[key] += 1
+                peak[key] = max(peak[key], active[key])
+            time.sleep(0.02)
+            with lock:
+                active[key] -= 1
+
+    threads = [threading.Thread(target=work, args=(key,)) for key in 'ab' * 5]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak['a'] <= 2 and peak['b'] <= 2
+
+
+def test_keyed_limiter_snapshot_counts_in_flight_slots():
+    limiter = KeyedLimiter(3)
+    with limiter.slot(('site', 'model')):
+        with limiter.slot(('site', 'model')):
+            assert limiter.snapshot() == {"('site', 'model')": 2}
+    assert limiter.snapshot() == {"('site', 'model')": 0}
+
+
+def test_keyed_limiter_frees_the_slot_on_error():
+    limiter = KeyedLimiter(1)
+    with pytest.raises(RuntimeError):
+        with limiter.slot('site'):
+            raise RuntimeError("boom")
+    assert limiter.snapshot() == {'site': 0}
+    assert limiter.semaphores['site'].acquire(blocking=False)
+
+
+def test_keyed_limiter_limit_is_at_least_one():
+    assert KeyedLimiter(0).limit == 1
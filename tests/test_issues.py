@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+
+from src.database.issues import issue_type_case
+
+
+@pytest.fixture
+def classify():
+    conn = sqlite3.connect(":memory:")
+    sql = f"SELECT {issue_type_case('issue_text')} FROM (SELECT ? AS issue_text)"
+    yield lambda text: conn.execute(sql, (text,)).fetchone()[0]
+    conn.close()
+
+
+@pytest.mark.parametrize("text", [
+    "The date is wrong",
+    "Outdated year for the founding",
+    "Founded in the year 1950.",
+    "Gives the wrong dates (2019-2020)",
+    "Budget figure is two years old",
+    "The agency no longer runs that program",
+])
+def test_temporal_issues(classify, text):
+    assert classify(text) == 'temporal'
+
+
+@pytest.mark.parametrize("text", [
+    "The response gives an update that is wrong",
+    "Names the wrong candidate",
+    "Does not validate the claim",
+    "Yearly report is misquoted",
+])
+def test_words_containing_date_or_year_are_not_temporal(classify, text):
+    assert classify(text) != 'temporal'
+
+
+@pytest.mark.parametrize("text, issue_type", [
+    ("Analysis error: timeout", 'analysis_error'),
+    ("Wrong director named", 'leadership'),
+    ("Missing the application fee", 'omission'),
+    ("Wrong county listed", 'geographic'),
+    ("Percent of budget is wrong", 'numeric'),
+    ("Confuses the agency with another", 'attribution'),
+    ("States the office is in Boston", 'factual'),
+])
+def test_issue_types(classify, text, issue_type):
+    assert classify(text) == issue_type
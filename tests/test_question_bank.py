@@ -0,0 +1,41 @@
+import pytest
+
+from src.database.models import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "m.db"), write_behind=False, archive_dir=str(tmp_path / "archive"))
+    yield db
+    db.close()
+
+
+def test_manual_questions_are_always_in_the_bank(db):
+    website_id = db.add_website("https://example.gov", "Example")
+    manual = [db.add_question(website_id, f"Manual question {i}?") for i in range(4)]
+    db.refresh_question_bank(website_id, [f"Generated question {i}?" for i in range(5)], max_size=3)
+    bank = db.get_question_bank(website_id, max_size=3)
+    assert [q['id'] for q in bank[:4]] == sorted(manual, reverse=True)
+    assert sum(q['category'] == 'auto-generated' for q in bank) == 3
+
+
+def test_rotation_caps_generated_questions_only(db):
+    website_id = db.add_website("https://example.gov", "Example")
+    for i in range(3):
+        db.add_question(website_id, f"Manual question {i}?")
+    db.refresh_question_bank(website_id, ["First?", "Second?"], max_size=2)
+    bank = db.refresh_question_bank(website_id, ["Third?"], max_size=2)
+    generated = [q['question_text'] for q in bank if q['category'] == 'auto-generated']
+    assert len(bank) == 5
+    assert "Third?" in generated and len(generated) == 2
+    with db.get_read_connection() as conn:
+        active = conn.execute("SELECT COUNT(*) FROM questions WHERE website_id = ? AND is_active = 1",
+                              (website_id,)).fetchone()[0]
+    assert active == 5
+
+
+def test_duplicate_questions_are_merged(db):
+    website_id = db.add_website("https://example.gov", "Example")
+    db.refresh_question_bank(website_id, ["What is the fee?"], max_size=5)
+    bank = db.refresh_question_bank(website_id, ["what is the fee", "Who runs it?"], max_size=5)
+    assert sorted(q['question_text'] for q in bank) == ["What is the fee?", "Who runs it?"]
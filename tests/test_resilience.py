@@ -0,0 +1,242 @@
+import asyncio
+import threading
+
+import httpx
+import openai
+import pytest
+
+from src.llm_client import resilience
+from src.llm_client.resilience import (CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, AIMDController,
+                                       CircuitBreaker, CircuitOpenError, EndpointGuard, RetryPolicy,
+                                       is_retryable, retry_after)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, 'monotonic', clock)
+    monkeypatch.setattr(resilience.time, 'sleep', lambda seconds: None)
+    return clock
+
+
+def status_error(status, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=httpx.Request("POST", "http://proxy/v1"))
+    return openai.APIStatusError(f"Error code: {status}", response=response, body=None)
+
+
+def guard(failures=2, attempts=1):
+    return EndpointGuard('proxy', RetryPolicy(max_attempts=attempts, base_delay=0), CircuitBreaker(failures, 30),
+                         AIMDController(initial=4, minimum=1, maximum=8))
+
+
+def fail(error):
+    def call():
+        raise error
+    return call
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    g = guard()
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            g.call(fail(status_error(503)))
+    assert g.breaker.state == CIRCUIT_OPEN
+    with pytest.raises(CircuitOpenError):
+        g.call(lambda: 'ok')
+    assert g.breaker.status()['rejected_calls'] == 1
+
+
+def test_half_open_trial_success_closes(clock):
+    g = guard()
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            g.call(fail(status_error(500)))
+    clock.now += 31
+    assert g.call(lambda: 'ok') == 'ok'
+    assert g.breaker.state == CIRCUIT_CLOSED
+
+
+def test_half_open_trial_failure_reopens(clock):
+    g = guard()
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            g.call(fail(status_error(500)))
+    clock.now += 31
+    with pytest.raises(openai.APIStatusError):
+        g.call(fail(status_error(502)))
+    assert g.breaker.state == CIRCUIT_OPEN
+    with pytest.raises(CircuitOpenError):
+        g.call(lambda: 'ok')
+
+
+def test_throttled_trial_does_not_wedge_half_open(clock):
+    g = guard()
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            g.call(fail(status_error(503)))
+    clock.now += 31
+    with pytest.raises(openai.APIStatusError):
+        g.call(fail(status_error(429)))
+    assert g.breaker.state == CIRCUIT_HALF_OPEN
+    # The next call is the new trial, and the endpoint recovers
+    assert g.call(lambda: 'ok') == 'ok'
+    assert g.breaker.state == CIRCUIT_CLOSED
+
+
+def test_cancelled_trial_frees_the_trial_slot(clock):
+    breaker = CircuitBreaker(1, 30)
+    breaker.record_failure()
+    clock.now += 31
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.release_trial()
+    breaker.before_call()
+
+
+def half_open_guard_with_no_free_slot(clock):
+    g = EndpointGuard('proxy', RetryPolicy(max_attempts=1), CircuitBreaker(1, 30), AIMDController(1, 1, 1))
+    with pytest.raises(openai.APIStatusError):
+        g.call(fail(status_error(503)))
+    clock.now += 31
+    g.in_flight = 1
+    return g
+
+
+def test_trial_cancelled_while_waiting_for_a_slot_is_released(clock):
+    g = half_open_guard_with_no_free_slot(clock)
+
+    async def main():
+        waiter = asyncio.ensure_future(g.acall(lambda: asyncio.sleep(0)))
+        # The clock fixture freezes the loop's timer, so only yield to it
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert not waiter.done()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(main())
+    g.in_flight = 0
+    assert g.breaker.state == CIRCUIT_HALF_OPEN
+    assert g.call(lambda: 'ok') == 'ok'
+    assert g.breaker.state == CIRCUIT_CLOSED
+
+
+def test_trial_interrupted_while_waiting_for_a_slot_is_released(clock, monkeypatch):
+    g = half_open_guard_with_no_free_slot(clock)
+
+    def interrupted(timeout=None):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(g.condition, 'wait', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        g.call(lambda: 'never')
+    monkeypatch.undo()
+    g.in_flight = 0
+    assert g.call(lambda: 'ok') == 'ok'
+    assert g.breaker.state == CIRCUIT_CLOSED
+
+
+def test_client_errors_are_not_retried_and_count_as_healthy(clock):
+    g = guard(failures=1, attempts=4)
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise status_error(400)
+    with pytest.raises(openai.APIStatusError):
+        g.call(bad_request)
+    assert len(calls) == 1
+    assert g.breaker.state == CIRCUIT_CLOSED
+
+
+def test_retries_until_success(clock):
+    g = guard(failures=5, attempts=4)
+    outcomes = [status_error(503), status_error(429, {'retry-after': '0'}), 'ok']
+
+    def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    assert g.call(flaky) == 'ok'
+    assert g.status()['retries'] == 2
+
+
+def test_retry_after_headers():
+    assert retry_after(status_error(429, {'retry-after': '7'})) == 7.0
+    assert retry_after(status_error(429, {'retry-after-ms': '250'})) == 0.25
+    assert retry_after(status_error(429, {'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})) == 0.0
+    assert retry_after(status_error(429)) is None
+    assert RetryPolicy(max_delay=5).delay(1, status_error(429, {'retry-after': '60'})) == 5
+
+
+def test_retryable_errors():
+    assert is_retryable(status_error(429))
+    assert is_retryable(status_error(503))
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert not is_retryable(status_error(400))
+    assert not is_retryable(ValueError("bad"))
+
+
+def test_aimd_increases_additively_and_halves_on_throttle(clock):
+    aimd = AIMDController(initial=4, minimum=1, maximum=8, cooldown=1.0)
+    # About one more slot per round of `limit` successes
+    for _ in range(5):
+        aimd.on_success()
+    assert aimd.current == 5
+    aimd.on_throttle()
+    assert aimd.current == 2
+
+
+def test_aimd_decreases_once_per_cooldown_and_respects_bounds(clock):
+    aimd = AIMDController(initial=8, minimum=2, maximum=8, cooldown=1.0)
+    aimd.on_throttle()
+    aimd.on_throttle()
+    assert aimd.current == 4
+    clock.now += 1
+    aimd.on_throttle()
+    clock.now += 1
+    aimd.on_throttle()
+    assert aimd.current == 2
+    for _ in range(100):
+        aimd.on_success()
+    assert aimd.current == 8
+    assert aimd.status()['throttled'] == 4
+
+
+def test_thread_release_wakes_async_waiter():
+    g = EndpointGuard('proxy', RetryPolicy(max_attempts=1), CircuitBreaker(), AIMDController(1, 1, 1))
+    started, finish = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        finish.wait(5)
+        return 'sync'
+
+    async def fast():
+        return 'async'
+
+    async def main():
+        thread = threading.Thread(target=g.call, args=(slow,))
+        thread.start()
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        waiter = asyncio.ensure_future(g.acall(fast))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        finish.set()
+        result = await asyncio.wait_for(waiter, 2)
+        thread.join()
+        return result
+
+    assert asyncio.run(main()) == 'async'
+    assert g.in_flight == 0
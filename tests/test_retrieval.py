@@ -0,0 +1,48 @@
+from src.llm_client.retrieval import PassageIndex, split_passage
+
+PASSAGES = [
+    "Contact: Call the agency hotline at 555-0100 on weekdays.",
+    "Budget: The annual budget is 4 billion dollars for fiscal 2024.",
+    "Leadership: The agency is led by Director Jane Smith since 2021.",
+    "History: The agency was founded in 1950 after the flood.",
+    "Programs: Grants support rural water systems and flood control.",
+]
+TEXT = "\n".join(PASSAGES)
+
+
+def test_whole_text_when_it_fits():
+    index = PassageIndex(TEXT, PASSAGES)
+    assert index.select(["budget"], len(TEXT)) == TEXT
+
+
+def test_select_returns_only_matching_passages():
+    index = PassageIndex(TEXT, PASSAGES)
+    context = index.select(["Who is the director?"], 250)
+    assert "Director Jane Smith" in context
+    assert "hotline" not in context
+    assert "fiscal 2024" not in context
+
+
+def test_select_limits_each_query_to_top_k():
+    index = PassageIndex(TEXT, PASSAGES)
+    context = index.select(["flood"], 250, top_k=1)
+    assert context.count("\n\n") == 0
+    assert "flood" in context
+
+
+def test_queries_take_turns_and_keep_page_order():
+    index = PassageIndex(TEXT, PASSAGES)
+    context = index.select(["annual budget", "hotline contact"], 250, top_k=1)
+    assert context == PASSAGES[0] + "\n\n" + PASSAGES[1]
+
+
+def test_falls_back_to_start_of_page_when_nothing_matches():
+    index = PassageIndex(TEXT, PASSAGES)
+    assert index.select(["zebra migration"], 100) == TEXT[:100]
+
+
+def test_split_passage_respects_limit_at_sentence_ends():
+    text = "One sentence here. " * 50
+    pieces = split_passage(text, 100)
+    assert all(len(piece) <= 100 for piece in pieces)
+    assert all(piece.endswith(".") for piece in pieces)
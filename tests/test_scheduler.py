@@ -0,0 +1,151 @@
+import pytest
+
+from src.monitoring.scheduler import AdaptiveScheduler, from_timestamp, to_timestamp
+
+HOUR = 3600
+NOW = 1_700_000_000.0
+
+
+class FakeDB:
+    """The database calls the scheduler makes, backed by dicts"""
+
+    def __init__(self, website_ids):
+        self.websites = [{'id': website_id, 'last_scraped': None} for website_id in website_ids]
+        self.saved = {}
+        self.signals = {}
+        self.busy = set()
+
+    def get_websites(self, active_only=False):
+        return self.websites
+
+    def get_website_schedules(self):
+        return [dict(row, base_interval_hours=None) for row in self.saved.values()]
+
+    def save_website_schedules(self, rows):
+        for row in rows:
+            self.saved[row['website_id']] = row
+
+    def get_schedule_signals(self, website_id, since, misrepresentations_since):
+        return self.signals.get(website_id, {'checked': 1, 'content_changed': 0, 'misrepresentations': 0})
+
+    def has_unfinished_website_jobs(self, website_id):
+        return website_id in self.busy
+
+
+class FakeSystem:
+    def __init__(self, db):
+        self.db = db
+
+
+@pytest.fixture
+def make_scheduler(monkeypatch):
+    monkeypatch.setenv("MONITOR_SCHEDULE_JITTER", "0")
+    monkeypatch.setenv("MONITOR_SCHEDULE_MIN_HOURS", "1")
+    monkeypatch.setenv("MONITOR_SCHEDULE_MAX_HOURS", "48")
+    monkeypatch.setenv("MONITOR_SCHEDULE_BACKOFF", "1.5")
+    monkeypatch.setattr("src.monitoring.scheduler.time.time", lambda: NOW)
+
+    def make(website_ids=(1,), base_hours=6):
+        db = FakeDB(website_ids)
+        scheduler = AdaptiveScheduler(FakeSystem(db), base_interval_hours=base_hours)
+        scheduler.sync()
+        return scheduler, db
+    return make
+
+
+def run_due(scheduler, now):
+    """Pop what is due at `now` and return (enqueued ids, interval of website 1)"""
+    enqueued = scheduler.pop_due(now)
+    return enqueued, scheduler.schedules[1]['interval_hours']
+
+
+def test_new_websites_are_due_now_and_persisted(make_scheduler):
+    scheduler, db = make_scheduler(website_ids=(1, 2))
+    assert scheduler.pop_due(NOW) == [1, 2]
+    assert set(db.saved) == {1, 2}
+    assert from_timestamp(db.saved[1]['next_due_at']) == NOW + 6 * HOUR
+
+
+def test_nothing_is_enqueued_before_it_is_due(make_scheduler):
+    scheduler, _ = make_scheduler()
+    scheduler.pop_due(NOW)
+    assert scheduler.pop_due(NOW + 5 * HOUR) == []
+
+
+def test_stable_checks_back_off_up_to_the_maximum(make_scheduler):
+    scheduler, _ = make_scheduler()
+    now = NOW
+    enqueued, interval = run_due(scheduler, now)
+    assert (enqueued, interval) == ([1], 6)
+    intervals = []
+    for _ in range(8):
+        now = scheduler.schedules[1]['due']
+        _, interval = run_due(scheduler, now)
+        intervals.append(interval)
+    assert intervals[:3] == [9, 13.5, 20.25]
+    assert intervals[-1] == 48
+    assert scheduler.schedules[1]['stable_runs'] == 8
+
+
+def test_content_changes_halve_the_interval_down_to_the_minimum(make_scheduler):
+    scheduler, db = make_scheduler()
+    scheduler.pop_due(NOW)
+    db.signals[1] = {'checked': 1, 'content_changed': 1, 'misrepresentations': 0}
+    intervals = []
+    for _ in range(4):
+        _, interval = run_due(scheduler, scheduler.schedules[1]['due'])
+        intervals.append(interval)
+    assert intervals == [3, 1.5, 1, 1]
+
+
+def test_misrepresentations_bring_a_backed_off_site_below_its_base(make_scheduler):
+    scheduler, db = make_scheduler()
+    scheduler.pop_due(NOW)
+    for _ in range(3):
+        run_due(scheduler, scheduler.schedules[1]['due'])
+    assert scheduler.schedules[1]['interval_hours'] > 6
+    db.signals[1] = {'checked': 1, 'content_changed': 0, 'misrepresentations': 2}
+    _, interval = run_due(scheduler, scheduler.schedules[1]['due'])
+    assert interval == 3
+    assert scheduler.schedules[1]['stable_runs'] == 0
+
+
+def test_failed_checks_keep_the_interval(make_scheduler):
+    scheduler, db = make_scheduler()
+    scheduler.pop_due(NOW)
+    db.signals[1] = {'checked': 0, 'content_changed': 0, 'misrepresentations': 0}
+    _, interval = run_due(scheduler, scheduler.schedules[1]['due'])
+    assert interval == 6
+
+
+def test_busy_websites_are_retried_after_the_minimum_interval(make_scheduler):
+    scheduler, db = make_scheduler()
+    db.busy.add(1)
+    assert scheduler.pop_due(NOW) == []
+    assert scheduler.schedules[1]['due'] == NOW + 1 * HOUR
+    assert scheduler.schedules[1]['last_enqueued_at'] is None
+
+
+def test_removed_websites_are_dropped(make_scheduler):
+    scheduler, db = make_scheduler(website_ids=(1, 2))
+    db.websites = [w for w in db.websites if w['id'] == 1]
+    scheduler.sync()
+    assert scheduler.pop_due(NOW) == [1]
+    assert [s['website_id'] for s in scheduler.snapshot()] == [1]
+
+
+def test_restart_keeps_the_persisted_cadence(make_scheduler):
+    scheduler, db = make_scheduler()
+    scheduler.pop_due(NOW)
+    run_due(scheduler, scheduler.schedules[1]['due'])
+    restarted = AdaptiveScheduler(FakeSystem(db), base_interval_hours=6)
+    restarted.sync()
+    assert restarted.schedules[1]['interval_hours'] == 9
+    assert to_timestamp(restarted.schedules[1]['due']) == db.saved[1]['next_due_at']
+
+
+def test_jitter_stays_within_its_fraction(make_scheduler):
+    scheduler, _ = make_scheduler()
+    scheduler.jitter = 0.1
+    dues = [scheduler._jittered(NOW, 10) for _ in range(200)]
+    assert all(NOW + 9 * HOUR <= due <= NOW + 11 * HOUR for due in dues)
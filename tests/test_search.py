@@ -0,0 +1,47 @@
+import pytest
+
+from src.database.models import DatabaseManager
+from src.database.search import SEARCH_MAX_OFFSET, highlight_snippet
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "m.db"), write_behind=False, archive_dir=str(tmp_path / "archive"))
+    yield db
+    db.close()
+
+
+def test_response_snippets_escape_html_around_marks(db):
+    website_id = db.add_website("https://example.gov", "Example")
+    question_id = db.add_question(website_id, "What is the <b>permit</b> fee?")
+    db.add_llm_response(question_id, "m", 'The permit fee is <script>alert("x")</script> 10 dollars')
+    snippet = db.search("permit")['results'][0]['snippet']
+    assert "<script>" not in snippet
+    assert "&lt;script&gt;" in snippet
+    assert "<mark>permit</mark>" in snippet
+
+    question_snippet = db.search("permit", scope='questions')['results'][0]['snippet']
+    assert question_snippet.startswith("What is the &lt;b&gt;<mark>permit</mark>&lt;/b&gt; fee")
+
+
+def test_python_snippets_escape_html_around_marks():
+    snippet = highlight_snippet('Apply <img src=x onerror=alert(1)> for a permit & pay', "permit")
+    assert "<img" not in snippet
+    assert "<mark>permit</mark>" in snippet
+    assert "&amp;" in snippet
+
+
+def test_deep_offsets_are_rejected(db):
+    with pytest.raises(ValueError):
+        db.search("permit", offset=SEARCH_MAX_OFFSET + 1)
+
+
+def test_paging_stops_at_the_offset_cap(db, monkeypatch):
+    monkeypatch.setattr('src.database.models.SEARCH_MAX_OFFSET', 2)
+    website_id = db.add_website("https://example.gov", "Example")
+    question_id = db.add_question(website_id, "What is the fee?")
+    for i in range(5):
+        db.add_llm_response(question_id, "m", f"The fee is {i} dollars")
+    assert db.search("fee", limit=2)['next_offset'] == 2
+    page = db.search("fee", limit=2, offset=2)
+    assert page['has_more'] and page['next_offset'] is None
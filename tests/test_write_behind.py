@@ -0,0 +1,45 @@
+import sqlite3
+
+import pytest
+
+from src.database.write_behind import WriteBehindWriter
+
+
+@pytest.fixture
+def writer(tmp_path):
+    path = str(tmp_path / "w.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE rows (id INTEGER PRIMARY KEY AUTOINCREMENT, value TEXT NOT NULL)")
+    writer = WriteBehindWriter(lambda: sqlite3.connect(path, check_same_thread=False, isolation_level=None),
+                               batch_size=10, flush_interval_ms=20)
+    yield writer, path
+    writer.close()
+
+
+def insert(value):
+    return lambda conn: conn.execute("INSERT INTO rows (value) VALUES (?)", (value,)).lastrowid
+
+
+def test_calls_are_group_committed_and_return_their_results(writer):
+    writer, path = writer
+    futures = [writer.submit_call(insert(f"v{i}")) for i in range(25)]
+    assert [future.result(timeout=5) for future in futures] == list(range(1, 26))
+    assert writer.flush(timeout=5)
+    stats = writer.get_stats()
+    assert stats['records_written'] == 26
+    assert stats['batches_committed'] < 26
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0] == 25
+
+
+def test_a_failing_call_does_not_lose_the_rest_of_its_batch(writer):
+    writer, path = writer
+    good = writer.submit_call(insert("a"))
+    bad = writer.submit_call(insert(None))
+    also_good = writer.submit_call(insert("b"))
+    assert good.result(timeout=5) and also_good.result(timeout=5)
+    with pytest.raises(sqlite3.IntegrityError):
+        bad.result(timeout=5)
+    with sqlite3.connect(path) as conn:
+        assert [row[0] for row in conn.execute("SELECT value FROM rows ORDER BY id")] == ["a", "b"]
+    assert writer.get_stats()['records_failed'] == 1
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+"""
+Query Plan Verification Script for LLM Monitoring System
+
+Builds a scratch database with all migrations applied and asserts, using
+EXPLAIN QUERY PLAN, that the hot dashboard and analysis queries are served by
+indexes instead of full table scans and temporary sort b-trees.
+
+Usage:
+    python3 verify_query_plans.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.database import issues, models, rollups, schedules, search
+from src.database.migrations import MIGRATIONS
+
+# (description, query, params, substrings that must appear, substrings that must not appear)
+PLAN_CHECKS = [
+    (
+        "Recent analysis results walk analyzed_at in index order",
+        models.RECENT_ANALYSIS_RESULTS_SQL, (50,),
+        ["SCAN ar USING INDEX idx_analysis_results_page"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Misrepresentations by website come from the rollups",
+        rollups.ROLLUP_MISREPRESENTATIONS_BY_WEBSITE_SQL, (),
+        ["analysis_rollups"],
+        ["analysis_results"]
+    ),
+    (
+        "Dashboard totals come from the rollups",
+        rollups.ROLLUP_TOTALS_SQL, (),
+        ["SCAN analysis_rollups"],
+        ["analysis_results"]
+    ),
+    (
+        "Deep result pages seek straight to the cursor",
+        models.ANALYSIS_RESULTS_PAGE_SQL.format(where="WHERE (ar.analyzed_at, ar.id) < (?, ?)"),
+        ("2026-01-01 00:00:00", 1000, 50),
+        ["SEARCH ar USING INDEX idx_analysis_results_page (analyzed_at<?)"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Result pages filtered by website use the website page index",
+        models.ANALYSIS_RESULTS_PAGE_SQL.format(
+            where="WHERE (ar.analyzed_at, ar.id) < (?, ?) AND ar.website_id = ?"),
+        ("2026-01-01 00:00:00", 1000, 1, 50),
+        ["idx_analysis_results_website_page (website_id=? AND analyzed_at<?)"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Result pages filtered by LLM service use the service page index",
+        models.ANALYSIS_RESULTS_PAGE_SQL.format(where="WHERE ar.llm_service = ?"),
+        ("LiteLLM", 50),
+        ["idx_analysis_results_service_page (llm_service=?)"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Result pages filtered by misrepresentation use the flag page index",
+        models.ANALYSIS_RESULTS_PAGE_SQL.format(
+            where="WHERE ar.misrepresentation_detected = ? AND ar.accuracy_score >= ?"),
+        (1, 0.5, 50),
+        ["idx_analysis_results_misrepresentation_page (misrepresentation_detected=?)"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Recent misrepresentations need no sort",
+        models.RECENT_MISREPRESENTATIONS_SQL, (),
+        ["SEARCH ar USING COVERING INDEX idx_analysis_results_misrepresentation"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Misrepresentation count is an index range count",
+        "SELECT COUNT(*) FROM analysis_results WHERE misrepresentation_detected = 1", (),
+        ["COVERING INDEX idx_analysis_results_misrepresentation"],
+        []
+    ),
+    (
+        "Dashboard recent activity is an index range scan",
+        "SELECT COUNT(*) FROM analysis_results WHERE analyzed_at > datetime('now', '-1 day')", (),
+        ["SEARCH analysis_results USING COVERING INDEX idx_analysis_results_page (analyzed_at>?)"],
+        []
+    ),
+    (
+        "Response search is answered by the FTS index",
+        search.SEARCH_RESPONSES_SQL, ('"president"', 20, 0),
+        ["SCAN llm_responses_fts VIRTUAL TABLE INDEX", "SEARCH lr USING INTEGER PRIMARY KEY"],
+        ["SCAN lr"]
+    ),
+    (
+        "Content search resolves blobs through indexes",
+        search.SEARCH_CONTENT_SQL, ('"president"', 20, 0),
+        ["SEARCH cb USING INTEGER PRIMARY KEY", "idx_website_content_blob"],
+        ["SCAN cb", "SCAN website_content"]
+    ),
+    (
+        "Issue types per website aggregate from the covering index and archived counts",
+        issues.ISSUE_TYPES_BY_WEBSITE_SQL.format(where="WHERE website_id = ?"), (1, 1),
+        ["COVERING INDEX idx_analysis_issues_website_type", "SEARCH archived_issue_counts"],
+        ["SCAN analysis_issues", "SCAN archived_issue_counts"]
+    ),
+    (
+        "Website questions are looked up by website",
+        "SELECT * FROM questions WHERE website_id = ? AND is_active = 1 ORDER BY created_at DESC", (1,),
+        ["SEARCH questions USING INDEX idx_questions_website"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Responses are found by question",
+        "SELECT * FROM llm_responses WHERE question_id = ?", (1,),
+        ["SEARCH llm_responses USING INDEX idx_llm_responses_question"],
+        []
+    ),
+    (
+        "Latest content of a website is an index lookup",
+        "SELECT * FROM website_content WHERE website_id = ? ORDER BY scraped_at DESC LIMIT 1", (1,),
+        ["SEARCH website_content USING INDEX idx_website_content_website"],
+        ["USE TEMP B-TREE FOR ORDER BY"]
+    ),
+    (
+        "Scheduler signals are range seeks per website",
+        schedules.SCHEDULE_SIGNALS_SQL,
+        {'website_id': 1, 'since': "2026-01-01 00:00:00", 'misrepresentations_since': "2026-01-01 00:00:00"},
+        ["idx_website_content_website (website_id=? AND scraped_at>?)", "SEARCH analysis_results USING INDEX"],
+        ["SCAN website_content", "SCAN analysis_results"]
+    ),
+    (
+        "Unfinished jobs of a website are found by index",
+        schedules.HAS_UNFINISHED_WEBSITE_JOBS_SQL, (1,),
+        ["idx_monitoring_jobs_website"],
+        ["SCAN monitoring_jobs"]
+    ),
+]
+
+
+def verify_query_plans() -> bool:
+    """Run every plan check and report the results"""
+
+    print("=" * 60)
+    print("VERIFYING QUERY PLANS")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = models.DatabaseManager(os.path.join(tmp_dir, "plans.db"))
+
+        schema_version = db.get_schema_version()
+        expected_version = max(m.version for m in MIGRATIONS)
+        all_passed = schema_version == expected_version
+        print(f"{'✅' if all_passed else '❌'} Schema version {schema_version} (expected {expected_version})")
+
+        for description, query, params, required, forbidden in PLAN_CHECKS:
+            plan = db.explain_query_plan(query, params)
+            plan_text = "\n".join(plan)
+            missing = [r for r in required if r not in plan_text]
+            present = [f for f in forbidden if f in plan_text]
+            passed = not missing and not present
+            all_passed = all_passed and passed
+
+            print(f"{'✅' if passed else '❌'} {description}")
+            if not passed:
+                for line in plan:
+                    print(f"      plan: {line}")
+                for r in missing:
+                    print(f"      missing: {r}")
+                for f in present:
+                    print(f"      unexpected: {f}")
+
+        db.close()
+
+    print("=" * 60)
+    print("ALL QUERY PLANS OK" if all_passed else "QUERY PLAN CHECKS FAILED")
+    print("=" * 60)
+    return all_passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_query_plans() else 1)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""
+LLM Monitoring System - Worker Entry Point
+
+Runs monitoring jobs outside the API process. Start the API with
+MONITOR_EXECUTION_MODE=worker so it only enqueues sessions, then start one or
+more workers (on this host or others sharing the database):
+
+Usage:
+    python3 worker.py [--concurrency N] [--schedule-hours H] [--drain]
+"""
+
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run monitoring jobs from the shared job table")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Jobs run at once by this worker (default: WORKER_CONCURRENCY)")
+    parser.add_argument("--schedule-hours", type=int, default=None,
+                        help="Also enqueue a session for all websites every H hours (run on one worker only)")
+    parser.add_argument("--drain", action="store_true",
+                        help="Exit once no claimable jobs are left")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    print("=" * 60)
+    print("LLM MONITORING WORKER")
+    print("=" * 60)
+
+    from src.monitoring.worker import MonitoringWorker
+
+    worker = MonitoringWorker(concurrency=args.concurrency)
+    worker.install_signal_handlers()
+
+    if args.schedule_hours:
+        worker.system.setup_scheduled_monitoring(args.schedule_hours)
+
+    try:
+        worker.run(drain=args.drain)
+    except Exception as e:
+        print(f"\n❌ Worker error: {str(e)}")
+        sys.exit(1)
+    finally:
+        worker.system.stop_scheduled_monitoring()
+
+
+if __name__ == "__main__":
+    main()